@@ -0,0 +1,22 @@
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-timesheet-rollups")
+@pass_context
+def rebuild_timesheet_rollups(context):
+	"""Recompute Smart Timesheet Rollup from the timesheets"""
+	import frappe
+
+	from smart_pro.smart_pro.doctype.smart_timesheet_rollup.smart_timesheet_rollup import rebuild_rollups
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		rebuild_rollups()
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+
+commands = [rebuild_timesheet_rollups]
@@ -163,20 +163,120 @@ fixtures = [
 # ---------------
 # Hook on document methods and events
 
-# doc_events = {
-# 	"*": {
-# 		"on_update": "method",
-# 		"on_cancel": "method",
-# 		"on_trash": "method"
-# 	}
-# }
+doc_events = {
+	"User": {
+		"on_update": "smart_pro.smart_pro.access.on_user_update",
+	},
+	"Employee": {
+		"on_update": [
+			"smart_pro.smart_pro.access.on_employee_update",
+			"smart_pro.smart_pro.membership.on_employee_change",
+		],
+		"on_trash": [
+			"smart_pro.smart_pro.access.bump_access_version",
+			"smart_pro.smart_pro.membership.on_employee_change",
+		],
+	},
+	"Employee Project Assignment": {
+		"after_insert": "smart_pro.smart_pro.counters.on_insert",
+		"on_update": [
+			"smart_pro.smart_pro.sync.on_assignment_change",
+			"smart_pro.smart_pro.membership.on_assignment_change",
+			"smart_pro.smart_pro.allocation.on_change",
+		],
+		"on_trash": [
+			"smart_pro.smart_pro.sync.on_assignment_change",
+			"smart_pro.smart_pro.membership.on_assignment_change",
+			"smart_pro.smart_pro.allocation.on_change",
+			"smart_pro.smart_pro.counters.on_trash",
+			"smart_pro.smart_pro.versions.on_change",
+		],
+		"on_change": "smart_pro.smart_pro.versions.on_change",
+	},
+	"Smart Project": {
+		"validate": "smart_pro.smart_pro.hours.keep_hour_totals",
+		"after_insert": "smart_pro.smart_pro.counters.on_insert",
+		"on_update": [
+			"smart_pro.smart_pro.membership.on_project_change",
+			"smart_pro.smart_pro.counters.on_update",
+		],
+		"on_trash": [
+			"smart_pro.smart_pro.membership.on_project_change",
+			"smart_pro.smart_pro.counters.on_trash",
+			"smart_pro.smart_pro.sync.on_trash",
+			"smart_pro.smart_pro.versions.on_change",
+		],
+		"on_change": "smart_pro.smart_pro.versions.on_change",
+	},
+	"Employee Date Request": {
+		"after_insert": "smart_pro.smart_pro.counters.on_insert",
+		"on_update": [
+			"smart_pro.smart_pro.counters.on_update",
+			"smart_pro.smart_pro.sync.on_update",
+			"smart_pro.smart_pro.overlaps.on_change",
+		],
+		"on_trash": [
+			"smart_pro.smart_pro.counters.on_trash",
+			"smart_pro.smart_pro.sync.on_trash",
+			"smart_pro.smart_pro.overlaps.on_change",
+			"smart_pro.smart_pro.versions.on_change",
+		],
+		"on_change": "smart_pro.smart_pro.versions.on_change",
+	},
+	"Smart Task": {
+		"validate": "smart_pro.smart_pro.hours.keep_hour_totals",
+		"after_insert": "smart_pro.smart_pro.counters.on_insert",
+		"on_update": [
+			"smart_pro.smart_pro.counters.on_update",
+			"smart_pro.smart_pro.sync.on_update",
+		],
+		"on_trash": [
+			"smart_pro.smart_pro.counters.on_trash",
+			"smart_pro.smart_pro.sync.on_trash",
+			"smart_pro.smart_pro.versions.on_change",
+		],
+		"on_change": "smart_pro.smart_pro.versions.on_change",
+	},
+	"Smart Timesheet": {
+		"after_insert": "smart_pro.smart_pro.counters.on_insert",
+		"on_update": [
+			"smart_pro.smart_pro.counters.on_update",
+			"smart_pro.smart_pro.sync.on_update",
+		],
+		"on_trash": [
+			"smart_pro.smart_pro.counters.on_trash",
+			"smart_pro.smart_pro.sync.on_trash",
+			"smart_pro.smart_pro.versions.on_change",
+		],
+		"on_change": "smart_pro.smart_pro.versions.on_change",
+	},
+	"Holiday List": {
+		"on_update": "smart_pro.smart_pro.working_days.on_holiday_list_change",
+		"on_trash": "smart_pro.smart_pro.working_days.on_holiday_list_change",
+	},
+	"Smart Pro Notification": {
+		"after_insert": "smart_pro.smart_pro.counters.on_insert",
+		"on_update": "smart_pro.smart_pro.sync.on_update",
+		"on_trash": [
+			"smart_pro.smart_pro.counters.on_trash",
+			"smart_pro.smart_pro.sync.on_trash",
+			"smart_pro.smart_pro.versions.on_change",
+		],
+		"on_change": "smart_pro.smart_pro.versions.on_change",
+	},
+}
 
 # Scheduled Tasks
 # ---------------
 
 scheduler_events = {
+	"hourly": [
+		"smart_pro.smart_pro.counters.reconcile_all_counts"
+	],
 	"daily": [
-		"smart_pro.smart_pro.tasks.daily"
+		"smart_pro.smart_pro.tasks.daily",
+		"smart_pro.smart_pro.sync.purge_sync_log",
+		"smart_pro.smart_pro.hours.reconcile_actual_hours"
 	],
 	"weekly": [
 		"smart_pro.smart_pro.tasks.weekly"
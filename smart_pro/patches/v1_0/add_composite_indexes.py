@@ -0,0 +1,16 @@
+def execute():
+	"""Create the composite indexes declared in on_doctype_update on existing sites"""
+	from smart_pro.smart_pro.doctype.employee_date_request import employee_date_request
+	from smart_pro.smart_pro.doctype.employee_project_assignment import employee_project_assignment
+	from smart_pro.smart_pro.doctype.smart_pro_notification import smart_pro_notification
+	from smart_pro.smart_pro.doctype.smart_task import smart_task
+	from smart_pro.smart_pro.doctype.smart_timesheet import smart_timesheet
+
+	for module in (
+		smart_task,
+		smart_timesheet,
+		employee_date_request,
+		employee_project_assignment,
+		smart_pro_notification,
+	):
+		module.on_doctype_update()
@@ -0,0 +1,6 @@
+from smart_pro.smart_pro.hours import reconcile_actual_hours
+
+
+def execute():
+	"""Fill the new actual_hours / approved_hours totals of tasks and projects"""
+	reconcile_actual_hours()
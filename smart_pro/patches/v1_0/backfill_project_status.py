@@ -0,0 +1,15 @@
+import frappe
+
+from smart_pro.smart_pro.doctype.smart_project.smart_project import PROJECT_STATUS_DOCTYPES
+
+
+def execute():
+	"""Copy each project's status into the new project_status column of its linked records"""
+	for doctype in PROJECT_STATUS_DOCTYPES:
+		frappe.db.sql(
+			f"""
+			UPDATE `tab{doctype}` child
+			INNER JOIN `tabSmart Project` project ON project.name = child.project
+			SET child.project_status = project.status
+			"""
+		)
@@ -0,0 +1,67 @@
+import re
+
+import frappe
+from frappe.utils import strip_html
+
+BATCH_SIZE = 1000
+
+SOURCE_PATTERN = re.compile(r"Task created from date request (\S+) for ")
+
+
+def execute():
+	"""Link tasks auto-created from a date request to it, parsing the request name from the description
+
+	Tasks are read in keyset batches by name and each batch is written with one UPDATE.
+	Descriptions edited in the Text Editor are wrapped in HTML, so the text is
+	matched anywhere and the tags are stripped before parsing.
+	"""
+	after = ""
+	while True:
+		tasks = frappe.db.sql(
+			"""
+			SELECT name, description
+			FROM `tabSmart Task`
+			WHERE name > %s
+				AND source_date_request IS NULL
+				AND description LIKE '%%Task created from date request %%'
+			ORDER BY name
+			LIMIT %s
+			""",
+			(after, BATCH_SIZE),
+		)
+		if not tasks:
+			break
+		after = tasks[-1][0]
+
+		sources = {}
+		for name, description in tasks:
+			match = SOURCE_PATTERN.search(strip_html(description or ""))
+			if match:
+				sources[name] = match.group(1)
+
+		existing = (
+			set(
+				frappe.get_all(
+					"Employee Date Request",
+					filters={"name": ["in", list(set(sources.values()))]},
+					pluck="name",
+				)
+			)
+			if sources
+			else set()
+		)
+		sources = {name: source for name, source in sources.items() if source in existing}
+		if not sources:
+			continue
+
+		cases = " ".join(["WHEN %s THEN %s"] * len(sources))
+		values = [value for item in sources.items() for value in item]
+		frappe.db.sql(
+			f"""
+			UPDATE `tabSmart Task`
+			SET source_date_request = CASE name {cases} END
+			WHERE name IN ({", ".join(["%s"] * len(sources))})
+			""",
+			values + list(sources),
+		)
+		frappe.db.commit()
@@ -0,0 +1,6 @@
+from smart_pro.smart_pro.doctype.smart_timesheet_rollup.smart_timesheet_rollup import rebuild_rollups
+
+
+def execute():
+	"""Fill the new Smart Timesheet Rollup table from the existing timesheets"""
+	rebuild_rollups()
@@ -0,0 +1,12 @@
+import frappe
+
+
+def execute():
+	"""Mark already approved date requests as processed so saving them again does not re-run the approval"""
+	frappe.db.sql(
+		"""
+		UPDATE `tabEmployee Date Request`
+		SET approval_processed = 1
+		WHERE status = 'Approved'
+		"""
+	)
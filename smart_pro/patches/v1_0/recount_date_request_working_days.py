@@ -0,0 +1,52 @@
+import frappe
+
+from smart_pro.smart_pro.overlaps import CLOSED_STATUSES
+from smart_pro.smart_pro.working_days import count_working_days_bulk, get_holiday_lists
+
+BATCH_SIZE = 5000
+
+
+def execute():
+	"""Recount total_days of open date requests as working days, a keyset batch at a time
+
+	Approved and closed requests keep the calendar days they were decided on.
+	"""
+	after = ""
+	while True:
+		requests = frappe.db.sql(
+			"""
+			SELECT name, employee, from_date, to_date
+			FROM `tabEmployee Date Request`
+			WHERE name > %s AND from_date IS NOT NULL AND to_date IS NOT NULL AND status NOT IN %s
+			ORDER BY name
+			LIMIT %s
+			""",
+			(after, ("Approved", *CLOSED_STATUSES), BATCH_SIZE),
+			as_dict=True,
+		)
+		if not requests:
+			break
+		after = requests[-1].name
+
+		holiday_lists = get_holiday_lists(request.employee for request in requests)
+		counts = count_working_days_bulk(
+			[request.from_date for request in requests],
+			[request.to_date for request in requests],
+			[holiday_lists.get(request.employee) for request in requests],
+		)
+
+		cases = " ".join(["WHEN %s THEN %s"] * len(requests))
+		values = [
+			value
+			for request, count in zip(requests, counts, strict=True)
+			for value in (request.name, int(count))
+		]
+		frappe.db.sql(
+			f"""
+			UPDATE `tabEmployee Date Request`
+			SET total_days = CASE name {cases} END
+			WHERE name IN ({", ".join(["%s"] * len(requests))})
+			""",
+			values + [request.name for request in requests],
+		)
+		frappe.db.commit()
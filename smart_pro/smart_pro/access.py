@@ -0,0 +1,136 @@
+"""
+Resolved per-user access profiles for Smart Pro
+Caches full-access flags, roles and the linked employee for each user in Redis
+"""
+
+from dataclasses import dataclass
+
+import frappe
+
+ACCESS_VERSION_KEY = "smart_pro:access_version"
+ACCESS_PROFILE_KEY = "smart_pro:access_profile"
+
+
+@dataclass(frozen=True)
+class AccessProfile:
+	"""Immutable snapshot of what a user is allowed to see in Smart Pro"""
+
+	user: str
+	roles: frozenset
+	employee: str | None
+	can_view_all_projects: bool
+	can_view_all_tasks: bool
+
+	def has_role(self, role):
+		return role in self.roles
+
+	@property
+	def is_system_manager(self):
+		return self.user == "Administrator" or "System Manager" in self.roles
+
+
+def get_access_version():
+	"""Get the current access version, creating one if the cache was flushed"""
+	version = frappe.cache().get_value(ACCESS_VERSION_KEY)
+	if not version:
+		version = _set_access_version()
+	return version
+
+
+def bump_access_version(*args, **kwargs):
+	"""Invalidate every cached AccessProfile by moving to a new version once the transaction commits
+
+	Moving it earlier would let another request cache a profile resolved from the
+	old rows under the new version. Accepts and ignores doc event arguments so it
+	can be used directly as a hook.
+	"""
+	frappe.local.smart_pro_access_profiles = {}
+	frappe.db.after_commit.add(_set_access_version)
+
+
+def _set_access_version():
+	version = frappe.generate_hash(length=12)
+	frappe.cache().set_value(ACCESS_VERSION_KEY, version)
+	frappe.local.smart_pro_access_profiles = {}
+	return version
+
+
+def get_access_profile(user=None):
+	"""Get the AccessProfile for a user
+
+	Looks in the request-local memo first, then Redis, and resolves from the
+	database only when the cached profile belongs to an older access version.
+	"""
+	if not user:
+		user = frappe.session.user
+
+	local_profiles = getattr(frappe.local, "smart_pro_access_profiles", None)
+	if local_profiles is None:
+		local_profiles = frappe.local.smart_pro_access_profiles = {}
+
+	if user in local_profiles:
+		return local_profiles[user]
+
+	version = get_access_version()
+	cached = frappe.cache().hget(ACCESS_PROFILE_KEY, user)
+	if cached and cached[0] == version:
+		profile = cached[1]
+	else:
+		profile = _resolve_access_profile(user)
+		# Uncommitted role or grant changes must not be cached for other requests
+		if not frappe.db.transaction_writes:
+			frappe.cache().hset(ACCESS_PROFILE_KEY, user, (version, profile))
+
+	local_profiles[user] = profile
+	return profile
+
+
+def _resolve_access_profile(user):
+	"""Build an AccessProfile from Smart Pro Settings, roles and the Employee link"""
+	from smart_pro.smart_pro.doctype.smart_pro_settings.smart_pro_settings import get_settings
+
+	roles = frozenset(frappe.get_roles(user))
+	employee = frappe.db.get_value("Employee", {"user_id": user}, "name") if user != "Guest" else None
+
+	if user == "Administrator" or "System Manager" in roles:
+		return AccessProfile(user, roles, employee, True, True)
+
+	settings = get_settings()
+	can_view_all_projects = False
+	can_view_all_tasks = False
+
+	# Explicit per-user grants from the users_with_full_access table
+	for row in settings.get("users_with_full_access") or []:
+		if row.user == user:
+			can_view_all_projects = can_view_all_projects or bool(row.can_view_all_projects)
+			can_view_all_tasks = can_view_all_tasks or bool(row.can_view_all_tasks)
+
+	# Any of the configured roles grants full access to both projects and tasks
+	roles_with_access = {
+		r.strip() for r in (settings.get("roles_with_full_access") or "").split("\n") if r.strip()
+	}
+	if roles_with_access & roles:
+		can_view_all_projects = can_view_all_tasks = True
+
+	return AccessProfile(user, roles, employee, can_view_all_projects, can_view_all_tasks)
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def on_user_update(doc, method=None):
+	"""Bump the access version when a user's roles change"""
+	previous = doc.get_doc_before_save()
+	if not previous:
+		return
+
+	old_roles = {row.role for row in previous.get("roles") or []}
+	new_roles = {row.role for row in doc.get("roles") or []}
+	if old_roles != new_roles or doc.has_value_changed("enabled"):
+		bump_access_version()
+
+
+def on_employee_update(doc, method=None):
+	"""Bump the access version when an employee is linked to a different user"""
+	if doc.has_value_changed("user_id"):
+		bump_access_version()
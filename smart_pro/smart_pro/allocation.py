@@ -0,0 +1,149 @@
+"""
+Cross-project allocation ledger for Smart Pro
+An employee's active Employee Project Assignments are kept in a cached
+IntervalIndex. The peak concurrent allocation over any date range is found with
+a sweep line over the assignments overlapping it, so saving an assignment checks
+that the employee is never booked above 100% on any day.
+"""
+
+import frappe
+
+from smart_pro.smart_pro.capacity import FULL_ALLOCATION, get_allocation_percentage
+from smart_pro.smart_pro.intervals import get_interval_index, invalidate_interval_indexes
+
+INTERVAL_KIND = "assignments"
+
+# Stands in for the end date of open-ended assignments, so ranges stay comparable
+OPEN_END = "9999-12-31"
+
+
+def _load_assignments(employees):
+	"""{employee: [(start_date, end_date, name, allocation, project)]} of the active assignments"""
+	intervals = {}
+	for row in frappe.get_all(
+		"Employee Project Assignment",
+		filters={"employee": ["in", employees], "status": "Active", "start_date": ["is", "set"]},
+		fields=["employee", "start_date", "end_date", "name", "allocation_percentage", "project"],
+	):
+		intervals.setdefault(row.employee, []).append(
+			(
+				row.start_date,
+				row.end_date or OPEN_END,
+				row.name,
+				get_allocation_percentage(row.allocation_percentage),
+				row.project,
+			)
+		)
+	return intervals
+
+
+def get_peak_allocation(intervals):
+	"""Sweep line over (start, end, allocation) inclusive ranges of ISO dates
+
+	A range adds its allocation at (start, 0) and removes it at (end, 1). On any
+	day the ranges starting then are counted before those ending then are
+	removed, so ranges sharing only their last and first day still overlap.
+
+	Returns:
+		(peak allocation, first day the peak is reached) or (0, None)
+	"""
+	events = []
+	for start, end, allocation in intervals:
+		events.append((str(start), 0, allocation))
+		events.append((str(end), 1, -allocation))
+	events.sort()
+
+	peak, peak_date, current = 0, None, 0
+	for date, _removal, allocation in events:
+		current += allocation
+		if current > peak:
+			peak, peak_date = current, date
+
+	return peak, peak_date
+
+
+def validate_assignment_allocation(doc):
+	"""Throw if saving the assignment books its employee above 100% on any day"""
+	if doc.status != "Active" or not (doc.employee and doc.start_date):
+		return
+
+	start = str(doc.start_date)
+	end = str(doc.end_date) if doc.end_date else OPEN_END
+	index = get_interval_index(INTERVAL_KIND, doc.employee, _load_assignments)
+
+	others = [interval for interval in index.overlapping(start, end) if interval[2] != doc.name]
+	peak, peak_date = get_peak_allocation(
+		[(max(other[0], start), min(other[1], end), other[3]) for other in others]
+		+ [(start, end, get_allocation_percentage(doc.allocation_percentage))]
+	)
+	if peak > FULL_ALLOCATION:
+		projects = sorted({other[4] for other in others if other[0] <= peak_date <= other[1]})
+		frappe.throw(
+			f"{doc.employee_name or doc.employee} would be allocated {peak:g}% on {peak_date}. "
+			f"Other active assignments that day: {', '.join(projects)}"
+		)
+
+
+def get_overallocations():
+	"""Employees whose active assignments add up to more than 100% on some day
+
+	Reads every active assignment in one query and sweeps each employee's.
+
+	Returns:
+		[{employee, employee_name, peak_allocation, peak_date, projects}] by peak, highest first
+	"""
+	assignments = frappe.get_all(
+		"Employee Project Assignment",
+		filters={"status": "Active", "start_date": ["is", "set"]},
+		fields=["employee", "employee_name", "start_date", "end_date", "allocation_percentage", "project"],
+	)
+
+	by_employee = {}
+	for row in assignments:
+		by_employee.setdefault(row.employee, []).append(row)
+
+	overallocated = []
+	for employee, rows in by_employee.items():
+		intervals = [
+			(
+				str(row.start_date),
+				str(row.end_date) if row.end_date else OPEN_END,
+				get_allocation_percentage(row.allocation_percentage),
+			)
+			for row in rows
+		]
+		peak, peak_date = get_peak_allocation(intervals)
+		if peak <= FULL_ALLOCATION:
+			continue
+
+		overallocated.append(
+			{
+				"employee": employee,
+				"employee_name": rows[0].employee_name,
+				"peak_allocation": peak,
+				"peak_date": peak_date,
+				"projects": sorted(
+					{
+						row.project
+						for row, (start, end, allocation) in zip(rows, intervals, strict=True)
+						if start <= peak_date <= end
+					}
+				),
+			}
+		)
+
+	return sorted(overallocated, key=lambda row: row["peak_allocation"], reverse=True)
+
+
+def invalidate_assignments(*employees):
+	"""Drop the cached assignments of employees whose assignments changed without doc events"""
+	invalidate_interval_indexes(INTERVAL_KIND, *employees)
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def on_change(doc, method=None):
+	"""on_update / on_trash of Employee Project Assignment: drop the cached intervals of its employee(s)"""
+	before = doc.get_doc_before_save() if method == "on_update" else None
+	invalidate_assignments(doc.employee, before and before.employee)
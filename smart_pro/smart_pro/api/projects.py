@@ -1,19 +1,77 @@
 import frappe
-from frappe.utils import now_datetime
-from smart_pro.smart_pro.doctype.smart_pro_settings.smart_pro_settings import user_has_full_access, user_can_view_all_tasks
+from frappe.utils import add_days, flt, getdate, now_datetime
+
+from smart_pro.smart_pro.access import get_access_profile
+from smart_pro.smart_pro.allocation import get_overallocations
+from smart_pro.smart_pro.capacity import get_capacity
+from smart_pro.smart_pro.counters import COUNTED_DOCTYPES, adjust_counts, get_status_counts
+from smart_pro.smart_pro.doctype.smart_pro_settings.smart_pro_settings import (
+    user_can_view_all_tasks,
+    user_has_full_access,
+)
+from smart_pro.smart_pro.doctype.smart_timesheet.smart_timesheet import MAX_HOURS_PER_DAY
+from smart_pro.smart_pro.doctype.smart_timesheet_rollup.smart_timesheet_rollup import (
+    apply_rollup_deltas,
+    get_period_start,
+    get_rollup_deltas,
+)
+from smart_pro.smart_pro.encoding import encode_rows, validate_format
+from smart_pro.smart_pro.enrichment import enrich_titles
+from smart_pro.smart_pro.export import export_timesheets as build_timesheet_export
+from smart_pro.smart_pro.hours import apply_hours_deltas, get_hours_deltas
+from smart_pro.smart_pro.membership import SOURCE_ASSIGNMENT, SOURCE_MANAGER, get_member_projects
+from smart_pro.smart_pro.overlaps import find_overlaps, get_conflicts
+from smart_pro.smart_pro.pagination import get_page, page_response
+from smart_pro.smart_pro.sync import get_changes as get_changes_since
+from smart_pro.smart_pro.timesheet_import import enqueue_import
+from smart_pro.smart_pro.transactions import savepoint
+from smart_pro.smart_pro.versions import bump_versions, etag_response, get_etag, is_not_modified, not_modified
+
+# List projections: the summary is returned by default and leaves out the Text Editor
+# columns, which clients request explicitly through `fields`
+TASK_SUMMARY_FIELDS = ["name", "title", "project", "status", "priority", "due_date", "progress", "assigned_to",
+                       "actual_hours", "approved_hours"]
+TASK_FIELDS = [*TASK_SUMMARY_FIELDS, "start_date", "project_status", "description", "project_scope"]
+
+DATE_REQUEST_SUMMARY_FIELDS = ["name", "request_type", "project", "project_title", "from_date", "to_date",
+                               "total_days", "status", "approver", "auto_create_tasks", "assignment"]
+DATE_REQUEST_FIELDS = [*DATE_REQUEST_SUMMARY_FIELDS, "employee", "employee_name", "project_status",
+                       "reason", "comments", "project_scope"]
+
+
+def _get_list_fields(fields, allowed, summary):
+    """Validate a client `fields` list against an endpoint's allow-list, defaulting to its summary"""
+    if not fields:
+        return list(summary)
+
+    fields = frappe.parse_json(fields) if isinstance(fields, str) else fields
+    invalid = [f for f in fields if f not in allowed]
+    if invalid:
+        frappe.throw(f"Invalid fields: {', '.join(invalid)}")
+
+    return ["name", *(f for f in fields if f != "name")]
+
 
 @frappe.whitelist()
-def get_user_projects(include_completed=False):
+def get_user_projects(include_completed=False, after=None, limit=None, etag=None):
     """Get only projects assigned to the current user via Employee Project Assignment
 
     Args:
         include_completed: If False (default), exclude completed projects for better performance
+        after: Optional cursor from a previous page (`next_cursor`); opts in to pagination
+        limit: Optional page size; opts in to pagination
+        etag: Optional ETag from a previous response ("" on the first call); opts in to
+            {"etag", "data"} responses and {"not_modified": True} when nothing changed
     """
     user = frappe.session.user
     # Convert string "true"/"false" to boolean
     if isinstance(include_completed, str):
         include_completed = include_completed.lower() == "true"
 
+    current_etag = get_etag("get_user_projects", ["Smart Project", "Employee Project Assignment"], include_completed, after, limit)
+    if is_not_modified(etag, current_etag):
+        return not_modified(current_etag)
+
     try:
         # Base filter to exclude completed projects (unless explicitly requested)
         base_filters = {}
@@ -23,135 +81,111 @@ def get_user_projects(include_completed=False):
         # Check if user has full access via Smart Pro Settings
         if user_has_full_access(user):
             # Return all non-completed projects
-            projects = frappe.get_list(
+            projects, next_cursor = get_page(
                 "Smart Project",
                 filters=base_filters,
-                fields=["name", "title", "status", "start_date", "end_date", "budget_amount", "project_manager"],
-                order_by="modified desc"
+                fields=["name", "title", "status", "start_date", "end_date", "budget_amount", "project_manager",
+                        "actual_hours", "approved_hours"],
+                order_by="modified desc",
+                after=after,
+                limit=limit
             )
             frappe.logger().info(f"get_user_projects: User {user} has full access, returning {len(projects)} projects (completed excluded: {not include_completed})")
         else:
-            # Get employee record for current user
-            employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
-
-            if not employee:
-                frappe.logger().info(f"get_user_projects: User {user} has no employee record")
-                return []
-
             # ONLY get projects where employee is assigned via Employee Project Assignment
-            assignments = frappe.get_list(
-                "Employee Project Assignment",
-                filters={
-                    "employee": employee,
-                    "status": "Active"
-                },
-                pluck="project"
-            )
+            assignments = get_member_projects(user, SOURCE_ASSIGNMENT)
 
             if not assignments:
-                frappe.logger().info(f"get_user_projects: Employee {employee} has no active assignments")
-                return []
+                frappe.logger().info(f"get_user_projects: User {user} has no active assignments")
+                return etag_response(page_response([], None, after, limit), etag, current_etag)
 
             # Combine filters
             project_filters = {"name": ["in", assignments]}
             if not include_completed:
                 project_filters["status"] = ["!=", "Completed"]
 
-            projects = frappe.get_list(
+            projects, next_cursor = get_page(
                 "Smart Project",
                 filters=project_filters,
-                fields=["name", "title", "status", "start_date", "end_date", "budget_amount", "project_manager"],
-                order_by="modified desc"
+                fields=["name", "title", "status", "start_date", "end_date", "budget_amount", "project_manager",
+                        "actual_hours", "approved_hours"],
+                order_by="modified desc",
+                after=after,
+                limit=limit
             )
 
-            frappe.logger().info(f"get_user_projects: Found {len(projects)} assigned projects for employee {employee} (completed excluded: {not include_completed})")
-        return projects
+            frappe.logger().info(f"get_user_projects: Found {len(projects)} assigned projects for user {user} (completed excluded: {not include_completed})")
+        return etag_response(page_response(projects, next_cursor, after, limit), etag, current_etag)
     except Exception as e:
-        frappe.logger().error(f"Error getting user projects: {str(e)}")
-        frappe.throw(f"Error loading projects: {str(e)}")
+        frappe.logger().error(f"Error getting user projects: {e!s}")
+        frappe.throw(f"Error loading projects: {e!s}")
 
 @frappe.whitelist()
-def get_user_tasks(include_from_completed_projects=False):
+def get_user_tasks(include_from_completed_projects=False, after=None, limit=None, etag=None, fields=None):
     """Get only tasks from projects assigned to the current user via Employee Project Assignment
 
     Args:
         include_from_completed_projects: If False (default), exclude tasks from completed projects for better performance
+        after: Optional cursor from a previous page (`next_cursor`); opts in to pagination
+        limit: Optional page size; opts in to pagination
+        etag: Optional ETag from a previous response ("" on the first call); opts in to
+            {"etag", "data"} responses and {"not_modified": True} when nothing changed
+        fields: Optional list of fields from TASK_FIELDS, defaults to TASK_SUMMARY_FIELDS
     """
     user = frappe.session.user
     # Convert string "true"/"false" to boolean
     if isinstance(include_from_completed_projects, str):
         include_from_completed_projects = include_from_completed_projects.lower() == "true"
 
+    current_etag = get_etag("get_user_tasks", ["Smart Task", "Employee Project Assignment"], include_from_completed_projects, after, limit, fields)
+    if is_not_modified(etag, current_etag):
+        return not_modified(current_etag)
+
     try:
-        # Get list of completed projects to exclude their tasks
-        completed_projects = []
+        fields = _get_list_fields(fields, TASK_FIELDS, TASK_SUMMARY_FIELDS)
+
+        # Exclude tasks from completed projects via the denormalized project_status column
+        task_filters = {}
         if not include_from_completed_projects:
-            completed_projects = frappe.get_list(
-                "Smart Project",
-                filters={"status": "Completed"},
-                pluck="name"
-            )
+            task_filters["project_status"] = ["!=", "Completed"]
 
         # Check if user has full access via Smart Pro Settings
         if user_can_view_all_tasks(user):
-            # Build filters
-            task_filters = {}
-            if completed_projects:
-                task_filters["project"] = ["not in", completed_projects]
 
             # Return all tasks (excluding from completed projects)
-            tasks = frappe.get_list(
+            tasks, next_cursor = get_page(
                 "Smart Task",
                 filters=task_filters if task_filters else None,
-                fields=["name", "title", "project", "status", "priority", "due_date", "progress", "assigned_to", "project_scope"],
-                order_by="due_date asc"
+                fields=fields,
+                order_by="due_date asc",
+                after=after,
+                limit=limit
             )
             frappe.logger().info(f"get_user_tasks: User {user} has full access, returning {len(tasks)} tasks (from completed projects excluded: {not include_from_completed_projects})")
         else:
-            # Get employee record for current user
-            employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
-
-            if not employee:
-                frappe.logger().info(f"get_user_tasks: User {user} has no employee record")
-                return []
-
             # ONLY get tasks from projects where employee is assigned via Employee Project Assignment
-            assignments = frappe.get_list(
-                "Employee Project Assignment",
-                filters={
-                    "employee": employee,
-                    "status": "Active"
-                },
-                pluck="project"
-            )
+            assignments = get_member_projects(user, SOURCE_ASSIGNMENT)
 
             if not assignments:
-                frappe.logger().info(f"get_user_tasks: Employee {employee} has no active assignments")
-                return []
-
-            # Filter out completed projects from assignments
-            if completed_projects:
-                assignments = [p for p in assignments if p not in completed_projects]
-
-            if not assignments:
-                frappe.logger().info(f"get_user_tasks: All assigned projects are completed for employee {employee}")
-                return []
+                frappe.logger().info(f"get_user_tasks: User {user} has no active assignments")
+                return etag_response(page_response([], None, after, limit), etag, current_etag)
 
             # Get tasks ONLY from assigned non-completed projects
-            tasks = frappe.get_list(
+            task_filters["project"] = ["in", assignments]
+            tasks, next_cursor = get_page(
                 "Smart Task",
-                filters={
-                    "project": ["in", assignments]
-                },
-                fields=["name", "title", "project", "status", "priority", "due_date", "progress", "assigned_to", "project_scope"],
-                order_by="due_date asc"
+                filters=task_filters,
+                fields=fields,
+                order_by="due_date asc",
+                after=after,
+                limit=limit
             )
 
-            frappe.logger().info(f"get_user_tasks: Found {len(tasks)} tasks from {len(assignments)} assigned non-completed projects for employee {employee}")
-        return tasks
+            frappe.logger().info(f"get_user_tasks: Found {len(tasks)} tasks from {len(assignments)} assigned projects for user {user} (from completed projects excluded: {not include_from_completed_projects})")
+        return etag_response(page_response(tasks, next_cursor, after, limit), etag, current_etag)
     except Exception as e:
-        frappe.logger().error(f"Error getting user tasks: {str(e)}")
-        frappe.throw(f"Error loading tasks: {str(e)}")
+        frappe.logger().error(f"Error getting user tasks: {e!s}")
+        frappe.throw(f"Error loading tasks: {e!s}")
 
 @frappe.whitelist()
 def get_project_details(project_name):
@@ -174,14 +208,18 @@ def get_project_details(project_name):
         frappe.throw(f"Project {project_name} not found")
 
 @frappe.whitelist()
-def get_project_tasks(project_name):
-    """Get all tasks for a specific project"""
+def get_project_tasks(project_name, fields=None):
+    """Get all tasks for a specific project
+
+    Args:
+        fields: Optional list of fields from TASK_FIELDS, defaults to TASK_SUMMARY_FIELDS
+    """
     tasks = frappe.get_list(
         "Smart Task",
         filters={
             "project": project_name
         },
-        fields=["name", "title", "assigned_to", "status", "priority", "due_date", "progress", "project_scope"],
+        fields=_get_list_fields(fields, TASK_FIELDS, TASK_SUMMARY_FIELDS),
         order_by="due_date asc"
     )
     return tasks
@@ -226,7 +264,7 @@ def get_employee_assignments(project_name):
 def get_pending_date_requests():
     """Get all pending date requests for the current user"""
     user = frappe.session.user
-    
+
     try:
         requests = frappe.get_list(
             "Employee Date Request",
@@ -240,26 +278,26 @@ def get_pending_date_requests():
         frappe.logger().info(f"get_pending_date_requests: Found {len(requests)} requests for user {user}")
         return requests
     except Exception as e:
-        frappe.logger().error(f"Error getting pending date requests: {str(e)}")
-        frappe.throw(f"Error loading pending requests: {str(e)}")
+        frappe.logger().error(f"Error getting pending date requests: {e!s}")
+        frappe.throw(f"Error loading pending requests: {e!s}")
 
 @frappe.whitelist()
 def get_debug_info():
     """Get debug information for troubleshooting"""
     user = frappe.session.user
-    
+
     try:
         # Count records in each doctype
         project_count = frappe.db.count("Smart Project")
         task_count = frappe.db.count("Smart Task")
         request_count = frappe.db.count("Employee Date Request")
         assignment_count = frappe.db.count("Employee Project Assignment")
-        
+
         # Get user-specific counts
         user_projects = frappe.db.count("Smart Project", {"project_manager": user})
         user_tasks = frappe.db.count("Smart Task", {"assigned_to": user})
         user_requests = frappe.db.count("Employee Date Request", {"approver": user, "status": "Pending Approval"})
-        
+
         debug_info = {
             "current_user": user,
             "total_projects": project_count,
@@ -270,24 +308,24 @@ def get_debug_info():
             "user_tasks": user_tasks,
             "user_pending_requests": user_requests
         }
-        
+
         frappe.logger().info(f"Debug info: {debug_info}")
         return debug_info
     except Exception as e:
-        frappe.logger().error(f"Error getting debug info: {str(e)}")
-        frappe.throw(f"Error getting debug info: {str(e)}")
+        frappe.logger().error(f"Error getting debug info: {e!s}")
+        frappe.throw(f"Error getting debug info: {e!s}")
 
 @frappe.whitelist()
 def get_team_members():
     """Get all team members managed by the current user (team lead)"""
     user = frappe.session.user
-    
+
     try:
         # Get all employees assigned to projects managed by current user
         assignments = frappe.get_list(
             "Employee Project Assignment",
             filters={
-                "project": ["in", frappe.get_list("Smart Project", filters={"project_manager": user}, pluck="name")]
+                "project": ["in", get_member_projects(user, SOURCE_MANAGER)]
             },
             fields=["name", "employee", "employee_name", "project", "role", "allocation_percentage", "status"],
             order_by="employee_name asc"
@@ -295,35 +333,49 @@ def get_team_members():
         frappe.logger().info(f"get_team_members: Found {len(assignments)} team members for user {user}")
         return assignments
     except Exception as e:
-        frappe.logger().error(f"Error getting team members: {str(e)}")
-        frappe.throw(f"Error loading team members: {str(e)}")
+        frappe.logger().error(f"Error getting team members: {e!s}")
+        frappe.throw(f"Error loading team members: {e!s}")
 
 @frappe.whitelist()
-def get_team_tasks():
-    """Get all tasks for projects managed by the current user"""
+def get_team_tasks(format=None):
+    """Get all tasks for projects managed by the current user
+
+    Args:
+        format: Optional compact encoding, "columnar" or "dictionary" (see encoding.encode_rows)
+    """
     user = frappe.session.user
-    
+    validate_format(format)
+
     try:
         # Get all tasks for projects managed by current user
         tasks = frappe.get_list(
             "Smart Task",
             filters={
-                "project": ["in", frappe.get_list("Smart Project", filters={"project_manager": user}, pluck="name")]
+                "project": ["in", get_member_projects(user, SOURCE_MANAGER)]
             },
             fields=["name", "title", "project", "assigned_to", "status", "priority", "due_date", "progress"],
             order_by="due_date asc"
         )
         frappe.logger().info(f"get_team_tasks: Found {len(tasks)} tasks for user {user}")
-        return tasks
+        return encode_rows(tasks, format)
     except Exception as e:
-        frappe.logger().error(f"Error getting team tasks: {str(e)}")
-        frappe.throw(f"Error loading team tasks: {str(e)}")
+        frappe.logger().error(f"Error getting team tasks: {e!s}")
+        frappe.throw(f"Error loading team tasks: {e!s}")
 
 @frappe.whitelist()
-def get_pending_approvals():
-    """Get all pending approvals (date requests and timesheets) for the current user"""
+def get_pending_approvals(etag=None):
+    """Get all pending approvals (date requests and timesheets) for the current user
+
+    Args:
+        etag: Optional ETag from a previous response ("" on the first call); opts in to
+            {"etag", "data"} responses and {"not_modified": True} when nothing changed
+    """
     user = frappe.session.user
-    
+
+    current_etag = get_etag("get_pending_approvals", ["Employee Date Request"])
+    if is_not_modified(etag, current_etag):
+        return not_modified(current_etag)
+
     try:
         # Get pending date requests
         date_requests = frappe.get_list(
@@ -335,69 +387,70 @@ def get_pending_approvals():
             fields=["name", "employee", "employee_name", "request_type", "from_date", "to_date", "reason"],
             order_by="modified desc"
         )
-        
+
         frappe.logger().info(f"get_pending_approvals: Found {len(date_requests)} pending approvals for user {user}")
-        return {
+        return etag_response({
             "date_requests": date_requests
-        }
+        }, etag, current_etag)
     except Exception as e:
-        frappe.logger().error(f"Error getting pending approvals: {str(e)}")
-        frappe.throw(f"Error loading pending approvals: {str(e)}")
+        frappe.logger().error(f"Error getting pending approvals: {e!s}")
+        frappe.throw(f"Error loading pending approvals: {e!s}")
+
+def _can_approve_date_request(request_doc, user, profile, project_manager=None):
+    """Whether the user may approve or reject a date request
+
+    The user is its designated approver, has full access, is a System Manager,
+    manages the related project, or no approver is set (self-approval allowed
+    for project managers).
+    """
+    return (
+        request_doc.approver == user
+        or profile.can_view_all_projects
+        or profile.is_system_manager
+        or bool(request_doc.project and project_manager == user)
+        or not request_doc.approver
+    )
+
+
+def _set_date_request_status(request_doc, status, comments=None):
+    """Move a date request to Approved or Rejected with a single save
+
+    The approval side effects (project and assignment dates, task creation) run
+    from the controller's on_update, exactly once per request, in this transaction.
+    """
+    if status not in ("Approved", "Rejected"):
+        frappe.throw(f"Invalid status: {status}")
+
+    request_doc.status = status
+    if comments:
+        request_doc.comments = comments
+    request_doc.save()
+
 
 @frappe.whitelist()
 def approve_date_request(request_id, status, comments=None):
     """Approve or reject a date request"""
     user = frappe.session.user
-    user_roles = frappe.get_roles(user)
+    profile = get_access_profile(user)
 
     try:
         request_doc = frappe.get_doc("Employee Date Request", request_id)
 
-        # Check if user is authorized to approve:
-        # 1. User is the designated approver
-        # 2. User has full access via Smart Pro Settings
-        # 3. User is the project manager of the related project
-        # 4. User is System Manager or Administrator
-        # 5. No approver is set (self-approval allowed for project managers)
-        is_approver = request_doc.approver == user
-        has_full_access = user_has_full_access(user)
-        is_system_manager = "System Manager" in user_roles or user == "Administrator"
-        is_project_manager = False
-        no_approver_set = not request_doc.approver  # Allow self-approval when no approver
-
+        project_manager = None
         if request_doc.project:
             project_manager = frappe.db.get_value("Smart Project", request_doc.project, "project_manager")
-            is_project_manager = project_manager == user
-
-        # Log authorization check for debugging
-        frappe.logger().info(f"Approval check - User: {user}, Approver: {request_doc.approver}, "
-                            f"is_approver: {is_approver}, has_full_access: {has_full_access}, "
-                            f"is_system_manager: {is_system_manager}, is_project_manager: {is_project_manager}, "
-                            f"no_approver_set: {no_approver_set}, roles: {user_roles}")
 
-        if not (is_approver or has_full_access or is_system_manager or is_project_manager or no_approver_set):
+        if not _can_approve_date_request(request_doc, user, profile, project_manager):
             frappe.throw(f"You are not authorized to approve this request. User: {user}, Approver: {request_doc.approver}")
 
-        # Store old status to detect change
         old_status = request_doc.status
+        _set_date_request_status(request_doc, status, comments)
 
-        # Update status
-        request_doc.status = status  # "Approved" or "Rejected"
-        if comments:
-            request_doc.comments = comments
-        request_doc.save()
-
-        # Manually trigger approval/rejection actions if status changed
         message = f"Request {status.lower()} successfully"
         if old_status != status:
             if status == "Approved":
-                # Call the on_approval method explicitly to create tasks and update dates
-                request_doc.on_approval()
-                frappe.db.commit()
                 message = "Request approved! Project dates updated and tasks created."
-                frappe.logger().info(f"Date request {request_id} approved - tasks created and dates updated")
             elif status == "Rejected":
-                request_doc.on_rejection()
                 message = "Request rejected."
 
         frappe.logger().info(f"Date request {request_id} {status} by {user}")
@@ -406,8 +459,138 @@ def approve_date_request(request_id, status, comments=None):
             "message": message
         }
     except Exception as e:
-        frappe.logger().error(f"Error approving date request: {str(e)}")
-        frappe.throw(f"Error approving request: {str(e)}")
+        frappe.logger().error(f"Error approving date request: {e!s}")
+        frappe.throw(f"Error approving request: {e!s}")
+
+
+@frappe.whitelist()
+def approve_date_requests(ids, comments=None):
+    """Approve several date requests in one transaction
+
+    Project managers are fetched with one query. Each request is approved under
+    its own savepoint, so one that fails is reported, its queued cache and counter
+    updates are dropped, and the rest still commit together.
+
+    Args:
+        ids: JSON list of Employee Date Request names
+        comments: Optional approver comments set on every request
+
+    Returns:
+        {"success", "approved", "results": [{"name", "success", "error"?}]}
+    """
+    user = frappe.session.user
+    profile = get_access_profile(user)
+
+    try:
+        ids = frappe.parse_json(ids) if isinstance(ids, str) else ids
+        ids = list(dict.fromkeys(ids or []))
+        if not ids:
+            return {"success": True, "approved": 0, "results": []}
+
+        projects = frappe.get_all(
+            "Employee Date Request",
+            filters={"name": ["in", ids]},
+            pluck="project"
+        )
+        project_managers = dict(frappe.get_all(
+            "Smart Project",
+            filters={"name": ["in", list({project for project in projects if project})]},
+            fields=["name", "project_manager"],
+            as_list=True
+        )) if any(projects) else {}
+
+        results = []
+        for request_id in ids:
+            try:
+                with savepoint("approve_date_request"):
+                    request_doc = frappe.get_doc("Employee Date Request", request_id)
+                    if not _can_approve_date_request(request_doc, user, profile, project_managers.get(request_doc.project)):
+                        frappe.throw("You are not authorized to approve this request")
+
+                    _set_date_request_status(request_doc, "Approved", comments)
+            except Exception as e:
+                frappe.clear_last_message()
+                results.append({"name": request_id, "success": False, "error": str(e)})
+                continue
+
+            results.append({"name": request_id, "success": True})
+
+        approved = sum(1 for result in results if result["success"])
+        frappe.logger().info(f"{approved} of {len(ids)} date requests approved by {user}")
+        return {
+            "success": approved == len(ids),
+            "approved": approved,
+            "results": results
+        }
+    except Exception as e:
+        frappe.logger().error(f"Error approving date requests: {e!s}")
+        frappe.throw(f"Error approving requests: {e!s}")
+
+
+@frappe.whitelist()
+def get_date_request_overlaps(employee, from_date, to_date, exclude=None, request_type=None, project=None):
+    """Open date requests of an employee overlapping a date range
+
+    Args:
+        employee: Employee to check, the user's own unless they have full access
+        from_date: First day of the range
+        to_date: Last day of the range
+        exclude: Optional request to leave out, e.g. the one being edited
+        request_type: Optional type of the request being entered; only the
+            requests conflicting with it (leaves, or the same project) are returned
+        project: Optional project of the request being entered
+    """
+    user = frappe.session.user
+    profile = get_access_profile(user)
+
+    if employee != profile.employee and not (profile.can_view_all_projects or profile.is_system_manager):
+        frappe.throw("You are not authorized to view this employee's requests", frappe.PermissionError)
+
+    try:
+        return find_overlaps(employee, getdate(from_date), getdate(to_date), exclude=exclude,
+                             request_type=request_type, project=project)
+    except Exception as e:
+        frappe.logger().error(f"Error finding overlapping requests: {e!s}")
+        frappe.throw(f"Error loading overlapping requests: {e!s}")
+
+
+@frappe.whitelist()
+def get_date_request_conflicts(status="Pending Approval"):
+    """Conflicts report for approvers: requests awaiting the user that conflict with other open requests
+
+    A leave conflicts with any overlapping request, work requests only with
+    overlapping requests on the same project.
+
+    Full access users see the conflicts of every request in the status. All
+    employees' cached intervals are read together in one round trip.
+
+    Returns:
+        [{name, employee, employee_name, request_type, project, from_date, to_date, overlaps: [...]}]
+    """
+    user = frappe.session.user
+    profile = get_access_profile(user)
+
+    try:
+        filters = {"status": status}
+        if not (profile.can_view_all_projects or profile.is_system_manager):
+            filters["approver"] = user
+
+        requests = frappe.get_all(
+            "Employee Date Request",
+            filters=filters,
+            fields=["name", "employee", "employee_name", "request_type", "project", "from_date", "to_date"],
+            order_by="from_date"
+        )
+        conflicts = get_conflicts(requests)
+
+        return [
+            dict(request, overlaps=conflicts[request.name])
+            for request in requests
+            if request.name in conflicts
+        ]
+    except Exception as e:
+        frappe.logger().error(f"Error getting date request conflicts: {e!s}")
+        frappe.throw(f"Error loading date request conflicts: {e!s}")
 
 
 @frappe.whitelist()
@@ -423,7 +606,7 @@ def update_date_request(request_id, from_date, to_date, reason=None):
             frappe.throw("Only pending requests can be modified")
 
         # Verify user is the employee who created it, the approver, or has full access
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_access_profile(user).employee
         if request_doc.employee != employee and request_doc.approver != user and not user_has_full_access(user):
             frappe.throw("You are not authorized to modify this request")
 
@@ -440,14 +623,14 @@ def update_date_request(request_id, from_date, to_date, reason=None):
             "message": "Request updated successfully"
         }
     except Exception as e:
-        frappe.logger().error(f"Error updating date request: {str(e)}")
-        frappe.throw(f"Error updating request: {str(e)}")
+        frappe.logger().error(f"Error updating date request: {e!s}")
+        frappe.throw(f"Error updating request: {e!s}")
 
 @frappe.whitelist()
 def get_user_time_sheets():
     """Get all time sheets for the current user"""
     user = frappe.session.user
-    
+
     try:
         # Get employee record for current user
         employee = frappe.get_list(
@@ -455,10 +638,10 @@ def get_user_time_sheets():
             filters={"user_id": user},
             pluck="name"
         )
-        
+
         if not employee:
             return []
-        
+
         timesheets = frappe.get_list(
             "Smart Time Sheet",
             filters={
@@ -470,27 +653,27 @@ def get_user_time_sheets():
         frappe.logger().info(f"get_user_time_sheets: Found {len(timesheets)} time sheets for user {user}")
         return timesheets
     except Exception as e:
-        frappe.logger().error(f"Error getting time sheets: {str(e)}")
-        frappe.throw(f"Error loading time sheets: {str(e)}")
+        frappe.logger().error(f"Error getting time sheets: {e!s}")
+        frappe.throw(f"Error loading time sheets: {e!s}")
 
 @frappe.whitelist()
 def get_team_time_sheets():
     """Get all time sheets for team members managed by current user"""
     user = frappe.session.user
-    
+
     try:
         # Get all team members
         team_members = frappe.get_list(
             "Employee Project Assignment",
             filters={
-                "project": ["in", frappe.get_list("Smart Project", filters={"project_manager": user}, pluck="name")]
+                "project": ["in", get_member_projects(user, SOURCE_MANAGER)]
             },
             pluck="employee"
         )
-        
+
         if not team_members:
             return []
-        
+
         # Get time sheets for all team members
         timesheets = frappe.get_list(
             "Smart Time Sheet",
@@ -503,8 +686,8 @@ def get_team_time_sheets():
         frappe.logger().info(f"get_team_time_sheets: Found {len(timesheets)} time sheets for user {user}")
         return timesheets
     except Exception as e:
-        frappe.logger().error(f"Error getting team time sheets: {str(e)}")
-        frappe.throw(f"Error loading team time sheets: {str(e)}")
+        frappe.logger().error(f"Error getting team time sheets: {e!s}")
+        frappe.throw(f"Error loading team time sheets: {e!s}")
 
 @frappe.whitelist()
 def get_user_roles():
@@ -520,65 +703,81 @@ def get_user_roles():
             "is_employee": "Employee" in roles
         }
     except Exception as e:
-        frappe.logger().error(f"Error getting user roles: {str(e)}")
-        frappe.throw(f"Error loading user roles: {str(e)}")
+        frappe.logger().error(f"Error getting user roles: {e!s}")
+        frappe.throw(f"Error loading user roles: {e!s}")
 
 
 # ==================== EMPLOYEE ASSIGNED PROJECTS ====================
 
+# Output key -> column for get_employee_assigned_projects (a = assignment, p = project)
+ASSIGNED_PROJECT_FIELDS = {
+    "assignment": "a.name",
+    "project": "p.name",
+    "title": "p.title",
+    "description": "p.description",
+    "status": "p.status",
+    "project_manager": "p.project_manager",
+    "start_date": "p.start_date",
+    "end_date": "p.end_date",
+    "role": "a.role",
+    "allocation_percentage": "a.allocation_percentage",
+}
+
+
 @frappe.whitelist()
-def get_employee_assigned_projects():
-    """Get all projects assigned to the current employee"""
+def get_employee_assigned_projects(fields=None):
+    """Get all projects assigned to the current employee
+
+    Args:
+        fields: Optional list of output fields to return (see ASSIGNED_PROJECT_FIELDS), defaults to all
+    """
     user = frappe.session.user
 
     try:
         # Get employee record for current user
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_access_profile(user).employee
 
         if not employee:
             return []
 
-        # Get all active assignments for this employee
-        assignments = frappe.get_list(
-            "Employee Project Assignment",
-            filters={
-                "employee": employee,
-                "status": "Active"
-            },
-            fields=["name", "project", "role", "allocation_percentage", "start_date", "end_date"]
-        )
+        fields = frappe.parse_json(fields) if fields else list(ASSIGNED_PROJECT_FIELDS)
+        invalid = [f for f in fields if f not in ASSIGNED_PROJECT_FIELDS]
+        if invalid:
+            frappe.throw(f"Invalid fields: {', '.join(invalid)}")
 
-        # Get project details for each assignment
-        projects = []
-        for assignment in assignments:
-            project = frappe.get_doc("Smart Project", assignment.project)
-            projects.append({
-                "assignment": assignment.name,
-                "project": project.name,
-                "title": project.title,
-                "description": project.description,
-                "status": project.status,
-                "project_manager": project.project_manager,
-                "start_date": str(project.start_date) if project.start_date else None,
-                "end_date": str(project.end_date) if project.end_date else None,
-                "role": assignment.role,
-                "allocation_percentage": assignment.allocation_percentage
-            })
+        columns = ", ".join(f"{ASSIGNED_PROJECT_FIELDS[f]} AS `{f}`" for f in fields)
+
+        # Active assignments and their project details in a single query
+        projects = frappe.db.sql(f"""
+            SELECT {columns}
+            FROM `tabEmployee Project Assignment` a
+            INNER JOIN `tabSmart Project` p ON p.name = a.project
+            WHERE a.employee = %s AND a.status = 'Active'
+            ORDER BY a.modified DESC
+        """, (employee,), as_dict=True)
+
+        for project in projects:
+            for date_field in ("start_date", "end_date"):
+                if date_field in project:
+                    project[date_field] = str(project[date_field]) if project[date_field] else None
 
         return projects
     except Exception as e:
-        frappe.logger().error(f"Error getting employee assigned projects: {str(e)}")
-        frappe.throw(f"Error loading assigned projects: {str(e)}")
+        frappe.logger().error(f"Error getting employee assigned projects: {e!s}")
+        frappe.throw(f"Error loading assigned projects: {e!s}")
 
 
 # ==================== EMPLOYEE DATE REQUEST APIs ====================
 
 @frappe.whitelist()
-def get_my_date_requests(include_from_completed_projects=False):
+def get_my_date_requests(include_from_completed_projects=False, after=None, limit=None, fields=None):
     """Get all date requests submitted by current employee
 
     Args:
         include_from_completed_projects: If False (default), exclude requests from completed projects
+        after: Optional cursor from a previous page (`next_cursor`); opts in to pagination
+        limit: Optional page size; opts in to pagination
+        fields: Optional list of fields from DATE_REQUEST_FIELDS, defaults to DATE_REQUEST_SUMMARY_FIELDS
     """
     user = frappe.session.user
 
@@ -587,37 +786,31 @@ def get_my_date_requests(include_from_completed_projects=False):
         include_from_completed_projects = include_from_completed_projects.lower() == "true"
 
     try:
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        fields = _get_list_fields(fields, DATE_REQUEST_FIELDS, DATE_REQUEST_SUMMARY_FIELDS)
+        employee = get_access_profile(user).employee
 
         if not employee:
-            return []
+            return page_response([], None, after, limit)
 
-        # Get list of completed projects to exclude
-        completed_projects = []
+        filters = {"employee": employee}
+
+        # Exclude requests from completed projects
         if not include_from_completed_projects:
-            completed_projects = frappe.get_list(
-                "Smart Project",
-                filters={"status": "Completed"},
-                pluck="name"
-            )
+            filters["project_status"] = ["!=", "Completed"]
 
-        requests = frappe.get_list(
+        requests, next_cursor = get_page(
             "Employee Date Request",
-            filters={"employee": employee},
-            fields=["name", "request_type", "project", "project_title", "from_date", "to_date",
-                    "total_days", "status", "reason", "approver", "comments", "auto_create_tasks",
-                    "project_scope", "assignment"],
-            order_by="modified desc"
+            filters=filters,
+            fields=fields,
+            order_by="modified desc",
+            after=after,
+            limit=limit
         )
 
-        # Filter out requests from completed projects
-        if completed_projects:
-            requests = [r for r in requests if r.get("project") not in completed_projects]
-
-        return requests
+        return page_response(requests, next_cursor, after, limit)
     except Exception as e:
-        frappe.logger().error(f"Error getting date requests: {str(e)}")
-        frappe.throw(f"Error loading date requests: {str(e)}")
+        frappe.logger().error(f"Error getting date requests: {e!s}")
+        frappe.throw(f"Error loading date requests: {e!s}")
 
 
 @frappe.whitelist()
@@ -626,7 +819,7 @@ def create_date_request(project, from_date, to_date, reason, request_type="Proje
     user = frappe.session.user
 
     try:
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_access_profile(user).employee
 
         if not employee:
             frappe.throw("You are not linked to an employee record")
@@ -651,20 +844,24 @@ def create_date_request(project, from_date, to_date, reason, request_type="Proje
             "message": "Date request created successfully"
         }
     except Exception as e:
-        frappe.logger().error(f"Error creating date request: {str(e)}")
-        frappe.throw(f"Error creating date request: {str(e)}")
+        frappe.logger().error(f"Error creating date request: {e!s}")
+        frappe.throw(f"Error creating date request: {e!s}")
 
 
 # ==================== TIMESHEET APIs ====================
 
 @frappe.whitelist()
-def get_my_timesheets(from_date=None, to_date=None, include_from_completed_projects=False):
+def get_my_timesheets(from_date=None, to_date=None, include_from_completed_projects=False, after=None, limit=None, etag=None):
     """Get all timesheets for current employee
 
     Args:
         from_date: Optional filter for start date
         to_date: Optional filter for end date
         include_from_completed_projects: If False (default), exclude timesheets from completed projects
+        after: Optional cursor from a previous page (`next_cursor`); opts in to pagination
+        limit: Optional page size; opts in to pagination
+        etag: Optional ETag from a previous response ("" on the first call); opts in to
+            {"etag", "data"} responses and {"not_modified": True} when nothing changed
     """
     user = frappe.session.user
 
@@ -672,26 +869,21 @@ def get_my_timesheets(from_date=None, to_date=None, include_from_completed_proje
     if isinstance(include_from_completed_projects, str):
         include_from_completed_projects = include_from_completed_projects.lower() == "true"
 
+    current_etag = get_etag("get_my_timesheets", ["Smart Timesheet"], from_date, to_date, include_from_completed_projects, after, limit)
+    if is_not_modified(etag, current_etag):
+        return not_modified(current_etag)
+
     try:
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_access_profile(user).employee
 
         if not employee:
-            return []
-
-        # Get list of completed projects to exclude
-        completed_projects = []
-        if not include_from_completed_projects:
-            completed_projects = frappe.get_list(
-                "Smart Project",
-                filters={"status": "Completed"},
-                pluck="name"
-            )
+            return etag_response(page_response([], None, after, limit), etag, current_etag)
 
         filters = {"employee": employee}
 
         # Exclude timesheets from completed projects
-        if completed_projects:
-            filters["project"] = ["not in", completed_projects]
+        if not include_from_completed_projects:
+            filters["project_status"] = ["!=", "Completed"]
 
         if from_date:
             filters["date"] = [">=", from_date]
@@ -701,18 +893,20 @@ def get_my_timesheets(from_date=None, to_date=None, include_from_completed_proje
             else:
                 filters["date"] = ["<=", to_date]
 
-        timesheets = frappe.get_list(
+        timesheets, next_cursor = get_page(
             "Smart Timesheet",
             filters=filters,
             fields=["name", "date", "project", "task", "task_title", "activity_type",
                     "hours_worked", "description", "status"],
-            order_by="date desc"
+            order_by="date desc",
+            after=after,
+            limit=limit
         )
 
-        return timesheets
+        return etag_response(page_response(timesheets, next_cursor, after, limit), etag, current_etag)
     except Exception as e:
-        frappe.logger().error(f"Error getting timesheets: {str(e)}")
-        frappe.throw(f"Error loading timesheets: {str(e)}")
+        frappe.logger().error(f"Error getting timesheets: {e!s}")
+        frappe.throw(f"Error loading timesheets: {e!s}")
 
 
 @frappe.whitelist()
@@ -721,7 +915,7 @@ def create_timesheet(task, date, hours_worked, description, activity_type="Devel
     user = frappe.session.user
 
     try:
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_access_profile(user).employee
 
         if not employee:
             frappe.throw("You are not linked to an employee record")
@@ -750,8 +944,117 @@ def create_timesheet(task, date, hours_worked, description, activity_type="Devel
             "message": "Timesheet created successfully"
         }
     except Exception as e:
-        frappe.logger().error(f"Error creating timesheet: {str(e)}")
-        frappe.throw(f"Error creating timesheet: {str(e)}")
+        frappe.logger().error(f"Error creating timesheet: {e!s}")
+        frappe.throw(f"Error creating timesheet: {e!s}")
+
+
+@frappe.whitelist()
+def create_timesheets_bulk(entries):
+    """Create several timesheet entries (e.g. a week grid) in one transaction
+
+    All rows are validated against one prefetched task map and the hours already
+    logged on their dates. A row that fails is reported and skipped, along with
+    the counter and rollup updates it queued; the others are still inserted.
+
+    Args:
+        entries: JSON list of {task, date, hours_worked, description, activity_type, notes}
+
+    Returns:
+        {"success", "created", "results": [{"index", "success", "name" | "error"}]}
+    """
+    user = frappe.session.user
+
+    try:
+        employee = get_access_profile(user).employee
+
+        if not employee:
+            frappe.throw("You are not linked to an employee record")
+
+        entries = frappe.parse_json(entries) if isinstance(entries, str) else entries
+        if not entries:
+            return {"success": True, "created": 0, "results": []}
+
+        task_names = {entry.get("task") for entry in entries if entry.get("task")}
+        tasks = {
+            task.name: task
+            for task in frappe.get_all(
+                "Smart Task",
+                filters={"name": ["in", list(task_names)]},
+                fields=["name", "title", "project", "project_status"]
+            )
+        } if task_names else {}
+
+        dates = {getdate(entry.get("date")) for entry in entries if entry.get("date")}
+        hours_by_date = dict(frappe.db.sql("""
+            SELECT date, SUM(hours_worked)
+            FROM `tabSmart Timesheet`
+            WHERE employee = %s AND date IN %s AND status != 'Rejected'
+            GROUP BY date
+        """, (employee, tuple(dates)))) if dates else {}
+
+        employee_name = frappe.db.get_value("Employee", employee, "employee_name")
+
+        results = []
+        for index, entry in enumerate(entries):
+            task = tasks.get(entry.get("task"))
+            hours = flt(entry.get("hours_worked"))
+            date = getdate(entry.get("date")) if entry.get("date") else None
+
+            error = None
+            if not task:
+                error = f"Task '{entry.get('task')}' not found"
+            elif not date:
+                error = "Date is required"
+            elif not entry.get("description"):
+                error = "Description is required"
+            elif hours <= 0:
+                error = "Hours worked must be greater than 0"
+            elif flt(hours_by_date.get(date)) + hours > MAX_HOURS_PER_DAY:
+                error = f"Total hours on {date} cannot exceed {MAX_HOURS_PER_DAY}"
+
+            if error:
+                results.append({"index": index, "success": False, "error": error})
+                continue
+
+            doc = frappe.get_doc({
+                "doctype": "Smart Timesheet",
+                "employee": employee,
+                "employee_name": employee_name,
+                "date": date,
+                "project": task.project,
+                "project_status": task.project_status,
+                "task": task.name,
+                "task_title": task.title,
+                "activity_type": entry.get("activity_type") or "Development",
+                "hours_worked": hours,
+                "description": entry.get("description"),
+                "notes": entry.get("notes"),
+                "status": "Draft"
+            })
+            # Task, project and employee were resolved above
+            doc.flags.task_project_validated = True
+            doc.flags.ignore_links = True
+
+            try:
+                with savepoint("bulk_timesheet"):
+                    doc.insert()
+            except Exception as e:
+                frappe.clear_last_message()
+                results.append({"index": index, "success": False, "error": str(e)})
+                continue
+
+            hours_by_date[date] = flt(hours_by_date.get(date)) + hours
+            results.append({"index": index, "success": True, "name": doc.name})
+
+        created = sum(1 for result in results if result["success"])
+        return {
+            "success": created == len(entries),
+            "created": created,
+            "results": results
+        }
+    except Exception as e:
+        frappe.logger().error(f"Error creating timesheets: {e!s}")
+        frappe.throw(f"Error creating timesheets: {e!s}")
 
 
 @frappe.whitelist()
@@ -767,8 +1070,8 @@ def submit_timesheet(timesheet_name):
             "message": "Timesheet submitted successfully"
         }
     except Exception as e:
-        frappe.logger().error(f"Error submitting timesheet: {str(e)}")
-        frappe.throw(f"Error submitting timesheet: {str(e)}")
+        frappe.logger().error(f"Error submitting timesheet: {e!s}")
+        frappe.throw(f"Error submitting timesheet: {e!s}")
 
 
 @frappe.whitelist()
@@ -783,29 +1086,35 @@ def get_task_timesheets(task_name):
             order_by="date desc"
         )
 
-        # Calculate total hours
-        total_hours = sum(ts.get("hours_worked", 0) for ts in timesheets)
+        # Totals are kept on the task as timesheets change
+        total_hours, approved_hours = frappe.db.get_value(
+            "Smart Task", task_name, ["actual_hours", "approved_hours"]
+        ) or (0, 0)
 
         return {
             "timesheets": timesheets,
-            "total_hours": total_hours
+            "total_hours": flt(total_hours),
+            "approved_hours": flt(approved_hours)
         }
     except Exception as e:
-        frappe.logger().error(f"Error getting task timesheets: {str(e)}")
-        frappe.throw(f"Error loading task timesheets: {str(e)}")
+        frappe.logger().error(f"Error getting task timesheets: {e!s}")
+        frappe.throw(f"Error loading task timesheets: {e!s}")
 
 
 @frappe.whitelist()
 def get_today_summary():
-    """Get today's work summary for current employee"""
+    """Get today's work summary for current employee
+
+    Hours come from the Smart Timesheet Rollup rows of today's day, week and month.
+    """
     user = frappe.session.user
     from frappe.utils import today
 
     try:
-        employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+        employee = get_access_profile(user).employee
 
         if not employee:
-            return {"timesheets": [], "total_hours": 0, "tasks_worked": 0}
+            return {"timesheets": [], "total_hours": 0, "week_hours": 0, "month_hours": 0, "tasks_worked": 0}
 
         timesheets = frappe.get_list(
             "Smart Timesheet",
@@ -816,16 +1125,77 @@ def get_today_summary():
             fields=["name", "task", "task_title", "project", "hours_worked", "activity_type", "status"]
         )
 
-        total_hours = sum(ts.get("hours_worked", 0) for ts in timesheets)
+        hours = dict(frappe.db.sql("""
+            SELECT period_type, SUM(hours)
+            FROM `tabSmart Timesheet Rollup`
+            WHERE employee = %(employee)s AND (
+                (period_type = 'Day' AND period_start = %(day)s)
+                OR (period_type = 'Week' AND period_start = %(week)s)
+                OR (period_type = 'Month' AND period_start = %(month)s)
+            )
+            GROUP BY period_type
+        """, {
+            "employee": employee,
+            "day": today(),
+            "week": get_period_start(today(), "Week"),
+            "month": get_period_start(today(), "Month"),
+        }))
 
         return {
             "timesheets": timesheets,
-            "total_hours": total_hours,
+            "total_hours": flt(hours.get("Day")),
+            "week_hours": flt(hours.get("Week")),
+            "month_hours": flt(hours.get("Month")),
             "tasks_worked": len(timesheets)
         }
     except Exception as e:
-        frappe.logger().error(f"Error getting today summary: {str(e)}")
-        frappe.throw(f"Error loading today summary: {str(e)}")
+        frappe.logger().error(f"Error getting today summary: {e!s}")
+        frappe.throw(f"Error loading today summary: {e!s}")
+
+
+@frappe.whitelist()
+def get_my_timesheet_totals(period_type="Week", from_date=None, to_date=None, group_by=None):
+    """Get the current employee's logged and approved hours per day, week or month
+
+    Args:
+        period_type: "Day", "Week" (starting Monday) or "Month"
+        from_date: Optional first period start to include
+        to_date: Optional last period start to include
+        group_by: Optional "project" or "activity_type" breakdown within each period
+    """
+    user = frappe.session.user
+
+    if period_type not in ("Day", "Week", "Month"):
+        frappe.throw(f"Invalid period type: {period_type}")
+    if group_by not in (None, "", "project", "activity_type"):
+        frappe.throw(f"Invalid group by: {group_by}")
+
+    try:
+        employee = get_access_profile(user).employee
+
+        if not employee:
+            return []
+
+        filters = {"employee": employee, "period_type": period_type}
+        if from_date and to_date:
+            filters["period_start"] = ["between", [from_date, to_date]]
+        elif from_date:
+            filters["period_start"] = [">=", from_date]
+        elif to_date:
+            filters["period_start"] = ["<=", to_date]
+
+        group_fields = ["period_start", group_by] if group_by else ["period_start"]
+        return frappe.get_all(
+            "Smart Timesheet Rollup",
+            filters=filters,
+            fields=[*group_fields, "sum(hours) as hours", "sum(approved_hours) as approved_hours",
+                    "sum(entries) as entries"],
+            group_by=", ".join(group_fields),
+            order_by="period_start desc"
+        )
+    except Exception as e:
+        frappe.logger().error(f"Error getting timesheet totals: {e!s}")
+        frappe.throw(f"Error loading timesheet totals: {e!s}")
 
 
 # ==================== APP SETTINGS API ====================
@@ -842,7 +1212,7 @@ def get_app_settings():
             "enable_offline_mode": settings.enable_offline_mode,
         }
     except Exception as e:
-        frappe.logger().error(f"Error getting app settings: {str(e)}")
+        frappe.logger().error(f"Error getting app settings: {e!s}")
         return {
             "app_name": "Smart Pro",
             "app_logo": None,
@@ -854,61 +1224,47 @@ def get_app_settings():
 # ==================== CONNECTIONS DASHBOARD API ====================
 
 @frappe.whitelist()
-def get_connections_dashboard():
-    """Get counts and statistics for all Smart Pro doctypes"""
-    try:
-        # Smart Projects counts
-        all_projects = frappe.db.count("Smart Project")
-        active_projects = frappe.db.count("Smart Project", {"status": "Active"})
-        planning_projects = frappe.db.count("Smart Project", {"status": "Planning"})
-        completed_projects = frappe.db.count("Smart Project", {"status": "Completed"})
-
-        # Employee Project Assignments count
-        assignments = frappe.db.count("Employee Project Assignment")
-
-        # Employee Date Requests counts
-        all_requests = frappe.db.count("Employee Date Request")
-        pending_requests = frappe.db.count("Employee Date Request", {"status": "Pending Approval"})
-        approved_requests = frappe.db.count("Employee Date Request", {"status": "Approved"})
-        rejected_requests = frappe.db.count("Employee Date Request", {"status": "Rejected"})
-
-        # Smart Tasks counts
-        all_tasks = frappe.db.count("Smart Task")
-        open_tasks = frappe.db.count("Smart Task", {"status": "Open"})
-        working_tasks = frappe.db.count("Smart Task", {"status": "Working"})
-        completed_tasks = frappe.db.count("Smart Task", {"status": "Completed"})
-
-        # Smart Timesheets counts
-        all_timesheets = frappe.db.count("Smart Timesheet")
-        draft_timesheets = frappe.db.count("Smart Timesheet", {"status": "Draft"})
-        submitted_timesheets = frappe.db.count("Smart Timesheet", {"status": "Submitted"})
-        approved_timesheets = frappe.db.count("Smart Timesheet", {"status": "Approved"})
-
-        # Notifications count
-        notifications = frappe.db.count("Smart Pro Notification") if frappe.db.exists("DocType", "Smart Pro Notification") else 0
+def get_connections_dashboard(etag=None):
+    """Get counts and statistics for all Smart Pro doctypes
 
-        return {
-            "projects": all_projects,
-            "activeProjects": active_projects,
-            "planningProjects": planning_projects,
-            "completedProjects": completed_projects,
-            "assignments": assignments,
-            "dateRequests": all_requests,
-            "pendingRequests": pending_requests,
-            "approvedRequests": approved_requests,
-            "rejectedRequests": rejected_requests,
-            "tasks": all_tasks,
-            "openTasks": open_tasks,
-            "workingTasks": working_tasks,
-            "completedTasks": completed_tasks,
-            "timesheets": all_timesheets,
-            "draftTimesheets": draft_timesheets,
-            "submittedTimesheets": submitted_timesheets,
-            "approvedTimesheets": approved_timesheets,
-            "notifications": notifications,
-        }
+    Args:
+        etag: Optional ETag from a previous response ("" on the first call); opts in to
+            {"etag", "data"} responses and {"not_modified": True} when nothing changed
+    """
+    current_etag = get_etag("get_connections_dashboard", list(COUNTED_DOCTYPES))
+    if is_not_modified(etag, current_etag):
+        return not_modified(current_etag)
+
+    try:
+        # All counters come from the Redis counter cache in one round trip
+        counts = get_status_counts()
+        projects = counts["Smart Project"]
+        requests = counts["Employee Date Request"]
+        tasks = counts["Smart Task"]
+        timesheets = counts["Smart Timesheet"]
+
+        return etag_response({
+            "projects": projects["total"],
+            "activeProjects": projects.get("Active", 0),
+            "planningProjects": projects.get("Planning", 0),
+            "completedProjects": projects.get("Completed", 0),
+            "assignments": counts["Employee Project Assignment"]["total"],
+            "dateRequests": requests["total"],
+            "pendingRequests": requests.get("Pending Approval", 0),
+            "approvedRequests": requests.get("Approved", 0),
+            "rejectedRequests": requests.get("Rejected", 0),
+            "tasks": tasks["total"],
+            "openTasks": tasks.get("Open", 0),
+            "workingTasks": tasks.get("Working", 0),
+            "completedTasks": tasks.get("Completed", 0),
+            "timesheets": timesheets["total"],
+            "draftTimesheets": timesheets.get("Draft", 0),
+            "submittedTimesheets": timesheets.get("Submitted", 0),
+            "approvedTimesheets": timesheets.get("Approved", 0),
+            "notifications": counts["Smart Pro Notification"]["total"],
+        }, etag, current_etag)
     except Exception as e:
-        frappe.logger().error(f"Error getting connections dashboard: {str(e)}")
+        frappe.logger().error(f"Error getting connections dashboard: {e!s}")
         return {
             "projects": 0,
             "activeProjects": 0,
@@ -940,6 +1296,7 @@ def mark_notification_as_read(notification_name, source="smart_pro"):
         if source == "smart_pro":
             if frappe.db.exists("Smart Pro Notification", notification_name):
                 frappe.db.set_value("Smart Pro Notification", notification_name, "status", "read")
+                bump_versions("Smart Pro Notification")
                 frappe.db.commit()
                 return {"success": True}
         else:
@@ -949,7 +1306,7 @@ def mark_notification_as_read(notification_name, source="smart_pro"):
                 return {"success": True}
         return {"success": False, "message": "Notification not found"}
     except Exception as e:
-        frappe.logger().error(f"Error marking notification as read: {str(e)}")
+        frappe.logger().error(f"Error marking notification as read: {e!s}")
         return {"success": False, "message": str(e)}
 
 
@@ -965,6 +1322,7 @@ def mark_all_notifications_as_read():
             SET status = 'read'
             WHERE user = %s AND status != 'read'
         """, (user,))
+        bump_versions("Smart Pro Notification")
 
         # Mark Frappe Notification Log as read
         frappe.db.sql("""
@@ -976,7 +1334,7 @@ def mark_all_notifications_as_read():
         frappe.db.commit()
         return {"success": True}
     except Exception as e:
-        frappe.logger().error(f"Error marking all notifications as read: {str(e)}")
+        frappe.logger().error(f"Error marking all notifications as read: {e!s}")
         return {"success": False, "message": str(e)}
 
 
@@ -1059,7 +1417,7 @@ def get_social_login_providers(redirect_to=None):
                     "url": auth_url
                 })
             except Exception as auth_err:
-                frappe.logger().warning(f"Could not generate OAuth URL for {key.name}: {str(auth_err)}")
+                frappe.logger().warning(f"Could not generate OAuth URL for {key.name}: {auth_err!s}")
                 continue
 
         return {
@@ -1067,7 +1425,7 @@ def get_social_login_providers(redirect_to=None):
             "providers": providers
         }
     except Exception as e:
-        frappe.logger().error(f"Error getting social login providers: {str(e)}")
+        frappe.logger().error(f"Error getting social login providers: {e!s}")
         return {
             "success": False,
             "providers": [],
@@ -1122,7 +1480,7 @@ def generate_project_description(title):
         return response
 
     except Exception as e:
-        frappe.logger().error(f"Error generating AI description: {str(e)}")
+        frappe.logger().error(f"Error generating AI description: {e!s}")
         return {
             "success": False,
             "message": str(e)
@@ -1278,7 +1636,7 @@ Keep it concise, professional, and actionable. Format with clear headings."""
         return response
 
     except Exception as e:
-        frappe.logger().error(f"Error generating AI project scope: {str(e)}")
+        frappe.logger().error(f"Error generating AI project scope: {e!s}")
         return {
             "success": False,
             "message": str(e)
@@ -1302,11 +1660,7 @@ def get_user_permissions():
         has_full_access = user_has_full_access(user)
 
         # Check if user is a project manager for any projects
-        managed_projects = frappe.get_list(
-            "Smart Project",
-            filters={"project_manager": user},
-            pluck="name"
-        )
+        managed_projects = get_member_projects(user, SOURCE_MANAGER)
 
         is_project_manager = len(managed_projects) > 0
 
@@ -1318,7 +1672,7 @@ def get_user_permissions():
             "user": user
         }
     except Exception as e:
-        frappe.logger().error(f"Error getting user permissions: {str(e)}")
+        frappe.logger().error(f"Error getting user permissions: {e!s}")
         return {
             "success": False,
             "has_full_access": False,
@@ -1329,37 +1683,41 @@ def get_user_permissions():
 
 
 @frappe.whitelist()
-def get_all_timesheets_for_approval():
+def get_all_timesheets_for_approval(after=None, limit=None, format=None):
     """Get all submitted timesheets for project managers to approve
 
     Only returns timesheets from projects where the current user is the project manager
     Or all submitted timesheets if user has full access
+
+    Args:
+        after: Optional cursor from a previous page (`next_cursor`); opts in to pagination
+        limit: Optional page size; opts in to pagination
+        format: Optional compact encoding, "columnar" or "dictionary" (see encoding.encode_rows)
     """
     user = frappe.session.user
+    validate_format(format)
 
     try:
         # If user has full access, return all submitted timesheets
         if user_has_full_access(user):
-            timesheets = frappe.get_list(
+            timesheets, next_cursor = get_page(
                 "Smart Timesheet",
                 filters={"status": "Submitted"},
                 fields=["name", "employee", "employee_name", "project", "task", "task_title",
                         "date", "hours_worked", "activity_type", "description", "status"],
-                order_by="date desc"
+                order_by="date desc",
+                after=after,
+                limit=limit
             )
         else:
             # Get projects where current user is project manager
-            managed_projects = frappe.get_list(
-                "Smart Project",
-                filters={"project_manager": user},
-                pluck="name"
-            )
+            managed_projects = get_member_projects(user, SOURCE_MANAGER)
 
             if not managed_projects:
-                return []
+                return page_response(encode_rows([], format), None, after, limit)
 
             # Get submitted timesheets from managed projects
-            timesheets = frappe.get_list(
+            timesheets, next_cursor = get_page(
                 "Smart Timesheet",
                 filters={
                     "project": ["in", managed_projects],
@@ -1367,17 +1725,17 @@ def get_all_timesheets_for_approval():
                 },
                 fields=["name", "employee", "employee_name", "project", "task", "task_title",
                         "date", "hours_worked", "activity_type", "description", "status"],
-                order_by="date desc"
+                order_by="date desc",
+                after=after,
+                limit=limit
             )
 
         # Add project title to each timesheet
-        for ts in timesheets:
-            if ts.get("project"):
-                ts["project_title"] = frappe.db.get_value("Smart Project", ts["project"], "title")
+        enrich_titles(timesheets, "project", "Smart Project")
 
-        return timesheets
+        return page_response(encode_rows(timesheets, format), next_cursor, after, limit)
     except Exception as e:
-        frappe.logger().error(f"Error getting timesheets for approval: {str(e)}")
+        frappe.logger().error(f"Error getting timesheets for approval: {e!s}")
         return []
 
 
@@ -1416,7 +1774,7 @@ def approve_timesheet(timesheet_name):
             "message": "Timesheet approved successfully"
         }
     except Exception as e:
-        frappe.logger().error(f"Error approving timesheet: {str(e)}")
+        frappe.logger().error(f"Error approving timesheet: {e!s}")
         return {
             "success": False,
             "message": str(e)
@@ -1460,7 +1818,27 @@ def reject_timesheet(timesheet_name, reason=None):
             "message": "Timesheet rejected"
         }
     except Exception as e:
-        frappe.logger().error(f"Error rejecting timesheet: {str(e)}")
+        frappe.logger().error(f"Error rejecting timesheet: {e!s}")
+        return {
+            "success": False,
+            "message": str(e)
+        }
+
+
+@frappe.whitelist()
+def approve_timesheets(names):
+    """Approve several submitted timesheets at once
+
+    Args:
+        names: JSON list of Smart Timesheet names
+
+    Returns:
+        {"success", "updated", "results": [{"name", "success", "message"}]}
+    """
+    try:
+        return _set_timesheets_status(names, "Approved")
+    except Exception as e:
+        frappe.logger().error(f"Error approving timesheets: {e!s}")
         return {
             "success": False,
             "message": str(e)
@@ -1468,48 +1846,163 @@ def reject_timesheet(timesheet_name, reason=None):
 
 
 @frappe.whitelist()
-def get_all_projects():
-    """Get all projects for users with full access (read-only view)"""
+def reject_timesheets(names, reason=None):
+    """Reject several submitted timesheets at once, with one reason for all
+
+    Args:
+        names: JSON list of Smart Timesheet names
+        reason: Optional comment added to every rejected timesheet
+
+    Returns:
+        {"success", "updated", "results": [{"name", "success", "message"}]}
+    """
+    try:
+        return _set_timesheets_status(names, "Rejected", reason)
+    except Exception as e:
+        frappe.logger().error(f"Error rejecting timesheets: {e!s}")
+        return {
+            "success": False,
+            "message": str(e)
+        }
+
+
+def _set_timesheets_status(names, status, reason=None):
+    """Move submitted timesheets to `status` with one authorization pass and one commit
+
+    Rows are authorized per project (full access or managed project) and updated
+    with a single statement, so the doc event side effects (rollups, counters,
+    versions) are applied here.
+    """
+    user = frappe.session.user
+    names = frappe.parse_json(names) if isinstance(names, str) else names
+    names = list(dict.fromkeys(names or []))
+    if not names:
+        return {"success": True, "updated": 0, "results": []}
+
+    timesheets = {
+        row.name: row
+        for row in frappe.get_all(
+            "Smart Timesheet",
+            filters={"name": ["in", names]},
+            fields=["name", "employee", "date", "project", "task", "activity_type", "hours_worked", "status"],
+            for_update=True
+        )
+    }
+
+    full_access = user_has_full_access(user)
+    managed_projects = set(get_member_projects(user, SOURCE_MANAGER))
+    action = "approve" if status == "Approved" else "reject"
+
+    results, updated = [], []
+    for name in names:
+        timesheet = timesheets.get(name)
+        success = False
+        if not timesheet:
+            message = "Timesheet not found"
+        elif not full_access and timesheet.project not in managed_projects:
+            message = f"You are not authorized to {action} this timesheet"
+        elif timesheet.status != "Submitted":
+            message = f"Timesheet is not in 'Submitted' status. Current status: {timesheet.status}"
+        else:
+            success = True
+            message = f"Timesheet {status.lower()}"
+            updated.append(name)
+
+        results.append({"name": name, "success": success, "message": message})
+
+    if updated:
+        now = now_datetime()
+        frappe.db.sql("""
+            UPDATE `tabSmart Timesheet`
+            SET status = %s, modified = %s, modified_by = %s
+            WHERE name IN %s
+        """, (status, now, user, tuple(updated)))
+
+        if reason:
+            frappe.db.bulk_insert(
+                "Comment",
+                ["name", "creation", "modified", "owner", "modified_by", "comment_type",
+                 "comment_email", "reference_doctype", "reference_name", "content"],
+                [
+                    (frappe.generate_hash(length=10), now, now, user, user, "Comment",
+                     user, "Smart Timesheet", name, reason)
+                    for name in updated
+                ]
+            )
+
+        changes = [(timesheets[name], frappe._dict(timesheets[name], status=status)) for name in updated]
+        apply_rollup_deltas(get_rollup_deltas(changes))
+        apply_hours_deltas(get_hours_deltas(changes))
+        adjust_counts("Smart Timesheet", {"Submitted": -len(updated), status: len(updated)})
+        bump_versions("Smart Timesheet")
+        frappe.db.commit()
+
+    return {
+        "success": len(updated) == len(names),
+        "updated": len(updated),
+        "results": results
+    }
+
+
+@frappe.whitelist()
+def get_all_projects(after=None, limit=None):
+    """Get all projects for users with full access (read-only view)
+
+    Args:
+        after: Optional cursor from a previous page (`next_cursor`); opts in to pagination
+        limit: Optional page size; opts in to pagination
+    """
     user = frappe.session.user
 
     if not user_has_full_access(user):
         frappe.throw("You do not have permission to view all projects")
 
     try:
-        projects = frappe.get_list(
+        projects, next_cursor = get_page(
             "Smart Project",
             fields=["name", "title", "status", "start_date", "end_date",
-                    "budget_amount", "project_manager", "department"],
+                    "budget_amount", "project_manager", "department", "actual_hours", "approved_hours"],
             order_by="modified desc",
-            limit=200
+            after=after,
+            limit=limit,
+            default_limit=200
         )
 
-        return projects
+        return page_response(projects, next_cursor, after, limit)
     except Exception as e:
-        frappe.logger().error(f"Error getting all projects: {str(e)}")
+        frappe.logger().error(f"Error getting all projects: {e!s}")
         return []
 
 
 @frappe.whitelist()
-def get_all_tasks():
-    """Get all tasks for users with full access (read-only view)"""
+def get_all_tasks(after=None, limit=None, format=None):
+    """Get all tasks for users with full access (read-only view)
+
+    Args:
+        after: Optional cursor from a previous page (`next_cursor`); opts in to pagination
+        limit: Optional page size; opts in to pagination
+        format: Optional compact encoding, "columnar" or "dictionary" (see encoding.encode_rows)
+    """
     user = frappe.session.user
+    validate_format(format)
 
     if not user_has_full_access(user):
         frappe.throw("You do not have permission to view all tasks")
 
     try:
-        tasks = frappe.get_list(
+        tasks, next_cursor = get_page(
             "Smart Task",
             fields=["name", "title", "project", "status", "priority",
                     "due_date", "progress", "assigned_to"],
             order_by="due_date asc",
-            limit=200
+            after=after,
+            limit=limit,
+            default_limit=200
         )
 
-        return tasks
+        return page_response(encode_rows(tasks, format), next_cursor, after, limit)
     except Exception as e:
-        frappe.logger().error(f"Error getting all tasks: {str(e)}")
+        frappe.logger().error(f"Error getting all tasks: {e!s}")
         return []
 
 
@@ -1531,39 +2024,195 @@ def get_all_date_requests():
         )
 
         # Add project title
-        for req in requests:
-            if req.get("project"):
-                req["project_title"] = frappe.db.get_value("Smart Project", req["project"], "title")
+        enrich_titles(requests, "project", "Smart Project")
 
         return requests
     except Exception as e:
-        frappe.logger().error(f"Error getting all date requests: {str(e)}")
+        frappe.logger().error(f"Error getting all date requests: {e!s}")
         return []
 
 
 @frappe.whitelist()
-def get_all_timesheets():
-    """Get all timesheets for users with full access (read-only view)"""
+def get_all_timesheets(after=None, limit=None, format=None):
+    """Get all timesheets for users with full access (read-only view)
+
+    Args:
+        after: Optional cursor from a previous page (`next_cursor`); opts in to pagination
+        limit: Optional page size; opts in to pagination
+        format: Optional compact encoding, "columnar" or "dictionary" (see encoding.encode_rows)
+    """
     user = frappe.session.user
+    validate_format(format)
 
     if not user_has_full_access(user):
-        return []
+        return page_response(encode_rows([], format), None, after, limit)
 
     try:
-        timesheets = frappe.get_list(
+        timesheets, next_cursor = get_page(
             "Smart Timesheet",
             fields=["name", "employee", "employee_name", "project", "task", "task_title",
                     "date", "hours_worked", "activity_type", "description", "status"],
             order_by="date desc",
-            limit=100
+            after=after,
+            limit=limit,
+            default_limit=100
         )
 
         # Add project title
-        for ts in timesheets:
-            if ts.get("project"):
-                ts["project_title"] = frappe.db.get_value("Smart Project", ts["project"], "title")
+        enrich_titles(timesheets, "project", "Smart Project")
 
-        return timesheets
+        return page_response(encode_rows(timesheets, format), next_cursor, after, limit)
+    except Exception as e:
+        frappe.logger().error(f"Error getting all timesheets: {e!s}")
+        return []
+
+@frappe.whitelist()
+def export_timesheets(from_date=None, to_date=None, project=None, status="Approved", employee=None, file_format="csv"):
+    """Download timesheets as CSV or XLSX for payroll (full access only)
+
+    The file is built chunk by chunk in a temporary file and streamed back, so a
+    month of company-wide timesheets does not have to fit in memory.
+
+    Args:
+        from_date: Optional first date to include
+        to_date: Optional last date to include
+        project: Optional project filter
+        status: Timesheet status to export, "Approved" by default; empty for all
+        employee: Optional employee filter
+        file_format: "csv" (default) or "xlsx"
+    """
+    if not user_has_full_access(frappe.session.user):
+        frappe.throw("You do not have permission to export timesheets", frappe.PermissionError)
+
+    return build_timesheet_export(
+        file_format,
+        from_date=from_date,
+        to_date=to_date,
+        project=project,
+        status=status,
+        employee=employee
+    )
+
+
+@frappe.whitelist()
+def import_timesheets(file_url):
+    """Import timesheets from an uploaded CSV or XLSX file (full access only)
+
+    The file is validated and inserted in chunks by a background job. When it
+    finishes, the user gets a "smart_pro_timesheet_import" realtime event with the
+    row counts and the URL of a CSV listing every rejected row and its error.
+
+    Args:
+        file_url: URL of the uploaded File. Columns: employee, date, task, project,
+            hours_worked, activity_type, description, notes, status
+
+    Returns:
+        {"success", "job_id"}
+    """
+    if not user_has_full_access(frappe.session.user):
+        frappe.throw("You do not have permission to import timesheets", frappe.PermissionError)
+
+    if not frappe.db.exists("File", {"file_url": file_url}):
+        frappe.throw(f"File {file_url} not found")
+
+    return {"success": True, "job_id": enqueue_import(file_url)}
+
+
+# ==================== DELTA SYNC API ====================
+
+@frappe.whitelist()
+def get_changes(since=None, doctypes=None):
+    """Get the rows visible to the current user that changed after a watermark
+
+    Args:
+        since: `watermark` from the previous call; omit it on the first sync
+        doctypes: Optional JSON list of doctypes to sync (Smart Task, Smart Project,
+            Smart Timesheet, Employee Date Request, Smart Pro Notification)
+
+    Returns:
+        {"reset", "watermark", "changes", "tombstones"} - on reset the client reloads
+        its lists; otherwise it drops the tombstoned names, then upserts the changes
+    """
+    if isinstance(doctypes, str):
+        doctypes = frappe.parse_json(doctypes)
+
+    try:
+        return get_changes_since(since, doctypes)
+    except Exception as e:
+        frappe.logger().error(f"Error getting changes: {e!s}")
+        frappe.throw(f"Error loading changes: {e!s}")
+
+
+# ==================== CAPACITY API ====================
+
+@frappe.whitelist()
+def get_team_capacity(project_or_team=None, from_date=None, to_date=None):
+    """Day by employee allocation timeline for a staffing view
+
+    Allocation is summed across all of each employee's active assignments, not
+    just the selected project, with holidays and approved leave taken out.
+
+    Args:
+        project_or_team: A Smart Project for its active members; omit it for the
+            team of every project the user manages (everyone for full access)
+        from_date: First day, today by default
+        to_date: Last day, 90 days after from_date by default
+
+    Returns:
+        See capacity.get_capacity: days, employees, allocation, available,
+        over_allocated, utilization and over_allocated_employees
+    """
+    user = frappe.session.user
+    profile = get_access_profile(user)
+    has_full_access = profile.can_view_all_projects or profile.is_system_manager
+
+    from_date = getdate(from_date)
+    to_date = getdate(to_date) if to_date else add_days(from_date, 90)
+
+    if project_or_team:
+        if not has_full_access and project_or_team not in get_member_projects(user, SOURCE_MANAGER):
+            frappe.throw("You do not have permission to view this project's capacity", frappe.PermissionError)
+        projects = [project_or_team]
+    elif has_full_access:
+        projects = None
+    else:
+        projects = get_member_projects(user, SOURCE_MANAGER)
+        if not projects:
+            return get_capacity([], from_date, to_date)
+
+    try:
+        filters = {"status": "Active"}
+        if projects is not None:
+            filters["project"] = ["in", projects]
+        members = frappe.get_all(
+            "Employee Project Assignment",
+            filters=filters,
+            fields=["employee", "employee_name"],
+            distinct=True,
+            order_by="employee_name asc"
+        )
+
+        return get_capacity([member.employee for member in members], from_date, to_date)
+    except frappe.ValidationError:
+        raise
+    except Exception as e:
+        frappe.logger().error(f"Error getting team capacity: {e!s}")
+        frappe.throw(f"Error loading team capacity: {e!s}")
+
+
+@frappe.whitelist()
+def get_overallocated_employees():
+    """Employees booked above 100% on some day across their active assignments (full access only)
+
+    Returns:
+        [{employee, employee_name, peak_allocation, peak_date, projects}], highest peak first,
+        where projects are the assignments active on the peak day
+    """
+    if not user_has_full_access(frappe.session.user):
+        frappe.throw("You do not have permission to view company-wide allocations", frappe.PermissionError)
+
+    try:
+        return get_overallocations()
     except Exception as e:
-        frappe.logger().error(f"Error getting all timesheets: {str(e)}")
-        return []
\ No newline at end of file
+        frappe.logger().error(f"Error getting over-allocated employees: {e!s}")
+        frappe.throw(f"Error loading over-allocated employees: {e!s}")
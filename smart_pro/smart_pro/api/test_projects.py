@@ -0,0 +1,260 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from smart_pro.smart_pro.api.projects import (
+	TASK_SUMMARY_FIELDS,
+	approve_date_requests,
+	approve_timesheets,
+	create_timesheets_bulk,
+	get_project_tasks,
+	get_user_tasks,
+	reject_timesheets,
+)
+from smart_pro.smart_pro.doctype.employee_date_request.employee_date_request import EmployeeDateRequest
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+	make_project,
+)
+from smart_pro.smart_pro.doctype.smart_timesheet.smart_timesheet import SmartTimesheet
+from smart_pro.smart_pro.membership import MEMBERSHIP_KEY
+
+TEST_USER = "projects-api-test-user@example.com"
+
+FAILING_DESCRIPTION = "Fails after its doc events ran"
+
+
+class TestBulkTimesheets(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		frappe.get_doc("User", TEST_USER).add_roles("Employee")
+		self.task = make_task(make_project())
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+
+	def create(self, descriptions, date):
+		frappe.set_user(TEST_USER)
+		queued = len(frappe.db.after_commit._functions)
+		with patch.object(SmartTimesheet, "on_update", fail_after_on_update):
+			response = create_timesheets_bulk(
+				[
+					{"task": self.task, "date": date, "hours_worked": 1, "description": description}
+					for description in descriptions
+				]
+			)
+		return response, len(frappe.db.after_commit._functions) - queued
+
+	def test_mixed_batch_keeps_only_the_inserted_rows(self):
+		response, _queued = self.create(["First", FAILING_DESCRIPTION, "Second"], today())
+
+		self.assertEqual(response["created"], 2)
+		self.assertEqual([result["success"] for result in response["results"]], [True, False, True])
+		self.assertEqual(frappe.db.get_value("Smart Task", self.task, "actual_hours"), 2)
+		self.assertFalse(frappe.db.exists("Smart Timesheet", {"description": FAILING_DESCRIPTION}))
+
+	def test_failed_row_leaves_no_commit_callbacks(self):
+		_response, mixed = self.create(["First", FAILING_DESCRIPTION, "Second"], today())
+		_response, clean = self.create(["First", "Second"], add_days(today(), 1))
+
+		self.assertEqual(mixed, clean)
+
+	def test_rows_failing_validation_are_reported(self):
+		response, _queued = self.create(["First", ""], today())
+
+		self.assertFalse(response["success"])
+		self.assertEqual(
+			response["results"][1], {"index": 1, "success": False, "error": "Description is required"}
+		)
+
+
+# The status endpoints commit; patching it keeps each test inside the transaction FrappeTestCase rolls back
+@patch.object(frappe.db, "commit")
+class TestTimesheetApproval(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		self.task = make_task(make_project())
+		self.project = frappe.db.get_value("Smart Task", self.task, "project")
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+
+	def make_timesheet(self, status="Submitted", hours=2):
+		return (
+			frappe.get_doc(
+				{
+					"doctype": "Smart Timesheet",
+					"employee": self.employee,
+					"date": today(),
+					"project": self.project,
+					"task": self.task,
+					"hours_worked": hours,
+					"description": "Approval test",
+					"status": status,
+				}
+			)
+			.insert(ignore_permissions=True)
+			.name
+		)
+
+	def test_approve_moves_hours_to_approved(self, _commit):
+		names = [self.make_timesheet(), self.make_timesheet(hours=3)]
+
+		response = approve_timesheets(frappe.as_json(names))
+
+		self.assertTrue(response["success"])
+		self.assertEqual(response["updated"], 2)
+		self.assertEqual(
+			{frappe.db.get_value("Smart Timesheet", name, "status") for name in names}, {"Approved"}
+		)
+		self.assertEqual(frappe.db.get_value("Smart Task", self.task, "approved_hours"), 5)
+
+	def test_reject_removes_hours_and_comments(self, _commit):
+		name = self.make_timesheet()
+
+		response = reject_timesheets([name], reason="Wrong task")
+
+		self.assertTrue(response["success"])
+		self.assertEqual(frappe.db.get_value("Smart Task", self.task, "actual_hours"), 0)
+		self.assertTrue(
+			frappe.db.exists(
+				"Comment",
+				{"reference_doctype": "Smart Timesheet", "reference_name": name, "content": "Wrong task"},
+			)
+		)
+
+	def test_only_submitted_timesheets_change(self, _commit):
+		submitted, draft = self.make_timesheet(), self.make_timesheet(status="Draft")
+
+		response = approve_timesheets([submitted, draft, "missing-timesheet"])
+
+		self.assertFalse(response["success"])
+		self.assertEqual(response["updated"], 1)
+		self.assertEqual([result["success"] for result in response["results"]], [True, False, False])
+		self.assertEqual(frappe.db.get_value("Smart Timesheet", draft, "status"), "Draft")
+
+	def test_only_managers_of_the_project_can_approve(self, _commit):
+		name = self.make_timesheet()
+		frappe.cache().hdel(MEMBERSHIP_KEY, TEST_USER)
+
+		frappe.set_user(TEST_USER)
+		response = approve_timesheets([name])
+		self.assertFalse(response["results"][0]["success"])
+		self.assertEqual(frappe.db.get_value("Smart Timesheet", name, "status"), "Submitted")
+
+		frappe.set_user("Administrator")
+		frappe.db.set_value("Smart Project", self.project, "project_manager", TEST_USER)
+		frappe.cache().hdel(MEMBERSHIP_KEY, TEST_USER)
+
+		frappe.set_user(TEST_USER)
+		self.assertTrue(approve_timesheets([name])["success"])
+
+
+class TestApproveDateRequests(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+
+	def make_request(self):
+		return frappe.get_doc(
+			{
+				"doctype": "Employee Date Request",
+				"employee": self.employee,
+				"request_type": "Project Date Update",
+				"project": make_project(),
+				"from_date": add_days(today(), 10),
+				"to_date": add_days(today(), 20),
+				"reason": "Batch approval test",
+			}
+		).insert(ignore_permissions=True)
+
+	def approve(self, requests, failing=None):
+		def on_approval(doc):
+			original_on_approval(doc)
+			if doc.name == failing:
+				frappe.throw("Rejected after on_approval")
+
+		queued = len(frappe.db.after_commit._functions)
+		with patch.object(EmployeeDateRequest, "on_approval", on_approval):
+			response = approve_date_requests([request.name for request in requests])
+		return response, len(frappe.db.after_commit._functions) - queued
+
+	def test_failed_request_is_rolled_back_with_its_callbacks(self):
+		good, bad = self.make_request(), self.make_request()
+		response, mixed = self.approve([good, bad], failing=bad.name)
+		_response, clean = self.approve([self.make_request()])
+
+		self.assertEqual(response["approved"], 1)
+		self.assertEqual([result["success"] for result in response["results"]], [True, False])
+		self.assertEqual(frappe.db.get_value("Employee Date Request", good.name, "status"), "Approved")
+		self.assertEqual(frappe.db.get_value("Employee Date Request", bad.name, "status"), bad.status)
+		self.assertIsNone(frappe.db.get_value("Smart Project", bad.project, "end_date"))
+		self.assertEqual(mixed, clean)
+
+	def test_unauthorized_requests_are_reported(self):
+		request = self.make_request()
+		frappe.db.set_value("Employee Date Request", request.name, "approver", "Administrator")
+		frappe.get_doc("User", TEST_USER).add_roles("Employee")
+
+		frappe.set_user(TEST_USER)
+		response = approve_date_requests(frappe.as_json([request.name]))
+		frappe.set_user("Administrator")
+
+		self.assertFalse(response["success"])
+		self.assertEqual(response["results"][0]["error"], "You are not authorized to approve this request")
+
+
+class TestListFields(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.project = make_project()
+		self.task = make_task(self.project)
+
+	def test_lists_default_to_the_summary_fields(self):
+		(task,) = get_project_tasks(self.project)
+
+		self.assertEqual(set(task), set(TASK_SUMMARY_FIELDS))
+
+	def test_requested_fields_always_include_the_name(self):
+		(task,) = get_project_tasks(self.project, fields='["description", "status"]')
+
+		self.assertEqual(list(task), ["name", "description", "status"])
+		self.assertEqual(task["name"], self.task)
+
+	def test_fields_outside_the_allow_list_are_rejected(self):
+		self.assertRaises(
+			frappe.ValidationError, get_project_tasks, self.project, fields=["description", "owner"]
+		)
+		self.assertRaises(frappe.ValidationError, get_user_tasks, fields=["owner"])
+
+
+def make_task(project):
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Smart Task",
+				"title": f"API Test Task {frappe.generate_hash(length=6)}",
+				"project": project,
+			}
+		)
+		.insert(ignore_permissions=True)
+		.name
+	)
+
+
+original_on_update = SmartTimesheet.on_update
+original_on_approval = EmployeeDateRequest.on_approval
+
+
+def fail_after_on_update(doc):
+	"""Run the real on_update, which queues counter and version callbacks, then fail marked rows"""
+	original_on_update(doc)
+	if doc.description == FAILING_DESCRIPTION:
+		frappe.throw("Rejected after on_update")
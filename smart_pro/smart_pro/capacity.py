@@ -0,0 +1,158 @@
+"""
+Team capacity timelines for Smart Pro
+Builds a days x employees allocation matrix from Employee Project Assignments
+with a difference array and a cumulative sum, then masks out holidays and
+approved leave, all as NumPy array operations over the date range.
+"""
+
+import frappe
+import numpy as np
+from frappe.utils import date_diff, flt, getdate
+
+from smart_pro.smart_pro.overlaps import LEAVE_REQUEST_TYPES
+from smart_pro.smart_pro.working_days import get_holiday_lists, get_working_day_mask
+
+# Longest range a capacity timeline may cover, to bound the matrix size
+MAX_CAPACITY_DAYS = 731
+
+FULL_ALLOCATION = 100
+
+
+def get_allocation_percentage(value):
+	"""Allocation percentage of an assignment: 100 when left empty, while an explicit 0 stays 0"""
+	return FULL_ALLOCATION if value is None or value == "" else flt(value)
+
+
+def _day_indexes(rows, start_field, end_field, from_date, day_count):
+	"""[start, end) day indexes of each row's inclusive date range, clipped to the timeline"""
+	starts = np.array(
+		[date_diff(row.get(start_field), from_date) if row.get(start_field) else 0 for row in rows],
+		dtype=np.int64,
+	)
+	ends = np.array(
+		[date_diff(row.get(end_field), from_date) + 1 if row.get(end_field) else day_count for row in rows],
+		dtype=np.int64,
+	)
+	return np.clip(starts, 0, day_count), np.clip(ends, 0, day_count)
+
+
+def _range_matrix(rows, start_field, end_field, column_of, weights, from_date, day_count):
+	"""Sum of weights over each row's date range, as a days x employees matrix
+
+	Each range adds its weight at its first day and removes it after its last in
+	a difference array, so the cumulative sum down the days is the total.
+	"""
+	diff = np.zeros((day_count + 1, len(column_of)), dtype=np.float64)
+	if not rows:
+		return diff[:-1]
+
+	columns = np.array([column_of[row.employee] for row in rows], dtype=np.int64)
+	starts, ends = _day_indexes(rows, start_field, end_field, from_date, day_count)
+	np.add.at(diff, (starts, columns), weights)
+	np.add.at(diff, (ends, columns), -weights)
+	return np.cumsum(diff[:-1], axis=0)
+
+
+def get_capacity(employees, from_date, to_date):
+	"""Capacity timeline of the given employees over [from_date, to_date]
+
+	Returns:
+		{
+			"days": [ISO dates],
+			"employees": [{"employee", "employee_name"}],
+			"allocation": days x employees allocation % summed across projects,
+			"available": days x employees, False on holidays and approved leave,
+			"over_allocated": days x employees, allocated above 100% on an available day,
+			"utilization": per day, allocation on available days / their capacity,
+			"over_allocated_employees": employees over-allocated on any day,
+		}
+	"""
+	from_date, to_date = getdate(from_date), getdate(to_date)
+	day_count = date_diff(to_date, from_date) + 1
+	if day_count <= 0:
+		frappe.throw("From Date cannot be after To Date")
+	if day_count > MAX_CAPACITY_DAYS:
+		frappe.throw(f"Capacity can be computed for at most {MAX_CAPACITY_DAYS} days at a time")
+
+	employees = list(dict.fromkeys(employee for employee in employees if employee))
+	names = (
+		dict(
+			frappe.get_all(
+				"Employee",
+				filters={"name": ["in", employees]},
+				fields=["name", "employee_name"],
+				as_list=True,
+			)
+		)
+		if employees
+		else {}
+	)
+	employees = [employee for employee in employees if employee in names]
+	column_of = {employee: i for i, employee in enumerate(employees)}
+
+	assignments = (
+		frappe.get_all(
+			"Employee Project Assignment",
+			filters={
+				"employee": ["in", employees],
+				"status": "Active",
+				"start_date": ["<=", to_date],
+			},
+			or_filters=[["end_date", ">=", from_date], ["end_date", "is", "not set"]],
+			fields=["employee", "start_date", "end_date", "allocation_percentage"],
+		)
+		if employees
+		else []
+	)
+	allocation = _range_matrix(
+		assignments,
+		"start_date",
+		"end_date",
+		column_of,
+		np.array(
+			[get_allocation_percentage(row.allocation_percentage) for row in assignments], dtype=np.float64
+		),
+		from_date,
+		day_count,
+	)
+
+	leaves = (
+		frappe.get_all(
+			"Employee Date Request",
+			filters={
+				"employee": ["in", employees],
+				"status": "Approved",
+				"request_type": ["in", LEAVE_REQUEST_TYPES],
+				"from_date": ["<=", to_date],
+				"to_date": [">=", from_date],
+			},
+			fields=["employee", "from_date", "to_date"],
+		)
+		if employees
+		else []
+	)
+	on_leave = (
+		_range_matrix(leaves, "from_date", "to_date", column_of, np.ones(len(leaves)), from_date, day_count)
+		> 0
+	)
+
+	holiday_lists = get_holiday_lists(employees)
+	days, working = get_working_day_mask(
+		from_date, to_date, [holiday_lists.get(employee) for employee in employees]
+	)
+
+	available = working & ~on_leave
+	booked = np.where(available, allocation, 0)
+	over_allocated = booked > FULL_ALLOCATION
+	capacity = available.sum(axis=1) * FULL_ALLOCATION
+	utilization = np.divide(booked.sum(axis=1), capacity, out=np.zeros(day_count), where=capacity > 0)
+
+	return {
+		"days": [str(day) for day in days],
+		"employees": [{"employee": employee, "employee_name": names[employee]} for employee in employees],
+		"allocation": np.round(allocation, 2).tolist(),
+		"available": available.tolist(),
+		"over_allocated": over_allocated.tolist(),
+		"utilization": np.round(utilization, 4).tolist(),
+		"over_allocated_employees": [employees[i] for i in np.flatnonzero(over_allocated.any(axis=0))],
+	}
@@ -0,0 +1,134 @@
+"""
+Cached per-status record counters for the Smart Pro dashboards
+Counters live in Redis, are adjusted by doc events after commit and are
+rebuilt from one GROUP BY query per doctype on a cache miss or by the
+periodic reconciliation job.
+"""
+
+import frappe
+from frappe.utils import cint
+
+# Doctype -> field the counts are broken down by (None = total only)
+COUNTED_DOCTYPES = {
+	"Smart Project": "status",
+	"Employee Project Assignment": None,
+	"Employee Date Request": "status",
+	"Smart Task": "status",
+	"Smart Timesheet": "status",
+	"Smart Pro Notification": None,
+}
+
+TOTAL = "total"
+
+
+def _key(doctype, bucket):
+	return frappe.cache().make_key(f"smart_pro:count:{doctype}:{bucket}")
+
+
+def _get_buckets(doctype):
+	"""Counter buckets of a doctype: the total plus every option of its status field"""
+	fieldname = COUNTED_DOCTYPES[doctype]
+	if not fieldname:
+		return [TOTAL]
+	options = frappe.get_meta(doctype).get_field(fieldname).options or ""
+	return [TOTAL, *(option for option in options.split("\n") if option)]
+
+
+def get_status_counts(doctypes=None):
+	"""Get {doctype: {"total": n, <status>: n}} with a single Redis round trip
+
+	Doctypes whose counters are missing from the cache are rebuilt on the spot.
+	"""
+	doctypes = doctypes or list(COUNTED_DOCTYPES)
+	keys = [(doctype, bucket) for doctype in doctypes for bucket in _get_buckets(doctype)]
+	values = frappe.cache().mget([_key(doctype, bucket) for doctype, bucket in keys])
+
+	counts = {doctype: {} for doctype in doctypes}
+	stale = set()
+	for (doctype, bucket), value in zip(keys, values, strict=True):
+		if value is None:
+			stale.add(doctype)
+		else:
+			counts[doctype][bucket] = cint(value)
+
+	for doctype in stale:
+		counts[doctype] = reconcile_counts(doctype)
+
+	return counts
+
+
+def reconcile_counts(doctype):
+	"""Recompute a doctype's counters with one GROUP BY query and store them"""
+	fieldname = COUNTED_DOCTYPES[doctype]
+	counts = dict.fromkeys(_get_buckets(doctype), 0)
+
+	if fieldname:
+		rows = frappe.db.sql(f"SELECT `{fieldname}`, COUNT(*) FROM `tab{doctype}` GROUP BY `{fieldname}`")
+		for value, count in rows:
+			counts[TOTAL] += count
+			if value:
+				counts[value] = count
+	else:
+		counts[TOTAL] = frappe.db.sql(f"SELECT COUNT(*) FROM `tab{doctype}`")[0][0]
+
+	pipeline = frappe.cache().pipeline()
+	for bucket, count in counts.items():
+		pipeline.set(_key(doctype, bucket), count)
+	pipeline.execute()
+
+	return counts
+
+
+def reconcile_all_counts():
+	"""Scheduled job: correct any drift from bulk updates that bypass doc events"""
+	for doctype in COUNTED_DOCTYPES:
+		reconcile_counts(doctype)
+
+
+def invalidate_counts(doctype):
+	"""Drop a doctype's counters so the next read rebuilds them"""
+	frappe.cache().delete(*(_key(doctype, bucket) for bucket in _get_buckets(doctype)))
+
+
+def adjust_counts(doctype, deltas):
+	"""Apply {bucket: delta} to a doctype's counters once the transaction commits"""
+	deltas = {bucket: delta for bucket, delta in deltas.items() if bucket and delta}
+	if not deltas:
+		return
+
+	def apply():
+		cache = frappe.cache()
+		# Counters that were never built are left alone, the next read rebuilds them
+		if cache.get(_key(doctype, TOTAL)) is None:
+			return
+		pipeline = cache.pipeline()
+		for bucket, delta in deltas.items():
+			pipeline.incrby(_key(doctype, bucket), delta)
+		pipeline.execute()
+
+	frappe.db.after_commit.add(apply)
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def on_insert(doc, method=None):
+	fieldname = COUNTED_DOCTYPES[doc.doctype]
+	adjust_counts(doc.doctype, {TOTAL: 1, doc.get(fieldname) if fieldname else None: 1})
+
+
+def on_update(doc, method=None):
+	fieldname = COUNTED_DOCTYPES[doc.doctype]
+	previous = doc.get_doc_before_save()
+	# Inserts are counted by on_insert
+	if not fieldname or not previous:
+		return
+
+	old_value, new_value = previous.get(fieldname), doc.get(fieldname)
+	if old_value != new_value:
+		adjust_counts(doc.doctype, {old_value: -1, new_value: 1})
+
+
+def on_trash(doc, method=None):
+	fieldname = COUNTED_DOCTYPES[doc.doctype]
+	adjust_counts(doc.doctype, {TOTAL: -1, doc.get(fieldname) if fieldname else None: -1})
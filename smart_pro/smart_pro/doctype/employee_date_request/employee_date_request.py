@@ -3,94 +3,82 @@
 
 import frappe
 from frappe.model.document import Document
-from frappe.utils import date_diff, add_days, getdate
+from frappe.utils import add_days, getdate
+
+from smart_pro.smart_pro.allocation import invalidate_assignments
+from smart_pro.smart_pro.counters import adjust_counts
+from smart_pro.smart_pro.doctype.smart_project.smart_project import sync_project_status
+from smart_pro.smart_pro.overlaps import CLOSED_STATUSES, find_overlaps
+from smart_pro.smart_pro.versions import bump_versions
+from smart_pro.smart_pro.working_days import count_working_days, get_holiday_list
 
 
 class EmployeeDateRequest(Document):
     def validate(self):
         self.validate_dates()
-        self.fetch_employee_name()
+        context = get_approval_context(self.employee, self.project, self.assignment)
+        self.fetch_employee_name(context)
         self.calculate_total_days()
-        self.link_assignment()
-        self.set_default_approver()
+        self.link_assignment(context)
+        self.set_default_approver(context)
+        self.warn_overlaps()
 
     def validate_dates(self):
         if self.from_date and self.to_date and getdate(self.from_date) > getdate(self.to_date):
             frappe.throw("From Date cannot be after To Date")
 
-    def fetch_employee_name(self):
+    def warn_overlaps(self):
+        """Point out other open requests of the employee that conflict with this one on the same days"""
+        if self.status in CLOSED_STATUSES:
+            return
+        if not (self.is_new() or self.has_value_changed("from_date") or self.has_value_changed("to_date")
+                or self.has_value_changed("employee") or self.has_value_changed("request_type")
+                or self.has_value_changed("project")):
+            return
+
+        overlaps = find_overlaps(self.employee, self.from_date, self.to_date, exclude=self.name,
+                                 request_type=self.request_type, project=self.project)
+        if overlaps:
+            frappe.msgprint(
+                "Overlaps with: " + ", ".join(
+                    f"{overlap.name} ({overlap.request_type}, {overlap.from_date} to {overlap.to_date})"
+                    for overlap in overlaps
+                ),
+                title="Overlapping Requests",
+                indicator="orange"
+            )
+
+    def fetch_employee_name(self, context):
         if self.employee and not self.employee_name:
-            self.employee_name = frappe.db.get_value("Employee", self.employee, "employee_name")
+            self.employee_name = context.employee_name
 
     def calculate_total_days(self):
-        """Calculate total days between from_date and to_date"""
+        """Count the working days from from_date to to_date on the employee's holiday calendar"""
         if self.from_date and self.to_date:
-            self.total_days = date_diff(self.to_date, self.from_date) + 1
+            self.total_days = count_working_days(self.from_date, self.to_date, get_holiday_list(self.employee))
 
-    def link_assignment(self):
+    def link_assignment(self, context):
         """Link to Employee Project Assignment if project is selected and fetch project scope and approver"""
         if self.request_type == "Project Date Update" and self.project and self.employee and not self.assignment:
-            assignment = frappe.db.get_value(
-                "Employee Project Assignment",
-                {"employee": self.employee, "project": self.project, "status": "Active"},
-                ["name", "project_scope", "approver"],
-                as_dict=True
-            )
-            if assignment:
-                self.assignment = assignment.name
-                # Fetch project scope from assignment if not already set
-                if assignment.project_scope and not self.project_scope:
-                    self.project_scope = assignment.project_scope
-                # Fetch approver from assignment if not already set
-                if assignment.approver and not self.approver:
-                    self.approver = assignment.approver
-
-        # Also fetch project_scope and approver if assignment is already set
-        if self.assignment:
-            assignment_data = frappe.db.get_value(
-                "Employee Project Assignment",
-                self.assignment,
-                ["project_scope", "approver"],
-                as_dict=True
-            )
-            if assignment_data:
-                if assignment_data.project_scope and not self.project_scope:
-                    self.project_scope = assignment_data.project_scope
-                if assignment_data.approver and not self.approver:
-                    self.approver = assignment_data.approver
+            self.assignment = context.assignment
+
+        # The context holds the linked assignment, or the active one it was just linked to
+        if self.assignment and context.assignment == self.assignment:
+            if context.project_scope and not self.project_scope:
+                self.project_scope = context.project_scope
+            if context.approver and not self.approver:
+                self.approver = context.approver
 
-    def set_default_approver(self):
+    def set_default_approver(self, context):
         """Set default approver from Employee Project Assignment, fallback to project manager"""
         if not self.approver and self.project and self.employee:
-            # Get the user_id of the employee making the request
-            employee_user = frappe.db.get_value("Employee", self.employee, "user_id")
-
-            # First, try to get approver from the Employee Project Assignment
-            assignment_approver = None
-            if self.assignment:
-                assignment_approver = frappe.db.get_value("Employee Project Assignment", self.assignment, "approver")
-            else:
-                # Try to find the assignment if not already linked
-                assignment_data = frappe.db.get_value(
-                    "Employee Project Assignment",
-                    {"employee": self.employee, "project": self.project, "status": "Active"},
-                    ["name", "approver"],
-                    as_dict=True
-                )
-                if assignment_data:
-                    assignment_approver = assignment_data.get("approver")
-
-            if assignment_approver and assignment_approver != employee_user:
+            if context.approver and context.approver != context.employee_user:
                 # Use the approver from the assignment
-                self.approver = assignment_approver
-            else:
-                # Fallback to project manager
-                project_manager = frappe.db.get_value("Smart Project", self.project, "project_manager")
-
-                # If the employee is NOT the project manager, set project manager as approver
-                if project_manager and project_manager != employee_user:
-                    self.approver = project_manager
-                # If the employee IS the project manager, they can self-approve (no approver needed)
+                self.approver = context.approver
+            elif context.project_manager and context.project_manager != context.employee_user:
+                # Fallback to project manager, unless the employee IS the project manager,
+                # who can self-approve (no approver needed)
+                self.approver = context.project_manager
 
     def on_submit(self):
         if self.status == "Draft":
@@ -102,13 +90,26 @@ class EmployeeDateRequest(Document):
 
     def on_update(self):
         """Handle status changes"""
-        if self.has_value_changed("status"):
-            if self.status == "Approved":
+        if self.status == "Approved" and not self.approval_processed:
+            if self.claim_approval():
                 self.on_approval()
                 self.send_status_notification("approved")
-            elif self.status == "Rejected":
-                self.on_rejection()
-                self.send_status_notification("rejected")
+        elif self.status == "Rejected" and self.has_value_changed("status"):
+            self.on_rejection()
+            self.send_status_notification("rejected")
+
+    def claim_approval(self):
+        """Set the approval_processed marker, returning False if another save already did
+
+        The row lock taken here is held until the save commits, so the approval
+        side effects run exactly once and commit or roll back with the status.
+        """
+        if frappe.db.get_value(self.doctype, self.name, "approval_processed", for_update=True):
+            self.approval_processed = 1
+            return False
+
+        self.db_set("approval_processed", 1, update_modified=False)
+        return True
 
     def send_request_notification(self):
         """Send notification to approver for new request"""
@@ -158,8 +159,8 @@ class EmployeeDateRequest(Document):
 
                 frappe.msgprint(f"Request approved for {self.project_title or self.project}")
         except Exception as e:
-            frappe.log_error(f"Error in on_approval: {str(e)}", "Date Request Approval Error")
-            frappe.throw(f"Error processing approval: {str(e)}")
+            frappe.log_error(f"Error in on_approval: {e!s}", "Date Request Approval Error")
+            frappe.throw(f"Error processing approval: {e!s}")
 
     def on_rejection(self):
         """Actions when request is rejected"""
@@ -169,11 +170,17 @@ class EmployeeDateRequest(Document):
     def update_project_dates(self):
         """Update project start and end dates"""
         if self.project and self.from_date and self.to_date:
+            old_status = frappe.db.get_value("Smart Project", self.project, "status", for_update=True)
             frappe.db.set_value("Smart Project", self.project, {
                 "start_date": self.from_date,
                 "end_date": self.to_date,
                 "status": "Active"
             })
+            if old_status != "Active":
+                sync_project_status(self.project, "Active")
+                # set_value skips the counter doc events; this runs after commit like they do
+                adjust_counts("Smart Project", {old_status: -1, "Active": 1})
+            bump_versions("Smart Project")
 
     def update_assignment_dates(self):
         """Update assignment dates"""
@@ -182,6 +189,8 @@ class EmployeeDateRequest(Document):
                 "start_date": self.from_date,
                 "end_date": self.to_date
             })
+            bump_versions("Employee Project Assignment")
+            invalidate_assignments(self.employee)
 
     def create_project_tasks(self):
         """Auto-create a task for the project based on this date request"""
@@ -189,39 +198,91 @@ class EmployeeDateRequest(Document):
             frappe.log_error(f"Cannot create task: project={self.project}, employee={self.employee}", "Task Creation Error")
             return
 
-        try:
-            project_title = self.project_title or frappe.db.get_value("Smart Project", self.project, "title")
-
-            # Create unique task title using date request name
-            task_title = f"{project_title} - {self.name}"
-
-            # Check if task already exists for this date request (prevent duplicates)
-            existing_task = frappe.db.exists("Smart Task", {"title": task_title})
-            if existing_task:
-                frappe.msgprint(f"Task already exists: {task_title}")
-                return
-
-            # Get employee's user_id
-            user_id = frappe.db.get_value("Employee", self.employee, "user_id")
-            if not user_id:
-                frappe.msgprint("Employee does not have a linked user. Task will be created without assignment.")
-
-            task = frappe.get_doc({
-                "doctype": "Smart Task",
-                "title": task_title,
-                "project": self.project,
-                "assigned_to": user_id,
-                "status": "Open",
-                "priority": "Medium",
-                "start_date": self.from_date,
-                "due_date": self.to_date,
-                "progress": 0,
-                "description": f"Task created from date request {self.name} for {project_title}",
-                "project_scope": self.project_scope
-            })
-            task.insert(ignore_permissions=True)
-            frappe.db.commit()
-            frappe.msgprint(f"Created task: {task.title}")
-        except Exception as e:
-            frappe.log_error(f"Error creating task: {str(e)}", "Task Creation Error")
-            frappe.msgprint(f"Error creating task: {str(e)}")
+        project_title = self.project_title or frappe.db.get_value("Smart Project", self.project, "title")
+
+        # Create unique task title using date request name
+        task_title = f"{project_title} - {self.name}"
+
+        # Check if task already exists for this date request (prevent duplicates)
+        existing_task = frappe.db.exists("Smart Task", {"source_date_request": self.name})
+        if existing_task:
+            frappe.msgprint(f"Task already exists: {task_title}")
+            return
+
+        # Get employee's user_id
+        user_id = frappe.db.get_value("Employee", self.employee, "user_id")
+        if not user_id:
+            frappe.msgprint("Employee does not have a linked user. Task will be created without assignment.")
+
+        # Inserted in the approval's transaction, so a failure rolls the approval back too
+        task = frappe.get_doc({
+            "doctype": "Smart Task",
+            "title": task_title,
+            "project": self.project,
+            "assigned_to": user_id,
+            "status": "Open",
+            "priority": "Medium",
+            "start_date": self.from_date,
+            "due_date": self.to_date,
+            "progress": 0,
+            "description": f"Task created from date request {self.name} for {project_title}",
+            "project_scope": self.project_scope,
+            "source_date_request": self.name
+        })
+        task.insert(ignore_permissions=True)
+        frappe.msgprint(f"Created task: {task.title}")
+
+
+def get_approval_context(employee, project, assignment=None):
+    """Resolve what a date request needs about its employee, project and assignment in one query
+
+    Returns employee_user, employee_name, project_manager, project_title and the
+    assignment's name, project_scope and approver. The assignment is the given one,
+    or else the employee's active assignment on the project. Results are memoized
+    for the rest of the request.
+    """
+    key = (employee, project, assignment)
+    cache = getattr(frappe.local, "smart_pro_approval_context", None)
+    if cache is None:
+        cache = frappe.local.smart_pro_approval_context = {}
+
+    if key not in cache:
+        if assignment:
+            assignment_condition = "assignment.name = %(assignment)s"
+        else:
+            assignment_condition = """assignment.employee = %(employee)s
+                AND assignment.project = %(project)s
+                AND assignment.status = 'Active'"""
+
+        cache[key] = frappe.db.sql(f"""
+            SELECT
+                employee.user_id AS employee_user,
+                employee.employee_name,
+                project.project_manager,
+                project.title AS project_title,
+                assignment.name AS assignment,
+                assignment.project_scope,
+                assignment.approver
+            FROM (SELECT 1) seed
+            LEFT JOIN `tabEmployee` employee ON employee.name = %(employee)s
+            LEFT JOIN `tabSmart Project` project ON project.name = %(project)s
+            LEFT JOIN `tabEmployee Project Assignment` assignment ON {assignment_condition}
+            LIMIT 1
+        """, {"employee": employee, "project": project, "assignment": assignment}, as_dict=True)[0]
+
+    return cache[key]
+
+
+def clear_approval_context(*args, **kwargs):
+    """Drop the memoized contexts, e.g. after an assignment changed
+
+    Accepts and ignores doc event arguments so it can be used directly as a hook.
+    """
+    frappe.local.smart_pro_approval_context = {}
+
+
+def on_doctype_update():
+    """Index the approver inbox, an employee's own requests by status and their date ranges"""
+    frappe.db.add_index("Employee Date Request", ["approver", "status"])
+    frappe.db.add_index("Employee Date Request", ["employee", "status"])
+    frappe.db.add_index("Employee Date Request", ["employee", "from_date", "to_date"])
@@ -1,9 +1,105 @@
 # Copyright (c) 2025, sammish and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, today
+
+from smart_pro.smart_pro.api.test_projects import make_task
+from smart_pro.smart_pro.doctype.employee_date_request import employee_date_request
+from smart_pro.smart_pro.doctype.employee_date_request.employee_date_request import (
+	clear_approval_context,
+	get_approval_context,
+)
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_assignment,
+	make_employee,
+	make_project,
+)
+
+TEST_USER = "date-request-test-user@example.com"
 
 
 class TestEmployeeDateRequest(FrappeTestCase):
-	pass
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		self.project = make_project()
+
+	def make_request(self):
+		return frappe.get_doc(
+			{
+				"doctype": "Employee Date Request",
+				"employee": self.employee,
+				"request_type": "Project Date Update",
+				"project": self.project,
+				"from_date": add_days(today(), 10),
+				"to_date": add_days(today(), 20),
+				"reason": "Date request test",
+			}
+		).insert(ignore_permissions=True)
+
+	def test_project_dates_reactivate_the_project(self):
+		task = make_task(self.project)
+		frappe.db.set_value("Smart Project", self.project, "status", "On Hold")
+		frappe.db.set_value("Smart Task", task, "project_status", "On Hold")
+		request = self.make_request()
+
+		request.update_project_dates()
+
+		self.assertEqual(frappe.db.get_value("Smart Project", self.project, "status"), "Active")
+		self.assertEqual(
+			frappe.db.get_value("Smart Project", self.project, "end_date"), getdate(request.to_date)
+		)
+		self.assertEqual(frappe.db.get_value("Smart Task", task, "project_status"), "Active")
+
+	def test_active_project_is_not_resynced(self):
+		request = self.make_request()
+
+		with (
+			patch.object(employee_date_request, "sync_project_status") as sync,
+			patch.object(employee_date_request, "adjust_counts") as adjust,
+		):
+			request.update_project_dates()
+
+		sync.assert_not_called()
+		adjust.assert_not_called()
+		self.assertEqual(
+			frappe.db.get_value("Smart Project", self.project, "start_date"), getdate(request.from_date)
+		)
+
+
+class TestApprovalContext(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		self.project = make_project()
+		frappe.db.set_value("Smart Project", self.project, "project_manager", "Administrator")
+		clear_approval_context()
+
+	def test_context_is_fetched_in_one_query(self):
+		assignment = make_assignment(self.employee, self.project, approver="Administrator")
+		clear_approval_context()
+
+		with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+			context = get_approval_context(self.employee, self.project)
+			self.assertEqual(sql.call_count, 1)
+
+			# Memoized for the rest of the request
+			self.assertIs(get_approval_context(self.employee, self.project), context)
+			self.assertEqual(sql.call_count, 1)
+
+		self.assertEqual(context.employee_user, TEST_USER)
+		self.assertEqual(context.project_title, frappe.db.get_value("Smart Project", self.project, "title"))
+		self.assertEqual(context.project_manager, "Administrator")
+		self.assertEqual(context.assignment, assignment.name)
+		self.assertEqual(context.approver, "Administrator")
+
+	def test_project_without_an_assignment_still_resolves(self):
+		context = get_approval_context(self.employee, self.project)
+
+		self.assertEqual(context.employee_user, TEST_USER)
+		self.assertEqual(context.project_manager, "Administrator")
+		self.assertIsNone(context.assignment)
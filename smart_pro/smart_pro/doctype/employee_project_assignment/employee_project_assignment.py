@@ -1,6 +1,13 @@
 import frappe
 from frappe.model.document import Document
 
+from smart_pro.smart_pro.allocation import validate_assignment_allocation
+from smart_pro.smart_pro.doctype.employee_date_request.employee_date_request import (
+    clear_approval_context,
+    get_approval_context,
+)
+
+
 class EmployeeProjectAssignment(Document):
     def before_insert(self):
         # Set default status if not provided
@@ -11,11 +18,16 @@ class EmployeeProjectAssignment(Document):
         self.validate_dates()
         self.fetch_employee_name()
         self.validate_allocation()
+        validate_assignment_allocation(self)
 
     def after_insert(self):
         """Auto-create Employee Date Request after assignment is created"""
         self.create_date_request()
 
+    def on_update(self):
+        # Date requests saved later in this request must see the new approver and scope
+        clear_approval_context()
+
     def validate_dates(self):
         if self.start_date and self.end_date and self.start_date > self.end_date:
             frappe.throw("Start Date cannot be after End Date")
@@ -39,8 +51,8 @@ class EmployeeProjectAssignment(Document):
         if not self.employee or not self.project or not self.start_date:
             return
 
-        # Get project title
-        project_title = frappe.db.get_value("Smart Project", self.project, "title") or self.project
+        # Resolved once here and memoized, so validating the date request below costs no further queries
+        project_title = get_approval_context(self.employee, self.project, self.name).project_title or self.project
 
         # Create the date request
         date_request = frappe.get_doc({
@@ -64,8 +76,14 @@ class EmployeeProjectAssignment(Document):
                 alert=True
             )
         except Exception as e:
-            frappe.log_error(f"Failed to create date request: {str(e)}", "Employee Project Assignment")
+            frappe.log_error(f"Failed to create date request: {e!s}", "Employee Project Assignment")
             frappe.msgprint(
-                f"Note: Date request could not be auto-created. Please create manually.",
+                "Note: Date request could not be auto-created. Please create manually.",
                 indicator="orange"
-            )
\ No newline at end of file
+            )
+
+
+def on_doctype_update():
+    """Index active assignments per employee and per project"""
+    frappe.db.add_index("Employee Project Assignment", ["employee", "status"])
+    frappe.db.add_index("Employee Project Assignment", ["project", "status"])
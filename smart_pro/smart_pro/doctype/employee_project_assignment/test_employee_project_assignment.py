@@ -1,9 +1,115 @@
 # Copyright (c) 2025, sammish and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import today
+
+from smart_pro.smart_pro.api.projects import get_employee_assigned_projects
+
+TEST_USER = "epa-test-user@example.com"
 
 
 class TestEmployeeProjectAssignment(FrappeTestCase):
-	pass
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+
+	def test_assigned_projects_query_count_is_constant(self):
+		query_counts = []
+
+		for _ in range(2):
+			frappe.set_user("Administrator")
+			for _ in range(3):
+				make_assignment(self.employee, make_project())
+
+			frappe.set_user(TEST_USER)
+			# Warm the access profile cache so only the endpoint's own queries are counted
+			get_employee_assigned_projects()
+
+			with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+				projects = get_employee_assigned_projects()
+			query_counts.append(sql.call_count)
+
+		self.assertEqual(len(projects), 6)
+		self.assertEqual(query_counts[0], query_counts[1])
+
+	def test_assigned_projects_field_projection(self):
+		make_assignment(self.employee, make_project())
+
+		frappe.set_user(TEST_USER)
+		projects = get_employee_assigned_projects(fields=["project", "title"])
+
+		self.assertTrue(projects)
+		self.assertEqual(set(projects[0]), {"project", "title"})
+		self.assertRaises(frappe.ValidationError, get_employee_assigned_projects, fields=["budget_amount"])
+
+
+def make_employee(user):
+	if not frappe.db.exists("User", user):
+		frappe.get_doc(
+			{
+				"doctype": "User",
+				"email": user,
+				"first_name": "EPA Test",
+				"send_welcome_email": 0,
+			}
+		).insert(ignore_permissions=True)
+
+	employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+	if employee:
+		return employee
+
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Employee",
+				"first_name": "EPA Test",
+				"user_id": user,
+				"status": "Active",
+				"gender": "Other",
+				"date_of_birth": "1990-01-01",
+				"date_of_joining": "2020-01-01",
+			}
+		)
+		.insert(ignore_permissions=True, ignore_mandatory=True)
+		.name
+	)
+
+
+def make_project():
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Smart Project",
+				"title": f"EPA Test Project {frappe.generate_hash(length=6)}",
+				"status": "Active",
+			}
+		)
+		.insert(ignore_permissions=True)
+		.name
+	)
+
+
+def make_assignment(employee, project, **kwargs):
+	if not frappe.db.exists("Smart Role", "Developer"):
+		frappe.get_doc({"doctype": "Smart Role", "smart_role": "Developer"}).insert(ignore_permissions=True)
+
+	return frappe.get_doc(
+		{
+			"doctype": "Employee Project Assignment",
+			"employee": employee,
+			"project": project,
+			"role": "Developer",
+			"status": "Active",
+			"start_date": today(),
+			# Small enough for many open-ended assignments of one employee to pass the allocation check
+			"allocation_percentage": 10,
+			**kwargs,
+		}
+	).insert(ignore_permissions=True)
@@ -1,5 +1,11 @@
 import frappe
 from frappe.model.document import Document
 
+
 class SmartProNotification(Document):
-    pass
\ No newline at end of file
+    pass
+
+
+def on_doctype_update():
+    """Index a user's notifications by status, newest first"""
+    frappe.db.add_index("Smart Pro Notification", ["user", "status", "created_at"])
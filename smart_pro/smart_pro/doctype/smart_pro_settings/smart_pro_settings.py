@@ -4,9 +4,13 @@
 import frappe
 from frappe.model.document import Document
 
+from smart_pro.smart_pro.access import bump_access_version, get_access_profile
+
 
 class SmartProSettings(Document):
-	pass
+	def on_update(self):
+		# Full-access grants may have changed for any user
+		bump_access_version()
 
 
 def get_settings():
@@ -23,69 +27,9 @@ def get_settings():
 
 def user_has_full_access(user=None):
 	"""Check if user has full access to view all projects and tasks"""
-	if not user:
-		user = frappe.session.user
-
-	# Administrator always has full access
-	if user == "Administrator":
-		return True
-
-	# System Manager always has full access
-	user_roles = frappe.get_roles(user)
-	if "System Manager" in user_roles:
-		frappe.logger().info(f"user_has_full_access: {user} has System Manager role")
-		return True
-
-	settings = get_settings()
-
-	# Check if user is in the users_with_full_access table
-	if hasattr(settings, 'users_with_full_access') and settings.users_with_full_access:
-		for row in settings.users_with_full_access:
-			if row.user == user and row.can_view_all_projects:
-				frappe.logger().info(f"user_has_full_access: {user} is in users_with_full_access table")
-				return True
-
-	# Check if user has any of the roles with full access
-	if hasattr(settings, 'roles_with_full_access') and settings.roles_with_full_access:
-		roles_with_access = [r.strip() for r in settings.roles_with_full_access.split("\n") if r.strip()]
-		frappe.logger().info(f"user_has_full_access: roles_with_access = {roles_with_access}, user_roles = {user_roles}")
-
-		for role in roles_with_access:
-			if role in user_roles:
-				frappe.logger().info(f"user_has_full_access: {user} has role '{role}' which grants full access")
-				return True
-
-	frappe.logger().info(f"user_has_full_access: {user} does NOT have full access")
-	return False
+	return get_access_profile(user).can_view_all_projects
 
 
 def user_can_view_all_tasks(user=None):
 	"""Check if user can view all tasks"""
-	if not user:
-		user = frappe.session.user
-
-	# Administrator always has full access
-	if user == "Administrator":
-		return True
-
-	# System Manager always has full access
-	user_roles = frappe.get_roles(user)
-	if "System Manager" in user_roles:
-		return True
-
-	settings = get_settings()
-
-	# Check if user is in the users_with_full_access table with task permission
-	for row in settings.users_with_full_access:
-		if row.user == user and row.can_view_all_tasks:
-			return True
-
-	# Check if user has any of the roles with full access
-	if settings.roles_with_full_access:
-		roles_with_access = [r.strip() for r in settings.roles_with_full_access.split("\n") if r.strip()]
-
-		for role in roles_with_access:
-			if role in user_roles:
-				return True
-
-	return False
+	return get_access_profile(user).can_view_all_tasks
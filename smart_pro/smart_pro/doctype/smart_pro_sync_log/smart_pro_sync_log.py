@@ -0,0 +1,16 @@
+# Copyright (c) 2026, sammish and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class SmartProSyncLog(Document):
+	pass
+
+
+def on_doctype_update():
+	"""Index tombstone reads by doctype, access changes by user, and the purge by time"""
+	frappe.db.add_index("Smart Pro Sync Log", ["reference_doctype", "action", "creation"])
+	frappe.db.add_index("Smart Pro Sync Log", ["user", "action", "creation"])
+	frappe.db.add_index("Smart Pro Sync Log", ["creation"])
@@ -1,5 +1,9 @@
 import frappe
 from frappe.model.document import Document
+from frappe.utils import now_datetime
+
+from smart_pro.smart_pro.versions import bump_versions
+
 
 class SmartProject(Document):
     def before_insert(self):
@@ -11,6 +15,10 @@ class SmartProject(Document):
         self.validate_dates()
         self.update_project_status()
 
+    def on_update(self):
+        if self.has_value_changed("status"):
+            sync_project_status(self.name, self.status)
+
     def validate_dates(self):
         if self.start_date and self.end_date and self.start_date > self.end_date:
             frappe.throw("Start Date cannot be after End Date")
@@ -20,4 +28,26 @@ class SmartProject(Document):
         if self.status == "Planning" and self.start_date:
             from frappe.utils import today
             if self.start_date <= today():
-                self.status = "Active"
\ No newline at end of file
+                self.status = "Active"
+
+
+# Doctypes carrying a denormalized copy of their project's status
+PROJECT_STATUS_DOCTYPES = ("Smart Task", "Smart Timesheet", "Employee Date Request")
+
+
+def sync_project_status(project, status):
+    """Propagate a project's status to the indexed project_status column of its linked records
+
+    Only rows whose copy differs are written, and their modified moves so delta
+    sync picks the new status up.
+    """
+    now = now_datetime()
+    for doctype in PROJECT_STATUS_DOCTYPES:
+        frappe.db.sql(
+            f"""
+            UPDATE `tab{doctype}` SET project_status = %s, modified = %s
+            WHERE project = %s AND IFNULL(project_status, '') != %s
+            """,
+            (status, now, project, status)
+        )
+    bump_versions(*PROJECT_STATUS_DOCTYPES)
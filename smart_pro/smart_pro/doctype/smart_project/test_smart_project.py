@@ -1,9 +1,35 @@
 # Copyright (c) 2025, sammish and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from smart_pro.smart_pro.api.test_projects import make_task
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_project,
+)
+from smart_pro.smart_pro.sync import get_changes
 
 
 class TestSmartProject(FrappeTestCase):
-	pass
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def test_status_change_reaches_delta_sync(self):
+		project = make_project()
+		task = make_task(project)
+		frappe.db.set_value(
+			"Smart Task", task, "modified", add_days(now_datetime(), -1), update_modified=False
+		)
+		watermark = get_changes(doctypes=["Smart Task"])["watermark"]
+
+		doc = frappe.get_doc("Smart Project", project)
+		doc.status = "On Hold"
+		doc.save(ignore_permissions=True)
+
+		changes = get_changes(since=watermark, doctypes=["Smart Task"])["changes"]["Smart Task"]
+		self.assertEqual(
+			[row["project_status"] for row in changes if row["name"] == task],
+			["On Hold"],
+		)
@@ -1,6 +1,7 @@
 import frappe
 from frappe.model.document import Document
 
+
 class SmartTask(Document):
     def before_insert(self):
         # Set default values if not provided
@@ -52,4 +53,10 @@ class SmartTask(Document):
         try:
             PushNotificationManager.send_task_update_notification(self)
         except Exception as e:
-            frappe.log_error(str(e), "Task Update Notification Error")
\ No newline at end of file
+            frappe.log_error(str(e), "Task Update Notification Error")
+
+
+def on_doctype_update():
+    """Index project task lists (sorted by due date) and per-assignee status filters"""
+    frappe.db.add_index("Smart Task", ["project", "due_date"])
+    frappe.db.add_index("Smart Task", ["assigned_to", "status"])
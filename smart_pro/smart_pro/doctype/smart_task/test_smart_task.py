@@ -1,9 +1,60 @@
 # Copyright (c) 2025, sammish and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from smart_pro.patches.v1_0 import backfill_task_source_date_request
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+	make_project,
+)
+
+TEST_USER = "smart-task-test-user@example.com"
 
 
 class TestSmartTask(FrappeTestCase):
-	pass
+	@patch.object(frappe.db, "commit")
+	def test_backfill_links_plain_and_html_descriptions(self, _commit):
+		frappe.set_user("Administrator")
+		request = frappe.get_doc(
+			{
+				"doctype": "Employee Date Request",
+				"employee": make_employee(TEST_USER),
+				"request_type": "Leave",
+				"from_date": add_days(today(), 40),
+				"to_date": add_days(today(), 41),
+				"reason": "Backfill test",
+			}
+		).insert(ignore_permissions=True)
+		project = make_project()
+		description = f"Task created from date request {request.name} for Backfill"
+		tasks = [
+			self.make_task(project, description),
+			self.make_task(project, f"<p>{description}</p>"),
+			self.make_task(project, "<p>Task created by hand</p>"),
+		]
+
+		backfill_task_source_date_request.execute()
+
+		self.assertEqual(
+			[frappe.db.get_value("Smart Task", task, "source_date_request") for task in tasks],
+			[request.name, request.name, None],
+		)
+
+	def make_task(self, project, description):
+		return (
+			frappe.get_doc(
+				{
+					"doctype": "Smart Task",
+					"title": f"Backfill Test Task {frappe.generate_hash(length=6)}",
+					"project": project,
+					"description": description,
+				}
+			)
+			.insert(ignore_permissions=True)
+			.name
+		)
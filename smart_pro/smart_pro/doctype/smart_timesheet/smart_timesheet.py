@@ -5,6 +5,14 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import flt
 
+from smart_pro.smart_pro.doctype.smart_timesheet_rollup.smart_timesheet_rollup import (
+    apply_rollup_deltas,
+    get_rollup_deltas,
+)
+from smart_pro.smart_pro.hours import apply_hours_deltas, get_hours_deltas
+
+MAX_HOURS_PER_DAY = 24
+
 
 class SmartTimesheet(Document):
     def validate(self):
@@ -13,15 +21,18 @@ class SmartTimesheet(Document):
         self.fetch_employee_name()
 
     def validate_hours(self):
-        """Validate hours worked is between 0 and 24"""
+        """Validate hours worked is between 0 and MAX_HOURS_PER_DAY"""
         if self.hours_worked:
             if flt(self.hours_worked) <= 0:
                 frappe.throw("Hours worked must be greater than 0")
-            if flt(self.hours_worked) > 24:
-                frappe.throw("Hours worked cannot exceed 24 hours per day")
+            if flt(self.hours_worked) > MAX_HOURS_PER_DAY:
+                frappe.throw(f"Hours worked cannot exceed {MAX_HOURS_PER_DAY} hours per day")
 
     def validate_task_project(self):
         """Validate that task belongs to the selected project"""
+        # Bulk entry checks every row against one prefetched task map
+        if self.flags.task_project_validated:
+            return
         if self.task and self.project:
             task_project = frappe.db.get_value("Smart Task", self.task, "project")
             if task_project != self.project:
@@ -36,3 +47,23 @@ class SmartTimesheet(Document):
         """Auto-fetch task title"""
         if self.task and not self.task_title:
             self.task_title = frappe.db.get_value("Smart Task", self.task, "title")
+
+    def on_update(self):
+        """Move this timesheet's hours in the rollups and task/project totals (runs for inserts too)"""
+        changes = [(self.get_doc_before_save(), self)]
+        apply_rollup_deltas(get_rollup_deltas(changes))
+        apply_hours_deltas(get_hours_deltas(changes))
+
+    def on_trash(self):
+        changes = [(self, None)]
+        apply_rollup_deltas(get_rollup_deltas(changes))
+        apply_hours_deltas(get_hours_deltas(changes))
+
+
+def on_doctype_update():
+    """Index an employee's timesheets by date, a project's timesheets by status and
+    company-wide exports by status and date"""
+    frappe.db.add_index("Smart Timesheet", ["employee", "date"])
+    frappe.db.add_index("Smart Timesheet", ["project", "status"])
+    frappe.db.add_index("Smart Timesheet", ["status", "date"])
+
@@ -0,0 +1,167 @@
+# Copyright (c) 2026, sammish and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, flt, get_first_day, getdate, now_datetime
+
+PERIOD_TYPES = ("Day", "Week", "Month")
+
+# SQL for the start of the period a timesheet date falls in (weeks start on Monday)
+PERIOD_START_SQL = {
+	"Day": "`date`",
+	"Week": "DATE_SUB(`date`, INTERVAL WEEKDAY(`date`) DAY)",
+	"Month": "CAST(DATE_FORMAT(`date`, '%%Y-%%m-01') AS DATE)",
+}
+
+
+class SmartTimesheetRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	"""Index rollups by employee and by project within a period type"""
+	frappe.db.add_index("Smart Timesheet Rollup", ["employee", "period_type", "period_start"])
+	frappe.db.add_index("Smart Timesheet Rollup", ["project", "period_type", "period_start"])
+
+
+def get_period_start(date, period_type):
+	date = getdate(date)
+	if period_type == "Week":
+		return add_days(date, -date.weekday())
+	if period_type == "Month":
+		return get_first_day(date)
+	return date
+
+
+def get_rollup_name(employee, project, activity_type, period_type, period_start):
+	"""Deterministic name of a rollup row, so upserts can use the primary key"""
+	key = "|".join((employee or "", project or "", activity_type or "", period_type, str(period_start)))
+	return hashlib.sha1(key.encode()).hexdigest()
+
+
+def get_contributions(timesheet, sign=1):
+	"""{(employee, project, activity_type, period_type, period_start): [hours, approved_hours, entries]}"""
+	if not timesheet or not timesheet.get("date") or timesheet.get("status") == "Rejected":
+		return {}
+
+	hours = flt(timesheet.get("hours_worked")) * sign
+	approved_hours = hours if timesheet.get("status") == "Approved" else 0
+	return {
+		(
+			timesheet.get("employee"),
+			timesheet.get("project"),
+			timesheet.get("activity_type"),
+			period_type,
+			get_period_start(timesheet.get("date"), period_type),
+		): [hours, approved_hours, sign]
+		for period_type in PERIOD_TYPES
+	}
+
+
+def get_rollup_deltas(changes):
+	"""Net rollup deltas of a batch of (before, after) timesheet states
+
+	Either side may be None for an insert or a delete.
+	"""
+	deltas = {}
+	for before, after in changes:
+		for sign, timesheet in ((-1, before), (1, after)):
+			for key, values in get_contributions(timesheet, sign).items():
+				totals = deltas.setdefault(key, [0, 0, 0])
+				for i, value in enumerate(values):
+					totals[i] += value
+
+	return {key: totals for key, totals in deltas.items() if any(totals)}
+
+
+def apply_rollup_deltas(deltas):
+	"""Add the deltas to the rollup rows with a single INSERT ... ON DUPLICATE KEY UPDATE
+
+	Runs inside the caller's transaction, so the rollups commit or roll back with
+	the timesheets. Rows are written in name order to keep lock order stable.
+	"""
+	if not deltas:
+		return
+
+	now = now_datetime()
+	user = frappe.session.user
+	rows = sorted((get_rollup_name(*key), key, totals) for key, totals in deltas.items())
+
+	values = []
+	for name, (employee, project, activity_type, period_type, period_start), (
+		hours,
+		approved_hours,
+		entries,
+	) in rows:
+		values.extend(
+			[
+				name,
+				now,
+				now,
+				user,
+				user,
+				employee,
+				project,
+				activity_type,
+				period_type,
+				period_start,
+				hours,
+				approved_hours,
+				entries,
+			]
+		)
+
+	placeholders = ", ".join(["(" + ", ".join(["%s"] * 13) + ")"] * len(rows))
+	frappe.db.sql(
+		f"""
+		INSERT INTO `tabSmart Timesheet Rollup`
+			(name, creation, modified, owner, modified_by,
+			employee, project, activity_type, period_type, period_start,
+			hours, approved_hours, entries)
+		VALUES {placeholders}
+		ON DUPLICATE KEY UPDATE
+			hours = hours + VALUES(hours),
+			approved_hours = approved_hours + VALUES(approved_hours),
+			entries = entries + VALUES(entries),
+			modified = VALUES(modified)
+		""",
+		values,
+	)
+
+
+def rebuild_rollups():
+	"""Recompute every rollup row from the timesheets with one GROUP BY per period type"""
+	frappe.db.sql("DELETE FROM `tabSmart Timesheet Rollup`")
+
+	for period_type, period_start in PERIOD_START_SQL.items():
+		frappe.db.sql(
+			f"""
+			INSERT INTO `tabSmart Timesheet Rollup`
+				(name, creation, modified, owner, modified_by,
+				employee, project, activity_type, period_type, period_start,
+				hours, approved_hours, entries)
+			SELECT
+				SHA1(CONCAT_WS('|', employee, project, activity_type, %(period_type)s, period_start)),
+				%(now)s, %(now)s, 'Administrator', 'Administrator',
+				NULLIF(employee, ''), NULLIF(project, ''), NULLIF(activity_type, ''),
+				%(period_type)s, period_start,
+				hours, approved_hours, entries
+			FROM (
+				SELECT
+					IFNULL(employee, '') AS employee,
+					IFNULL(project, '') AS project,
+					IFNULL(activity_type, '') AS activity_type,
+					{period_start} AS period_start,
+					SUM(hours_worked) AS hours,
+					SUM(IF(status = 'Approved', hours_worked, 0)) AS approved_hours,
+					COUNT(*) AS entries
+				FROM `tabSmart Timesheet`
+				WHERE IFNULL(status, '') != 'Rejected' AND `date` IS NOT NULL
+				GROUP BY 1, 2, 3, 4
+			) totals
+			""",
+			{"period_type": period_type, "now": now_datetime()},
+		)
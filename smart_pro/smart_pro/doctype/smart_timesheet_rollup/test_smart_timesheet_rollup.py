@@ -0,0 +1,88 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from smart_pro.smart_pro.api.test_projects import make_task
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+	make_project,
+)
+from smart_pro.smart_pro.doctype.smart_timesheet_rollup.smart_timesheet_rollup import (
+	get_period_start,
+	rebuild_rollups,
+)
+
+TEST_USER = "rollup-test-user@example.com"
+
+
+class TestSmartTimesheetRollup(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		self.project = make_project()
+		self.task = make_task(self.project)
+
+	def tearDown(self):
+		# rebuild_rollups rewrites every row of the table
+		frappe.db.rollback()
+
+	def make_timesheet(self, date, hours, status="Submitted"):
+		return frappe.get_doc(
+			{
+				"doctype": "Smart Timesheet",
+				"employee": self.employee,
+				"date": date,
+				"project": self.project,
+				"task": self.task,
+				"hours_worked": hours,
+				"description": "Rollup test",
+				"status": status,
+			}
+		).insert(ignore_permissions=True)
+
+	def get_rollups(self):
+		rows = frappe.get_all(
+			"Smart Timesheet Rollup",
+			filters={"employee": self.employee},
+			fields=["name", "period_type", "period_start", "hours", "approved_hours", "entries"],
+		)
+		# Incremental updates leave emptied rows behind, a rebuild does not create them
+		return {
+			row.name: (row.period_type, str(row.period_start), row.hours, row.approved_hours, row.entries)
+			for row in rows
+			if row.hours or row.approved_hours or row.entries
+		}
+
+	def test_period_starts(self):
+		self.assertEqual(str(get_period_start("2026-01-08", "Day")), "2026-01-08")
+		self.assertEqual(str(get_period_start("2026-01-08", "Week")), "2026-01-05")
+		self.assertEqual(str(get_period_start("2026-01-08", "Month")), "2026-01-01")
+
+	def test_rebuild_matches_the_incremental_rollups(self):
+		self.make_timesheet("2026-01-05", 2)
+		self.make_timesheet("2026-01-06", 3, status="Draft")
+		approved = self.make_timesheet("2026-01-07", 4)
+		rejected = self.make_timesheet("2026-01-08", 5)
+		moved = self.make_timesheet("2026-01-30", 6)
+		deleted = self.make_timesheet("2026-01-09", 7)
+
+		approved.status = "Approved"
+		approved.save(ignore_permissions=True)
+		rejected.status = "Rejected"
+		rejected.save(ignore_permissions=True)
+		moved.date = "2026-02-02"
+		moved.save(ignore_permissions=True)
+		deleted.delete(ignore_permissions=True)
+
+		incremental = self.get_rollups()
+		rebuild_rollups()
+
+		self.assertEqual(self.get_rollups(), incremental)
+		month = {
+			period_start: (hours, approved_hours, entries)
+			for period_type, period_start, hours, approved_hours, entries in incremental.values()
+			if period_type == "Month"
+		}
+		self.assertEqual(month, {"2026-01-01": (9, 4, 3), "2026-02-01": (6, 0, 1)})
@@ -0,0 +1,69 @@
+"""
+Compact response encodings for large Smart Pro list endpoints
+A list of dicts repeats every key on every row. The columnar encoding sends the
+keys once, and the dictionary encoding also replaces repetitive values (status,
+project, ...) with indexes into a per-column table of distinct values.
+"""
+
+import frappe
+
+FORMAT_COLUMNAR = "columnar"
+FORMAT_DICTIONARY = "dictionary"
+
+# Columns with few distinct values, dictionary encoded when present
+DICTIONARY_FIELDS = (
+	"status",
+	"priority",
+	"activity_type",
+	"project",
+	"project_title",
+	"assigned_to",
+	"employee",
+	"employee_name",
+)
+
+
+def validate_format(format):
+	"""Throw a ValidationError for an encoding the client cannot have meant
+
+	Endpoints call this before their error handling, which would otherwise turn
+	the error into an empty list.
+	"""
+	if format and format not in (FORMAT_COLUMNAR, FORMAT_DICTIONARY):
+		frappe.throw(frappe._("Unsupported response format: {0}").format(format))
+
+
+def encode_rows(rows, format=None, columns=None):
+	"""Encode a list of row dicts in the format the client asked for
+
+	Args:
+		rows: list of dicts, as returned by frappe.get_list
+		format: None for the list of dicts, FORMAT_COLUMNAR or FORMAT_DICTIONARY
+		columns: column order, defaults to the keys of the first row
+
+	Returns:
+		rows unchanged, {"columns", "rows"} for columnar, and additionally
+		{"dictionaries": {column: [values]}} for the dictionary encoding, where
+		the cells of those columns hold indexes into their value list
+	"""
+	validate_format(format)
+	if not format:
+		return rows
+
+	columns = list(columns or (rows[0] if rows else []))
+	values = [[row.get(column) for column in columns] for row in rows]
+
+	if format == FORMAT_COLUMNAR:
+		return {"columns": columns, "rows": values}
+
+	dictionaries = {}
+	for i, column in enumerate(columns):
+		if column not in DICTIONARY_FIELDS:
+			continue
+
+		index = {}
+		for row in values:
+			row[i] = index.setdefault(row[i], len(index))
+		dictionaries[column] = list(index)
+
+	return {"columns": columns, "rows": values, "dictionaries": dictionaries}
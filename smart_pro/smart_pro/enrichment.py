@@ -0,0 +1,60 @@
+"""
+Batched link-title enrichment for Smart Pro result sets
+Resolves the distinct link values of a result set with one IN query per doctype,
+memoized for the rest of the request.
+"""
+
+import frappe
+
+# Field holding the human readable title of each supported link target
+TITLE_FIELDS = {
+	"Smart Project": "title",
+	"Employee": "employee_name",
+	"User": "full_name",
+}
+
+
+def _get_title_cache(doctype):
+	cache = getattr(frappe.local, "smart_pro_title_cache", None)
+	if cache is None:
+		cache = frappe.local.smart_pro_title_cache = {}
+	return cache.setdefault(doctype, {})
+
+
+def get_titles(doctype, names):
+	"""Get {name: title} for the given link values of a doctype
+
+	Only names not already resolved during this request hit the database, and
+	they are fetched together in a single query.
+	"""
+	title_field = TITLE_FIELDS[doctype]
+	cache = _get_title_cache(doctype)
+	names = {name for name in names if name}
+
+	missing = [name for name in names if name not in cache]
+	if missing:
+		for row in frappe.get_all(doctype, filters={"name": ["in", missing]}, fields=["name", title_field]):
+			cache[row.name] = row.get(title_field)
+		for name in missing:
+			cache.setdefault(name, None)
+
+	return {name: cache[name] for name in names}
+
+
+def enrich_titles(rows, link_field, doctype, target_field=None):
+	"""Set `target_field` on each row to the title of the record linked through `link_field`
+
+	Args:
+		rows: list of dicts, as returned by frappe.get_list
+		link_field: field on the rows holding the link value
+		doctype: doctype the link points to, one of TITLE_FIELDS
+		target_field: field to write the title to, defaults to "<link_field>_title"
+	"""
+	target_field = target_field or f"{link_field}_title"
+	titles = get_titles(doctype, (row.get(link_field) for row in rows))
+
+	for row in rows:
+		if row.get(link_field):
+			row[target_field] = titles.get(row[link_field])
+
+	return rows
@@ -0,0 +1,122 @@
+"""
+Streaming timesheet export for Smart Pro
+Rows are read in keyset chunks of (date, name) and written straight to a
+temporary file as CSV or write-only XLSX, which is then streamed back, so memory
+stays flat however many timesheets the period holds.
+"""
+
+import csv
+import io
+import tempfile
+
+import frappe
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+CHUNK_SIZE = 5000
+
+EXPORT_COLUMNS = [
+	("name", "Timesheet"),
+	("employee", "Employee"),
+	("employee_name", "Employee Name"),
+	("date", "Date"),
+	("project", "Project"),
+	("task", "Task"),
+	("task_title", "Task Title"),
+	("activity_type", "Activity Type"),
+	("hours_worked", "Hours"),
+	("status", "Status"),
+]
+
+FILE_FORMATS = {
+	"csv": "text/csv; charset=utf-8",
+	"xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def iter_timesheet_rows(from_date=None, to_date=None, project=None, status=None, employee=None):
+	"""Yield timesheet rows (as tuples in EXPORT_COLUMNS order) one keyset chunk at a time"""
+	conditions, values = [], {"limit": CHUNK_SIZE}
+	for fieldname, operator, value in (
+		("date", ">=", from_date),
+		("date", "<=", to_date),
+		("project", "=", project),
+		("status", "=", status),
+		("employee", "=", employee),
+	):
+		if value:
+			key = f"{fieldname}_{len(values)}"
+			conditions.append(f"`{fieldname}` {operator} %({key})s")
+			values[key] = value
+
+	columns = ", ".join(f"`{fieldname}`" for fieldname, label in EXPORT_COLUMNS)
+	date_index = [fieldname for fieldname, label in EXPORT_COLUMNS].index("date")
+	after = None
+
+	while True:
+		keyset = []
+		if after:
+			keyset = ["(`date` > %(after_date)s OR (`date` = %(after_date)s AND name > %(after_name)s))"]
+			values.update(after_date=after[0], after_name=after[1])
+
+		where = " AND ".join(conditions + keyset) or "1 = 1"
+		rows = frappe.db.sql(
+			f"""
+			SELECT {columns}
+			FROM `tabSmart Timesheet`
+			WHERE `date` IS NOT NULL AND {where}
+			ORDER BY `date`, name
+			LIMIT %(limit)s
+			""",
+			values,
+		)
+
+		yield from rows
+
+		if len(rows) < CHUNK_SIZE:
+			return
+		after = (rows[-1][date_index], rows[-1][0])
+
+
+def write_csv(rows, file):
+	text = io.TextIOWrapper(file, encoding="utf-8", newline="", write_through=True)
+	writer = csv.writer(text)
+	writer.writerow([label for fieldname, label in EXPORT_COLUMNS])
+	writer.writerows(rows)
+	text.detach()
+
+
+def write_xlsx(rows, file):
+	from openpyxl import Workbook
+
+	workbook = Workbook(write_only=True)
+	sheet = workbook.create_sheet("Timesheets")
+	sheet.append([label for fieldname, label in EXPORT_COLUMNS])
+	for row in rows:
+		sheet.append(row)
+	workbook.save(file)
+
+
+def export_timesheets(file_format="csv", **filters):
+	"""Build the export in a temporary file and return a response streaming it"""
+	if file_format not in FILE_FORMATS:
+		frappe.throw(frappe._("Unsupported export format: {0}").format(file_format))
+
+	file = tempfile.TemporaryFile()
+	try:
+		writer = write_xlsx if file_format == "xlsx" else write_csv
+		writer(iter_timesheet_rows(**filters), file)
+		file.seek(0)
+	except Exception:
+		file.close()
+		raise
+
+	filename = "timesheets-{}-{}.{}".format(
+		filters.get("from_date") or "start", filters.get("to_date") or "end", file_format
+	)
+	return Response(
+		wrap_file(frappe.local.request.environ, file),
+		mimetype=FILE_FORMATS[file_format],
+		headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+		direct_passthrough=True,
+	)
@@ -0,0 +1,90 @@
+"""
+Actual and approved hour totals of Smart Tasks and Smart Projects
+The totals are moved by timesheet deltas inside the writing transaction and
+recomputed by a daily reconciliation job. A change to the totals moves its
+doctype's data version so the list ETags pick it up, but leaves modified alone:
+open forms keep saving without a timestamp conflict and lists ordered by
+modified keep their order.
+"""
+
+import frappe
+from frappe.utils import flt
+
+from smart_pro.smart_pro.versions import bump_versions
+
+# Doctypes whose actual_hours / approved_hours total their timesheets -> linking timesheet field
+HOURS_TOTAL_FIELDS = {"Smart Task": "task", "Smart Project": "project"}
+
+
+def get_hours_deltas(changes):
+	"""{(doctype, name): [hours, approved_hours]} moved by a batch of (before, after) timesheet states
+
+	Either side may be None for an insert or a delete. Rejected timesheets count for nothing.
+	"""
+	deltas = {}
+	for before, after in changes:
+		for sign, timesheet in ((-1, before), (1, after)):
+			if not timesheet or timesheet.get("status") == "Rejected":
+				continue
+
+			hours = flt(timesheet.get("hours_worked")) * sign
+			approved_hours = hours if timesheet.get("status") == "Approved" else 0
+			for doctype, fieldname in HOURS_TOTAL_FIELDS.items():
+				if timesheet.get(fieldname):
+					totals = deltas.setdefault((doctype, timesheet.get(fieldname)), [0, 0])
+					totals[0] += hours
+					totals[1] += approved_hours
+
+	return {key: totals for key, totals in deltas.items() if any(totals)}
+
+
+def apply_hours_deltas(deltas):
+	"""Add the deltas to actual_hours / approved_hours within the caller's transaction"""
+	for (doctype, name), (hours, approved_hours) in sorted(deltas.items()):
+		frappe.db.sql(
+			f"""
+			UPDATE `tab{doctype}`
+			SET actual_hours = actual_hours + %s, approved_hours = approved_hours + %s
+			WHERE name = %s
+			""",
+			(hours, approved_hours, name),
+		)
+
+	bump_versions(*{doctype for doctype, name in deltas})
+
+
+def reconcile_actual_hours():
+	"""Scheduled job: recompute task and project hour totals, fixing drift from bulk writes"""
+	for doctype, fieldname in HOURS_TOTAL_FIELDS.items():
+		frappe.db.sql(
+			f"""
+			UPDATE `tab{doctype}` target
+			LEFT JOIN (
+				SELECT `{fieldname}` AS name,
+					SUM(hours_worked) AS hours,
+					SUM(IF(status = 'Approved', hours_worked, 0)) AS approved_hours
+				FROM `tabSmart Timesheet`
+				WHERE IFNULL(status, '') != 'Rejected' AND `{fieldname}` IS NOT NULL
+				GROUP BY `{fieldname}`
+			) totals ON totals.name = target.name
+			SET target.actual_hours = IFNULL(totals.hours, 0),
+				target.approved_hours = IFNULL(totals.approved_hours, 0)
+			WHERE target.actual_hours != IFNULL(totals.hours, 0)
+				OR target.approved_hours != IFNULL(totals.approved_hours, 0)
+			"""
+		)
+
+	bump_versions(*HOURS_TOTAL_FIELDS)
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def keep_hour_totals(doc, method=None):
+	"""validate of Smart Task / Smart Project: reload the totals so a save never writes back a stale copy"""
+	if doc.is_new():
+		return
+
+	totals = frappe.db.get_value(doc.doctype, doc.name, ["actual_hours", "approved_hours"], for_update=True)
+	if totals:
+		doc.actual_hours, doc.approved_hours = totals
@@ -0,0 +1,145 @@
+"""
+Per-employee interval indexes for Smart Pro
+Date ranges of an employee (date requests, assignments) are kept sorted by start
+date with a running maximum of the end dates and cached in that form in a Redis
+hash per kind, and memoized for the rest of the request once decoded, so an
+overlap query is a bisect plus a short walk over the hits instead of a scan.
+"""
+
+import json
+from bisect import bisect_right
+from itertools import accumulate
+
+import frappe
+
+CACHE_TTL = 24 * 60 * 60
+
+
+class IntervalIndex:
+	"""Closed [start, end] intervals of one employee, sorted by start
+
+	Each interval is a tuple (start, end, *payload) with ISO date strings, which
+	sort the same way as the dates they hold.
+	"""
+
+	def __init__(self, intervals):
+		self.intervals = sorted((tuple(interval) for interval in intervals), key=lambda interval: interval[0])
+		self.starts = [interval[0] for interval in self.intervals]
+		self.max_ends = list(accumulate((interval[1] for interval in self.intervals), max))
+
+	@classmethod
+	def from_json(cls, value):
+		"""Rebuild an index cached by to_json without sorting it again"""
+		data = json.loads(value)
+		if isinstance(data, list):
+			# Raw rows cached before indexes were stored built
+			return cls(data)
+
+		index = cls.__new__(cls)
+		index.intervals = [tuple(interval) for interval in data["intervals"]]
+		index.starts = [interval[0] for interval in index.intervals]
+		index.max_ends = data["max_ends"]
+		return index
+
+	def to_json(self):
+		return json.dumps({"intervals": self.intervals, "max_ends": self.max_ends}, default=str)
+
+	def __len__(self):
+		return len(self.intervals)
+
+	def overlapping(self, start, end):
+		"""Intervals sharing at least one day with [start, end], in start order
+
+		Bisects to the last interval starting on or before `end`, then walks back
+		while the running max end still reaches `start`: O(log n + k) unless long
+		intervals enclose many short ones.
+		"""
+		start, end = str(start), str(end)
+		hits = []
+		i = bisect_right(self.starts, end) - 1
+		while i >= 0 and self.max_ends[i] >= start:
+			if self.intervals[i][1] >= start:
+				hits.append(self.intervals[i])
+			i -= 1
+
+		hits.reverse()
+		return hits
+
+
+def _key(kind):
+	return frappe.cache().make_key(f"smart_pro:intervals:{kind}")
+
+
+def _get_local_indexes(kind):
+	cache = getattr(frappe.local, "smart_pro_interval_indexes", None)
+	if cache is None:
+		cache = frappe.local.smart_pro_interval_indexes = {}
+	return cache.setdefault(kind, {})
+
+
+def get_interval_indexes(kind, employees, load):
+	"""Get {employee: IntervalIndex} for the given employees with at most one Redis round trip
+
+	Args:
+		kind: name of the cached interval set, e.g. "date_requests"
+		employees: employee names
+		load: function(employees) -> {employee: [(start, end, *payload)]} used
+			for the employees not cached yet, in one call
+	"""
+	employees = list(dict.fromkeys(employee for employee in employees if employee))
+	local_indexes = _get_local_indexes(kind)
+	indexes = {employee: local_indexes[employee] for employee in employees if employee in local_indexes}
+	employees = [employee for employee in employees if employee not in indexes]
+	if not employees:
+		return indexes
+
+	cache = frappe.cache()
+	key = _key(kind)
+	missing = []
+	for employee, value in zip(employees, cache.hmget(key, employees), strict=True):
+		if value is None:
+			missing.append(employee)
+		else:
+			indexes[employee] = IntervalIndex.from_json(value)
+
+	if missing:
+		loaded = load(missing)
+		pipeline = cache.pipeline()
+		for employee in missing:
+			# Round trip through JSON so fresh and cached indexes both hold ISO date strings
+			index = IntervalIndex(json.loads(json.dumps(loaded.get(employee, []), default=str)))
+			indexes[employee] = index
+			pipeline.hset(key, employee, index.to_json())
+		pipeline.expire(key, CACHE_TTL)
+		pipeline.execute()
+
+	for employee in employees:
+		local_indexes[employee] = indexes[employee]
+	return indexes
+
+
+def get_interval_index(kind, employee, load):
+	return get_interval_indexes(kind, [employee], load).get(employee) or IntervalIndex([])
+
+
+def invalidate_interval_indexes(kind, *employees):
+	"""Drop the cached intervals of the employees now and again once the transaction commits
+
+	The second delete clears anything another request cached from the
+	pre-commit state in between.
+	"""
+	employees = [employee for employee in set(employees) if employee]
+	if not employees:
+		return
+
+	def delete():
+		local_indexes = _get_local_indexes(kind)
+		for employee in employees:
+			local_indexes.pop(employee, None)
+		# Through a pipeline, as the wrapper's hdel would prefix the key a second time
+		pipeline = frappe.cache().pipeline()
+		pipeline.hdel(_key(kind), *employees)
+		pipeline.execute()
+
+	delete()
+	frappe.db.after_commit.add(delete)
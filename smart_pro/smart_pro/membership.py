@@ -0,0 +1,135 @@
+"""
+User -> accessible projects membership index for Smart Pro
+Keeps, per user, the projects they reach through an active Employee Project
+Assignment or as project manager. Full-access users are not materialized here,
+they see every project through their AccessProfile.
+"""
+
+import frappe
+
+from smart_pro.smart_pro.access import get_access_profile
+
+MEMBERSHIP_KEY = "smart_pro:project_membership"
+
+SOURCE_ASSIGNMENT = "assignment"
+SOURCE_MANAGER = "manager"
+
+
+def get_project_membership(user=None):
+	"""Get {project: (sources, ...)} for a user, building the entry on a cache miss"""
+	if not user:
+		user = frappe.session.user
+
+	membership = frappe.cache().hget(MEMBERSHIP_KEY, user)
+	if membership is None:
+		membership = refresh_project_membership(user)
+	return membership
+
+
+def get_member_projects(user=None, source=None):
+	"""Get the project names a user can reach, optionally limited to one source"""
+	membership = get_project_membership(user)
+	if not source:
+		return list(membership)
+	return [project for project, sources in membership.items() if source in sources]
+
+
+def refresh_project_membership(user):
+	"""Rebuild a user's membership entry with one indexed query and store it
+
+	Inside a transaction that has already written, the query can see rows that
+	may still roll back, so the entry is returned without being cached. The
+	after-commit refresh queued by invalidate_project_membership caches it once
+	the writes are durable.
+	"""
+	employee = get_access_profile(user).employee
+
+	rows = frappe.db.sql(
+		"""
+		SELECT project, %(assignment)s AS source
+		FROM `tabEmployee Project Assignment`
+		WHERE employee = %(employee)s AND status = 'Active'
+		UNION ALL
+		SELECT name AS project, %(manager)s AS source
+		FROM `tabSmart Project`
+		WHERE project_manager = %(user)s
+		""",
+		{
+			"employee": employee or "",
+			"user": user,
+			"assignment": SOURCE_ASSIGNMENT,
+			"manager": SOURCE_MANAGER,
+		},
+	)
+
+	membership = {}
+	for project, source in rows:
+		if project:
+			membership.setdefault(project, set()).add(source)
+	membership = {project: tuple(sorted(sources)) for project, sources in membership.items()}
+
+	if not frappe.db.transaction_writes:
+		frappe.cache().hset(MEMBERSHIP_KEY, user, membership)
+	return membership
+
+
+def invalidate_project_membership(users):
+	"""Refresh membership for the given users once the current transaction commits"""
+	users = {user for user in users if user}
+	if not users:
+		return
+
+	def refresh():
+		for user in users:
+			frappe.cache().hdel(MEMBERSHIP_KEY, user)
+			refresh_project_membership(user)
+
+	frappe.db.after_commit.add(refresh)
+
+
+def _get_employee_users(employees):
+	employees = [employee for employee in employees if employee]
+	if not employees:
+		return []
+	return frappe.get_all("Employee", filters={"name": ["in", employees]}, pluck="user_id")
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def on_assignment_change(doc, method=None):
+	"""Employee Project Assignment on_update / on_trash"""
+	employees = {doc.employee}
+	previous = doc.get_doc_before_save()
+	if previous:
+		employees.add(previous.employee)
+	invalidate_project_membership(_get_employee_users(employees))
+
+
+def on_project_change(doc, method=None):
+	"""Smart Project on_update / on_trash"""
+	users = {doc.project_manager}
+	previous = doc.get_doc_before_save()
+	if previous:
+		if previous.project_manager == doc.project_manager and method == "on_update":
+			return
+		users.add(previous.project_manager)
+
+	if method == "on_trash":
+		assigned = frappe.get_all(
+			"Employee Project Assignment", filters={"project": doc.name}, pluck="employee"
+		)
+		users.update(_get_employee_users(set(assigned)))
+
+	invalidate_project_membership(users)
+
+
+def on_employee_change(doc, method=None):
+	"""Employee on_update / on_trash: the user link decides whose membership it is"""
+	users = {doc.user_id}
+	previous = doc.get_doc_before_save()
+	if previous:
+		if previous.user_id == doc.user_id and method == "on_update":
+			return
+		users.add(previous.user_id)
+	invalidate_project_membership(users)
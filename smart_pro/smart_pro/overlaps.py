@@ -0,0 +1,125 @@
+"""
+Overlap detection for Employee Date Requests
+Each employee's open requests are held in a cached IntervalIndex, so checking a
+new range or reporting the conflicts of a whole approval inbox needs no scan of
+the request table. Overlapping requests only conflict when they cannot both
+hold: a leave against any other request, or two requests about the same project.
+Requests auto-created for assignments are judged by their project like any other.
+"""
+
+import frappe
+
+from smart_pro.smart_pro.intervals import (
+	get_interval_index,
+	get_interval_indexes,
+	invalidate_interval_indexes,
+)
+
+INTERVAL_KIND = "date_requests"
+
+# Requests in these states no longer claim their dates
+CLOSED_STATUSES = ("Rejected", "Cancelled")
+
+# Requests taking the employee off work
+LEAVE_REQUEST_TYPES = ("Leave", "Time Off")
+
+# Payload stored after (from_date, to_date) in each interval
+PAYLOAD_FIELDS = ("name", "request_type", "status", "project")
+
+
+def _load_date_requests(employees):
+	"""{employee: [(from_date, to_date, name, request_type, status, project)]} of the open requests"""
+	intervals = {}
+	for row in frappe.get_all(
+		"Employee Date Request",
+		filters={
+			"employee": ["in", employees],
+			"status": ["not in", CLOSED_STATUSES],
+			"from_date": ["is", "set"],
+			"to_date": ["is", "set"],
+		},
+		fields=["employee", "from_date", "to_date", *PAYLOAD_FIELDS],
+		order_by="employee, from_date",
+	):
+		intervals.setdefault(row.employee, []).append(
+			(row.from_date, row.to_date, *(row.get(fieldname) for fieldname in PAYLOAD_FIELDS))
+		)
+	return intervals
+
+
+def _as_dict(interval):
+	return frappe._dict(zip(("from_date", "to_date", *PAYLOAD_FIELDS), interval, strict=True))
+
+
+def is_conflict(request_type, project, other):
+	"""Whether a request of `request_type` on `project` cannot hold together with an overlapping one
+
+	A leave rules out any other request on its days. Two work requests only
+	clash when they are about the same project.
+	"""
+	return (
+		request_type in LEAVE_REQUEST_TYPES
+		or other.request_type in LEAVE_REQUEST_TYPES
+		or bool(project and project == other.project)
+	)
+
+
+def find_overlaps(employee, from_date, to_date, exclude=None, request_type=None, project=None):
+	"""Open date requests of the employee sharing at least one day with [from_date, to_date]
+
+	Args:
+		exclude: name of a request to leave out, typically the one being checked
+		request_type: type of the request being checked; when given, only the
+			overlapping requests that conflict with it are returned
+		project: project of the request being checked
+	"""
+	if not (employee and from_date and to_date):
+		return []
+
+	index = get_interval_index(INTERVAL_KIND, employee, _load_date_requests)
+	overlaps = [
+		_as_dict(interval) for interval in index.overlapping(from_date, to_date) if interval[2] != exclude
+	]
+	if request_type:
+		overlaps = [overlap for overlap in overlaps if is_conflict(request_type, project, overlap)]
+	return overlaps
+
+
+def get_conflicts(requests):
+	"""Conflicting overlaps of many requests at once, loading every employee's index in one round trip
+
+	Args:
+		requests: dicts with name, employee, request_type, project, from_date and to_date
+
+	Returns:
+		{request name: [overlapping requests]} for the requests that have any
+	"""
+	indexes = get_interval_indexes(
+		INTERVAL_KIND, [request.get("employee") for request in requests], _load_date_requests
+	)
+
+	conflicts = {}
+	for request in requests:
+		index = indexes.get(request.get("employee"))
+		if not index or not (request.get("from_date") and request.get("to_date")):
+			continue
+
+		overlaps = [
+			overlap
+			for overlap in map(_as_dict, index.overlapping(request.get("from_date"), request.get("to_date")))
+			if overlap.name != request.get("name")
+			and is_conflict(request.get("request_type"), request.get("project"), overlap)
+		]
+		if overlaps:
+			conflicts[request.get("name")] = overlaps
+
+	return conflicts
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def on_change(doc, method=None):
+	"""on_update / on_trash of Employee Date Request: drop the cached intervals of its employee(s)"""
+	before = doc.get_doc_before_save() if method == "on_update" else None
+	invalidate_interval_indexes(INTERVAL_KIND, doc.employee, before and before.employee)
@@ -0,0 +1,135 @@
+"""
+Keyset (cursor) pagination for Smart Pro list endpoints
+Pages are ordered by (sort field, name) so a cursor stays stable while rows are
+inserted or updated between requests.
+"""
+
+import base64
+import json
+
+import frappe
+from frappe.utils import cint
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def is_paginated(after=None, limit=None):
+	"""Pagination is opt-in: the client asks for it by sending `after` or `limit`"""
+	return after is not None or limit is not None
+
+
+def encode_cursor(row, sort_field):
+	value = row.get(sort_field)
+	payload = json.dumps([str(value) if value is not None else None, row.get("name")])
+	return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+	try:
+		value, name = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+	except Exception:
+		frappe.throw(frappe._("Invalid pagination cursor"))
+	return value, name
+
+
+def normalize_filters(filters):
+	"""Turn a dict of filters into a list so more conditions on the same field can be added"""
+	if not filters:
+		return []
+	if isinstance(filters, dict):
+		normalized = []
+		for fieldname, value in filters.items():
+			if isinstance(value, (list, tuple)):
+				normalized.append([fieldname, value[0], value[1]])
+			else:
+				normalized.append([fieldname, "=", value])
+		return normalized
+	return list(filters)
+
+
+def get_page(
+	doctype, filters=None, fields=None, order_by="modified desc", after=None, limit=None, default_limit=None
+):
+	"""Fetch one page of a list query
+
+	Args:
+		order_by: "<field> asc|desc", the endpoint's existing sort key; name is used as tie breaker
+		after: cursor returned as `next_cursor` by the previous page, empty for the first page
+		limit: page size, capped at MAX_PAGE_SIZE
+		default_limit: row cap used when the client did not opt in to pagination
+
+	Returns:
+		(rows, next_cursor) - next_cursor is None on the last page or when not paginating
+	"""
+	if not is_paginated(after, limit):
+		rows = frappe.get_list(
+			doctype, filters=filters, fields=fields, order_by=order_by, limit=default_limit
+		)
+		return rows, None
+
+	sort_field, direction = [*order_by.split(), "asc"][:2]
+	direction = direction.lower()
+	limit = min(cint(limit) or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+
+	fields = list(fields or ["name"])
+	for fieldname in ("name", sort_field):
+		if fieldname not in fields:
+			fields.append(fieldname)
+
+	filters = normalize_filters(filters)
+	base_filters = list(filters)
+	or_filters = None
+	null_tail = False
+
+	if after:
+		value, name = decode_cursor(after)
+		# NULL sorts first ascending and last descending (MariaDB), so rows past a
+		# NULL cursor are either later NULLs by name or the non-NULL block, and a
+		# descending page past a non-NULL cursor runs on into the NULL block.
+		if direction == "asc":
+			if value is None:
+				or_filters = [[sort_field, "is", "set"], ["name", ">", name]]
+			else:
+				filters.append([sort_field, ">=", value])
+				or_filters = [[sort_field, ">", value], ["name", ">", name]]
+		else:
+			if value is None:
+				filters.extend([[sort_field, "is", "not set"], ["name", "<", name]])
+			else:
+				filters.append([sort_field, "<=", value])
+				or_filters = [[sort_field, "<", value], ["name", "<", name]]
+				null_tail = True
+
+	rows = frappe.get_list(
+		doctype,
+		filters=filters,
+		or_filters=or_filters,
+		fields=fields,
+		order_by=f"{sort_field} {direction}, name {direction}",
+		limit=limit + 1,
+	)
+
+	if null_tail and len(rows) <= limit:
+		# The cursor predicate cannot also match NULLs, so fetch them separately
+		rows += frappe.get_list(
+			doctype,
+			filters=[*base_filters, [sort_field, "is", "not set"]],
+			fields=fields,
+			order_by=f"name {direction}",
+			limit=limit + 1 - len(rows),
+		)
+
+	next_cursor = None
+	if len(rows) > limit:
+		rows = rows[:limit]
+		next_cursor = encode_cursor(rows[-1], sort_field)
+
+	return rows, next_cursor
+
+
+def page_response(rows, next_cursor, after=None, limit=None):
+	"""Keep the legacy list response unless the client opted in to pagination"""
+	if not is_paginated(after, limit):
+		return rows
+	return {"data": rows, "next_cursor": next_cursor}
@@ -0,0 +1,342 @@
+"""
+Delta sync for the Smart Pro PWA
+Returns the rows a user can see that changed after a watermark, plus tombstones
+for rows that were deleted or fell out of the user's visibility, so the app can
+patch its local lists instead of reloading them.
+"""
+
+import base64
+import json
+
+import frappe
+from frappe.utils import add_days, add_to_date, get_datetime, now_datetime
+
+from smart_pro.smart_pro.access import get_access_profile, get_access_version
+from smart_pro.smart_pro.membership import SOURCE_ASSIGNMENT, get_member_projects
+
+SYNC_LOG = "Smart Pro Sync Log"
+
+ACTION_DELETED = "Deleted"
+ACTION_REVOKED = "Access Revoked"
+ACTION_GRANTED = "Access Granted"
+
+# Fields returned for each synced doctype, matching the PWA list endpoints
+SYNC_FIELDS = {
+	"Smart Project": [
+		"name",
+		"title",
+		"status",
+		"start_date",
+		"end_date",
+		"budget_amount",
+		"project_manager",
+		"modified",
+	],
+	"Smart Task": [
+		"name",
+		"title",
+		"project",
+		"project_status",
+		"status",
+		"priority",
+		"due_date",
+		"progress",
+		"assigned_to",
+		"project_scope",
+		"modified",
+	],
+	"Smart Timesheet": [
+		"name",
+		"date",
+		"project",
+		"project_status",
+		"task",
+		"task_title",
+		"activity_type",
+		"hours_worked",
+		"description",
+		"status",
+		"modified",
+	],
+	"Employee Date Request": [
+		"name",
+		"request_type",
+		"project",
+		"project_title",
+		"project_status",
+		"from_date",
+		"to_date",
+		"total_days",
+		"status",
+		"reason",
+		"approver",
+		"comments",
+		"auto_create_tasks",
+		"project_scope",
+		"assignment",
+		"modified",
+	],
+	"Smart Pro Notification": ["name", "title", "body", "data", "status", "created_at", "modified"],
+}
+
+# Doctype -> (field on the doctype, column on the sync log) a user's visibility is checked against
+SCOPE_FIELDS = {
+	"Smart Project": ("name", "project"),
+	"Smart Task": ("project", "project"),
+	"Smart Timesheet": ("employee", "employee"),
+	"Employee Date Request": ("employee", "employee"),
+	"Smart Pro Notification": ("user", "user"),
+}
+
+# Doctypes whose visibility follows the user's assigned projects
+PROJECT_SCOPED = ("Smart Project", "Smart Task")
+
+# Watermarks older than this fall outside the sync log and force a full reload
+RETENTION_DAYS = 30
+# Re-read a short window before the watermark to catch transactions that committed late
+OVERLAP_SECONDS = 10
+# More changes than this per doctype and a full reload is cheaper
+MAX_CHANGES = 500
+
+
+def _encode_watermark(timestamp, access_version):
+	payload = json.dumps([str(timestamp), access_version])
+	return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_watermark(watermark):
+	try:
+		timestamp, access_version = json.loads(base64.urlsafe_b64decode(watermark.encode()).decode())
+		return get_datetime(timestamp), access_version
+	except Exception:
+		return None, None
+
+
+def _get_scope(doctype, profile):
+	"""Values of the doctype's scope field visible to the user, None when unrestricted"""
+	if doctype == "Smart Project" and profile.can_view_all_projects:
+		return None
+	if doctype == "Smart Task" and profile.can_view_all_tasks:
+		return None
+	if doctype in PROJECT_SCOPED:
+		return get_member_projects(profile.user, SOURCE_ASSIGNMENT)
+	if doctype == "Smart Pro Notification":
+		return [profile.user]
+	return [profile.employee] if profile.employee else []
+
+
+def get_changes(since=None, doctypes=None, user=None):
+	"""Get what changed for a user after a watermark
+
+	Args:
+		since: watermark returned by the previous call, empty for the first sync
+		doctypes: doctypes to sync, defaults to all of SYNC_FIELDS
+		user: defaults to the session user
+
+	Returns:
+		{"reset", "watermark", "changes": {doctype: [rows]}, "tombstones": {doctype: [names]}}
+		When reset is set the client must reload its lists and keep only the new
+		watermark. Otherwise tombstones are applied before changes.
+	"""
+	user = user or frappe.session.user
+	doctypes = doctypes or list(SYNC_FIELDS)
+	for doctype in doctypes:
+		if doctype not in SYNC_FIELDS:
+			frappe.throw(frappe._("{0} cannot be synced").format(doctype))
+
+	profile = get_access_profile(user)
+	now = now_datetime()
+	access_version = get_access_version()
+	response = {
+		"reset": True,
+		"watermark": _encode_watermark(now, access_version),
+		"changes": {},
+		"tombstones": {},
+	}
+
+	since, since_version = _decode_watermark(since) if since else (None, None)
+	# Role, settings and employee link changes move the access version and can
+	# widen or narrow visibility in ways the log does not record
+	if not since or since_version != access_version or since < add_days(now, -RETENTION_DAYS):
+		return response
+
+	since = add_to_date(since, seconds=-OVERLAP_SECONDS)
+	scopes = {doctype: _get_scope(doctype, profile) for doctype in doctypes}
+	granted, revoked = _get_access_changes(user, since)
+
+	changes, tombstones = {}, {}
+	for doctype in doctypes:
+		rows = _get_changed_rows(doctype, scopes[doctype], since, granted)
+		if len(rows) > MAX_CHANGES:
+			return response
+		changes[doctype] = rows
+		tombstones[doctype] = []
+
+	for doctype, name in _get_deleted(scopes, since):
+		tombstones[doctype].append(name)
+
+	if revoked:
+		if "Smart Project" in doctypes and scopes["Smart Project"] is not None:
+			tombstones["Smart Project"].extend(revoked)
+		if "Smart Task" in doctypes and scopes["Smart Task"] is not None:
+			tombstones["Smart Task"].extend(
+				frappe.get_all("Smart Task", filters={"project": ["in", revoked]}, pluck="name")
+			)
+
+	response.update(reset=False, changes=changes, tombstones=tombstones)
+	return response
+
+
+def _get_changed_rows(doctype, scope, since, granted):
+	"""Rows modified after `since`, plus every row of projects the user was granted since"""
+	if scope is not None and not scope:
+		return []
+
+	field = SCOPE_FIELDS[doctype][0]
+	filters = [[field, "in", scope]] if scope is not None else []
+	or_filters = [["modified", ">", since]]
+	# Rows of a newly granted project are new to the client even if they did not change
+	if granted and scope is not None and doctype in PROJECT_SCOPED:
+		or_filters.append([field, "in", granted])
+
+	return frappe.get_list(
+		doctype,
+		filters=filters,
+		or_filters=or_filters,
+		fields=SYNC_FIELDS[doctype],
+		order_by="modified asc",
+		limit=MAX_CHANGES + 1,
+	)
+
+
+def _get_deleted(scopes, since):
+	"""(doctype, name) of the rows deleted after `since` within the user's visibility"""
+	conditions, values = [], {"since": since, "action": ACTION_DELETED}
+	for i, (doctype, scope) in enumerate(scopes.items()):
+		if scope is not None and not scope:
+			continue
+		values[f"doctype_{i}"] = doctype
+		condition = f"reference_doctype = %(doctype_{i})s"
+		if scope is not None:
+			values[f"scope_{i}"] = tuple(scope)
+			condition += f" AND `{SCOPE_FIELDS[doctype][1]}` IN %(scope_{i})s"
+		conditions.append(f"({condition})")
+
+	if not conditions:
+		return []
+
+	return frappe.db.sql(
+		f"""
+		SELECT reference_doctype, reference_name
+		FROM `tab{SYNC_LOG}`
+		WHERE creation > %(since)s AND action = %(action)s AND ({" OR ".join(conditions)})
+		""",
+		values,
+	)
+
+
+def _get_access_changes(user, since):
+	"""Projects granted to and revoked from the user after `since`; the latest entry wins"""
+	rows = frappe.get_all(
+		SYNC_LOG,
+		filters={
+			"user": user,
+			"creation": [">", since],
+			"action": ["in", [ACTION_GRANTED, ACTION_REVOKED]],
+		},
+		fields=["reference_name", "action"],
+		order_by="creation asc",
+	)
+
+	latest = {row.reference_name: row.action for row in rows}
+	granted = [project for project, action in latest.items() if action == ACTION_GRANTED]
+	revoked = [project for project, action in latest.items() if action == ACTION_REVOKED]
+	return granted, revoked
+
+
+def log_sync_event(reference_doctype, reference_name, action, user=None, employee=None, project=None):
+	frappe.get_doc(
+		{
+			"doctype": SYNC_LOG,
+			"reference_doctype": reference_doctype,
+			"reference_name": reference_name,
+			"action": action,
+			"user": user,
+			"employee": employee,
+			"project": project,
+		}
+	).insert(ignore_permissions=True, ignore_links=True)
+
+
+def _log_deleted(doc, scope_value):
+	column = SCOPE_FIELDS[doc.doctype][1]
+	log_sync_event(doc.doctype, doc.name, ACTION_DELETED, **{column: scope_value})
+
+
+def purge_sync_log():
+	"""Scheduled job: drop entries older than any watermark that is still honoured"""
+	frappe.db.delete(SYNC_LOG, {"creation": ["<", add_days(now_datetime(), -RETENTION_DAYS)]})
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def on_trash(doc, method=None):
+	_log_deleted(doc, doc.get(SCOPE_FIELDS[doc.doctype][0]))
+
+
+def on_update(doc, method=None):
+	"""A row that moves to another project, employee or user disappears from the old scope"""
+	previous = doc.get_doc_before_save()
+	field = SCOPE_FIELDS[doc.doctype][0]
+	if previous and previous.get(field) and previous.get(field) != doc.get(field):
+		_log_deleted(doc, previous.get(field))
+
+
+def on_assignment_change(doc, method=None):
+	"""Employee Project Assignment on_update / on_trash: log projects gained or lost by each user
+
+	The before and after project sets are built from the other active assignments
+	plus this row's saved and new state, so the result does not depend on the
+	membership cache or on the order the assignment hooks run in.
+	"""
+	# A trashed row was active up to now, so it is its own before state
+	previous = doc if method == "on_trash" else doc.get_doc_before_save()
+	employees = {doc.employee, previous and previous.employee} - {None, ""}
+	if not employees:
+		return
+
+	users = dict(
+		frappe.get_all(
+			"Employee",
+			filters={"name": ["in", list(employees)], "user_id": ["is", "set"]},
+			fields=["name", "user_id"],
+			as_list=True,
+		)
+	)
+	for employee, user in users.items():
+		others = set(
+			frappe.db.sql_list(
+				"""
+			SELECT DISTINCT project
+			FROM `tabEmployee Project Assignment`
+			WHERE employee = %s AND status = 'Active' AND name != %s
+			""",
+				(employee, doc.name),
+			)
+		)
+
+		before, after = set(others), set(others)
+		if previous and previous.employee == employee and previous.status == "Active":
+			before.add(previous.project)
+		if method != "on_trash" and doc.employee == employee and doc.status == "Active":
+			after.add(doc.project)
+
+		for project in before - after:
+			log_sync_event(
+				"Smart Project", project, ACTION_REVOKED, user=user, employee=employee, project=project
+			)
+		for project in after - before:
+			log_sync_event(
+				"Smart Project", project, ACTION_GRANTED, user=user, employee=employee, project=project
+			)
@@ -2,7 +2,9 @@
 # For license information, please see license.txt
 
 import frappe
-from frappe.utils import today, add_days, getdate, formatdate
+from frappe.utils import add_days, formatdate, getdate, today
+
+from smart_pro.smart_pro.enrichment import get_titles
 
 
 def get_settings():
@@ -40,7 +42,6 @@ def send_project_end_date_reminders():
 		filters={
 			"status": ["in", ["Planning", "Active", "On Hold"]],
 			"end_date": ["<=", reminder_date],
-			"end_date": ["is", "set"],
 			"project_manager": ["is", "set"]
 		},
 		fields=["name", "title", "end_date", "project_manager", "status"]
@@ -122,7 +123,7 @@ def send_project_end_date_reminders():
 			frappe.logger().info(f"Smart Pro: Sent project end date reminder for {project.name} to {project.project_manager}")
 
 		except Exception as e:
-			frappe.logger().error(f"Smart Pro: Error sending project reminder for {project.name}: {str(e)}")
+			frappe.logger().error(f"Smart Pro: Error sending project reminder for {project.name}: {e!s}")
 
 
 def send_task_due_date_reminders():
@@ -146,7 +147,6 @@ def send_task_due_date_reminders():
 		filters={
 			"status": ["in", ["Open", "Working", "Pending Review"]],
 			"due_date": ["<=", reminder_date],
-			"due_date": ["is", "set"],
 			"assigned_to": ["is", "set"]
 		},
 		fields=["name", "title", "due_date", "assigned_to", "status", "priority", "project"]
@@ -156,6 +156,9 @@ def send_task_due_date_reminders():
 		frappe.logger().info("Smart Pro: No tasks approaching due date")
 		return
 
+	# Resolve all project titles in one query
+	project_titles = get_titles("Smart Project", (task.project for task in tasks))
+
 	for task in tasks:
 		due_date = getdate(task.due_date)
 		days_remaining = (due_date - today_date).days
@@ -188,8 +191,7 @@ def send_task_due_date_reminders():
 		# Get project title if available
 		project_title = ""
 		if task.project:
-			project_doc = frappe.db.get_value("Smart Project", task.project, "title")
-			project_title = project_doc or task.project
+			project_title = project_titles.get(task.project) or task.project
 
 		# Send email to assigned employee
 		try:
@@ -239,7 +241,7 @@ def send_task_due_date_reminders():
 			frappe.logger().info(f"Smart Pro: Sent task due date reminder for {task.name} to {task.assigned_to}")
 
 		except Exception as e:
-			frappe.logger().error(f"Smart Pro: Error sending task reminder for {task.name}: {str(e)}")
+			frappe.logger().error(f"Smart Pro: Error sending task reminder for {task.name}: {e!s}")
 
 
 def send_weekly_project_report():
@@ -265,6 +267,7 @@ def send_weekly_project_report():
 		return
 
 	today_date = getdate(today())
+	manager_names = get_titles("User", (pm.project_manager for pm in project_managers))
 
 	for pm in project_managers:
 		manager_email = pm.project_manager
@@ -332,7 +335,7 @@ def send_weekly_project_report():
 			"""
 
 		# Get manager name
-		manager_name = frappe.db.get_value("User", manager_email, "full_name") or manager_email
+		manager_name = manager_names.get(manager_email) or manager_email
 
 		try:
 			subject = f"Smart Pro Weekly Project Report - {formatdate(today())}"
@@ -386,7 +389,7 @@ def send_weekly_project_report():
 			frappe.logger().info(f"Smart Pro: Sent weekly report to {manager_email}")
 
 		except Exception as e:
-			frappe.logger().error(f"Smart Pro: Error sending weekly report to {manager_email}: {str(e)}")
+			frappe.logger().error(f"Smart Pro: Error sending weekly report to {manager_email}: {e!s}")
 
 
 def daily():
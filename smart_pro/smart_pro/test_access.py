@@ -0,0 +1,46 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from smart_pro.smart_pro.access import (
+	ACCESS_PROFILE_KEY,
+	bump_access_version,
+	get_access_profile,
+	get_access_version,
+)
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+)
+
+TEST_USER = "access-test-user@example.com"
+
+
+class TestAccessProfile(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		frappe.cache().hdel(ACCESS_PROFILE_KEY, TEST_USER)
+
+	def test_version_moves_only_after_commit(self):
+		version = get_access_version()
+		queued = len(frappe.db.after_commit._functions)
+
+		bump_access_version()
+
+		self.assertEqual(get_access_version(), version)
+		self.assertEqual(len(frappe.db.after_commit._functions), queued + 1)
+
+		frappe.db.after_commit._functions.pop()()
+		self.assertNotEqual(get_access_version(), version)
+
+	def test_profile_resolved_inside_write_transaction_is_not_cached(self):
+		frappe.get_doc("User", TEST_USER).add_roles("Employee")
+
+		profile = get_access_profile(TEST_USER)
+
+		# The uncommitted role is visible to this transaction only
+		self.assertTrue(profile.has_role("Employee"))
+		self.assertEqual(profile.employee, self.employee)
+		self.assertIsNone(frappe.cache().hget(ACCESS_PROFILE_KEY, TEST_USER))
@@ -0,0 +1,129 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from smart_pro.smart_pro.allocation import (
+	INTERVAL_KIND,
+	OPEN_END,
+	_load_assignments,
+	get_peak_allocation,
+	invalidate_assignments,
+)
+from smart_pro.smart_pro.api.projects import get_overallocated_employees
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_assignment,
+	make_employee,
+	make_project,
+)
+from smart_pro.smart_pro.intervals import get_interval_index
+
+TEST_USER = "allocation-test-user@example.com"
+
+
+class TestPeakAllocation(FrappeTestCase):
+	def test_ranges_touching_on_one_day_add_up(self):
+		self.assertEqual(
+			get_peak_allocation([("2026-01-01", "2026-01-05", 60), ("2026-01-05", "2026-01-10", 60)]),
+			(120, "2026-01-05"),
+		)
+
+	def test_back_to_back_ranges_do_not_add_up(self):
+		self.assertEqual(
+			get_peak_allocation([("2026-01-01", "2026-01-04", 60), ("2026-01-05", "2026-01-10", 60)]),
+			(60, "2026-01-01"),
+		)
+
+	def test_open_ended_ranges_overlap_everything_after_their_start(self):
+		self.assertEqual(
+			get_peak_allocation(
+				[("2026-01-01", OPEN_END, 50), ("2030-06-01", "2030-06-02", 30), ("2026-02-01", OPEN_END, 30)]
+			),
+			(110, "2030-06-01"),
+		)
+
+	def test_no_ranges(self):
+		self.assertEqual(get_peak_allocation([]), (0, None))
+
+
+class TestAssignmentAllocation(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+
+	def tearDown(self):
+		# Every test reads all of the employee's assignments, so drop the previous test's
+		frappe.db.rollback()
+		invalidate_assignments(self.employee)
+		frappe.set_user("Administrator")
+
+	def test_overallocation_is_rejected_with_the_day_and_projects(self):
+		project = make_project()
+		make_assignment(
+			self.employee, project, start_date="2026-01-01", end_date="2026-01-31", allocation_percentage=80
+		)
+
+		with self.assertRaises(frappe.ValidationError) as raised:
+			make_assignment(self.employee, make_project(), start_date="2026-01-31", allocation_percentage=30)
+
+		self.assertIn("would be allocated 110% on 2026-01-31", str(raised.exception))
+		self.assertIn(project, str(raised.exception))
+
+	def test_ranges_are_clipped_to_the_assignment(self):
+		make_assignment(
+			self.employee,
+			make_project(),
+			start_date="2026-01-01",
+			end_date="2026-01-31",
+			allocation_percentage=80,
+		)
+
+		# Shares no day with the January assignment
+		make_assignment(self.employee, make_project(), start_date="2026-02-01", allocation_percentage=30)
+
+	def test_zero_allocation_books_nothing(self):
+		make_assignment(self.employee, make_project(), start_date="2026-01-01", allocation_percentage=100)
+		make_assignment(self.employee, make_project(), start_date="2026-01-01", allocation_percentage=0)
+
+	def test_approved_date_change_drops_the_cached_assignments(self):
+		assignment = make_assignment(
+			self.employee,
+			make_project(),
+			start_date="2026-01-01",
+			end_date="2026-01-31",
+			allocation_percentage=80,
+		)
+		request = frappe.get_doc("Employee Date Request", {"assignment": assignment.name})
+		request.from_date, request.to_date = "2026-03-01", "2026-03-31"
+		get_interval_index(INTERVAL_KIND, self.employee, _load_assignments)
+
+		request.update_assignment_dates()
+
+		# Validated against the moved dates, not the cached January range
+		make_assignment(
+			self.employee,
+			make_project(),
+			start_date="2026-01-10",
+			end_date="2026-01-20",
+			allocation_percentage=50,
+		)
+
+	def test_overallocated_employees_report(self):
+		project = make_project()
+		assignment = make_assignment(
+			self.employee, project, start_date="2026-01-01", end_date="2026-01-31", allocation_percentage=60
+		)
+		make_assignment(self.employee, make_project(), start_date="2026-01-20", allocation_percentage=40)
+		# Past the save-time check, as assignments edited outside the form could be
+		frappe.db.set_value("Employee Project Assignment", assignment.name, "allocation_percentage", 90)
+
+		report = {row["employee"]: row for row in get_overallocated_employees()}
+
+		self.assertEqual(report[self.employee]["peak_allocation"], 130)
+		self.assertEqual(report[self.employee]["peak_date"], "2026-01-20")
+		self.assertIn(project, report[self.employee]["projects"])
+
+		frappe.get_doc("User", TEST_USER).add_roles("Employee")
+		frappe.set_user(TEST_USER)
+		self.assertRaises(frappe.PermissionError, get_overallocated_employees)
@@ -0,0 +1,127 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+import numpy as np
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from smart_pro.smart_pro.api.projects import get_team_capacity
+from smart_pro.smart_pro.capacity import (
+	MAX_CAPACITY_DAYS,
+	_range_matrix,
+	get_allocation_percentage,
+	get_capacity,
+)
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_assignment,
+	make_employee,
+	make_project,
+)
+from smart_pro.smart_pro.membership import MEMBERSHIP_KEY
+
+TEST_USER = "capacity-test-user@example.com"
+
+# Monday 5 January to Sunday 11 January 2026
+MONDAY, SUNDAY = "2026-01-05", "2026-01-11"
+
+
+class TestRangeMatrix(FrappeTestCase):
+	def test_ranges_are_clipped_to_the_timeline(self):
+		rows = [
+			frappe._dict(employee="A", start="2026-01-01", end="2026-01-06"),
+			frappe._dict(employee="A", start="2026-01-10", end="2026-02-01"),
+			frappe._dict(employee="B", start="2026-01-07", end=None),
+			frappe._dict(employee="B", start="2025-12-01", end="2025-12-31"),
+		]
+
+		matrix = _range_matrix(
+			rows, "start", "end", {"A": 0, "B": 1}, np.array([10.0, 20.0, 30.0, 40.0]), getdate(MONDAY), 7
+		)
+
+		self.assertEqual(matrix[:, 0].tolist(), [10, 10, 0, 0, 0, 20, 20])
+		self.assertEqual(matrix[:, 1].tolist(), [0, 0, 30, 30, 30, 30, 30])
+
+	def test_empty_allocation_defaults_to_full_but_zero_stays_zero(self):
+		self.assertEqual(get_allocation_percentage(None), 100)
+		self.assertEqual(get_allocation_percentage(""), 100)
+		self.assertEqual(get_allocation_percentage(0), 0)
+		self.assertEqual(get_allocation_percentage("25"), 25)
+
+
+class TestCapacity(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		frappe.db.set_value("Employee", self.employee, "holiday_list", None)
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+
+	def make_leave(self, request_type, date):
+		request = frappe.get_doc(
+			{
+				"doctype": "Employee Date Request",
+				"employee": self.employee,
+				"request_type": request_type,
+				"from_date": date,
+				"to_date": date,
+				"reason": "Capacity test",
+			}
+		).insert(ignore_permissions=True)
+		frappe.db.set_value("Employee Date Request", request.name, "status", "Approved")
+
+	def test_timeline_sums_assignments_and_masks_leave(self):
+		make_assignment(
+			self.employee,
+			make_project(),
+			start_date="2026-01-01",
+			end_date="2026-01-06",
+			allocation_percentage=60,
+		)
+		open_ended = make_assignment(
+			self.employee, make_project(), start_date="2026-01-06", allocation_percentage=40
+		)
+		unallocated = make_assignment(
+			self.employee, make_project(), start_date="2026-01-07", allocation_percentage=10
+		)
+		# Past the save-time check, as assignments edited outside the form could be
+		frappe.db.set_value("Employee Project Assignment", open_ended.name, "allocation_percentage", 70)
+		frappe.db.set_value("Employee Project Assignment", unallocated.name, "allocation_percentage", 0)
+		self.make_leave("Leave", "2026-01-08")
+		self.make_leave("Time Off", "2026-01-09")
+
+		capacity = get_capacity([self.employee], MONDAY, SUNDAY)
+
+		self.assertEqual([row[0] for row in capacity["allocation"]], [60, 130, 70, 70, 70, 70, 70])
+		self.assertEqual(
+			[row[0] for row in capacity["available"]], [True, True, True, False, False, False, False]
+		)
+		self.assertEqual([row[0] for row in capacity["over_allocated"]], [False, True] + [False] * 5)
+		self.assertEqual(capacity["utilization"][:3], [0.6, 1.3, 0.7])
+		self.assertEqual(capacity["over_allocated_employees"], [self.employee])
+
+	def test_range_is_limited(self):
+		self.assertRaises(frappe.ValidationError, get_capacity, [self.employee], SUNDAY, MONDAY)
+		self.assertRaises(
+			frappe.ValidationError, get_capacity, [self.employee], MONDAY, add_days(MONDAY, MAX_CAPACITY_DAYS)
+		)
+		self.assertEqual(len(get_capacity([], MONDAY, add_days(MONDAY, MAX_CAPACITY_DAYS - 1))["days"]), 731)
+
+	def test_team_capacity_is_limited_to_managed_projects(self):
+		project = make_project()
+		make_assignment(self.employee, project, allocation_percentage=10)
+		frappe.get_doc("User", TEST_USER).add_roles("Employee")
+		frappe.cache().hdel(MEMBERSHIP_KEY, TEST_USER)
+
+		frappe.set_user(TEST_USER)
+		self.assertRaises(frappe.PermissionError, get_team_capacity, project, MONDAY, SUNDAY)
+		self.assertEqual(get_team_capacity(None, MONDAY, SUNDAY)["employees"], [])
+
+		frappe.set_user("Administrator")
+		frappe.db.set_value("Smart Project", project, "project_manager", TEST_USER)
+		frappe.cache().hdel(MEMBERSHIP_KEY, TEST_USER)
+
+		frappe.set_user(TEST_USER)
+		employees = get_team_capacity(project, MONDAY, SUNDAY)["employees"]
+		self.assertEqual([row["employee"] for row in employees], [self.employee])
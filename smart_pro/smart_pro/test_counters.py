@@ -0,0 +1,68 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from smart_pro.smart_pro.counters import TOTAL, get_status_counts, invalidate_counts, reconcile_counts
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_project,
+)
+
+
+class TestStatusCounters(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		reconcile_counts("Smart Project")
+
+	def tearDown(self):
+		frappe.db.rollback()
+		invalidate_counts("Smart Project")
+
+	def counts(self):
+		return get_status_counts(["Smart Project"])["Smart Project"]
+
+	def commit_callbacks(self, queued):
+		"""Run what a commit would, without committing the test's rows"""
+		functions = frappe.db.after_commit._functions
+		for callback in reversed([functions.pop() for _ in range(len(functions) - queued)]):
+			callback()
+
+	def test_counts_move_after_commit(self):
+		before = self.counts()
+		queued = len(frappe.db.after_commit._functions)
+
+		project = make_project()
+		self.assertEqual(self.counts(), before)
+
+		self.commit_callbacks(queued)
+		after = self.counts()
+		self.assertEqual(after[TOTAL], before[TOTAL] + 1)
+		self.assertEqual(after["Active"], before["Active"] + 1)
+
+		queued = len(frappe.db.after_commit._functions)
+		doc = frappe.get_doc("Smart Project", project)
+		doc.status = "On Hold"
+		doc.save(ignore_permissions=True)
+		self.commit_callbacks(queued)
+
+		after = self.counts()
+		self.assertEqual(after[TOTAL], before[TOTAL] + 1)
+		self.assertEqual(after["Active"], before["Active"])
+		self.assertEqual(after["On Hold"], before["On Hold"] + 1)
+
+	def test_rolled_back_rows_are_not_counted(self):
+		before = self.counts()
+
+		make_project()
+		frappe.db.rollback()
+
+		self.assertFalse(frappe.db.after_commit._functions)
+		self.assertEqual(self.counts(), before)
+
+	def test_missing_counters_are_rebuilt(self):
+		expected = self.counts()
+		invalidate_counts("Smart Project")
+
+		self.assertEqual(self.counts(), expected)
+		self.assertEqual(expected[TOTAL], frappe.db.count("Smart Project"))
@@ -0,0 +1,49 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from smart_pro.smart_pro.api.projects import get_all_tasks, get_all_timesheets, get_team_tasks
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+)
+from smart_pro.smart_pro.encoding import FORMAT_COLUMNAR, FORMAT_DICTIONARY, encode_rows
+
+TEST_USER = "encoding-test-user@example.com"
+
+ROWS = [
+	{"name": "A", "status": "Open", "hours": 1},
+	{"name": "B", "status": "Closed", "hours": 2},
+	{"name": "C", "status": "Open", "hours": 3},
+]
+
+
+class TestEncoding(FrappeTestCase):
+	def tearDown(self):
+		frappe.set_user("Administrator")
+
+	def test_rows_are_unchanged_without_format(self):
+		self.assertIs(encode_rows(ROWS), ROWS)
+
+	def test_columnar(self):
+		encoded = encode_rows(ROWS, FORMAT_COLUMNAR)
+		self.assertEqual(encoded["columns"], ["name", "status", "hours"])
+		self.assertEqual(encoded["rows"][1], ["B", "Closed", 2])
+
+	def test_dictionary(self):
+		encoded = encode_rows(ROWS, FORMAT_DICTIONARY)
+		self.assertEqual(encoded["dictionaries"], {"status": ["Open", "Closed"]})
+		self.assertEqual([row[1] for row in encoded["rows"]], [0, 1, 0])
+
+	def test_invalid_format_raises_from_endpoints(self):
+		frappe.set_user("Administrator")
+		for endpoint in (get_team_tasks, get_all_tasks, get_all_timesheets):
+			self.assertRaises(frappe.ValidationError, endpoint, format="protobuf")
+
+	def test_no_access_response_keeps_the_requested_shape(self):
+		make_employee(TEST_USER)
+		frappe.set_user(TEST_USER)
+
+		self.assertEqual(get_all_timesheets(format=FORMAT_COLUMNAR), {"columns": [], "rows": []})
+		self.assertEqual(get_all_timesheets(), [])
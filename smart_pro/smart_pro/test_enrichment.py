@@ -0,0 +1,59 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_project,
+)
+from smart_pro.smart_pro.enrichment import enrich_titles, get_titles
+
+
+class TestTitleEnrichment(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		frappe.local.smart_pro_title_cache = {}
+		self.projects = [make_project(), make_project()]
+
+	def title(self, project):
+		return frappe.db.get_value("Smart Project", project, "title")
+
+	def test_missing_titles_are_fetched_in_one_query(self):
+		with patch.object(frappe, "get_all", wraps=frappe.get_all) as get_all:
+			titles = get_titles("Smart Project", [*self.projects, "missing-project", None])
+
+		self.assertEqual(get_all.call_count, 1)
+		self.assertEqual(
+			titles,
+			{
+				self.projects[0]: self.title(self.projects[0]),
+				self.projects[1]: self.title(self.projects[1]),
+				"missing-project": None,
+			},
+		)
+
+	def test_resolved_titles_are_served_from_the_request_cache(self):
+		get_titles("Smart Project", [self.projects[0], "missing-project"])
+
+		with patch.object(frappe, "get_all", wraps=frappe.get_all) as get_all:
+			titles = get_titles("Smart Project", [self.projects[0], "missing-project"])
+			self.assertEqual(get_all.call_count, 0)
+
+			get_titles("Smart Project", self.projects)
+			# Only the unseen project is looked up
+			self.assertEqual(get_all.call_args.kwargs["filters"], {"name": ["in", [self.projects[1]]]})
+
+		self.assertEqual(titles[self.projects[0]], self.title(self.projects[0]))
+
+	def test_rows_get_the_title_of_their_link(self):
+		rows = [{"project": self.projects[0]}, {"project": None}]
+
+		enrich_titles(rows, "project", "Smart Project")
+
+		self.assertEqual(
+			rows,
+			[{"project": self.projects[0], "project_title": self.title(self.projects[0])}, {"project": None}],
+		)
@@ -0,0 +1,90 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import csv
+import io
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from openpyxl import load_workbook
+
+from smart_pro.smart_pro import export
+from smart_pro.smart_pro.api.test_projects import make_task
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+	make_project,
+)
+from smart_pro.smart_pro.export import EXPORT_COLUMNS, iter_timesheet_rows, write_csv, write_xlsx
+
+TEST_USER = "export-test-user@example.com"
+HEADER = [label for fieldname, label in EXPORT_COLUMNS]
+
+
+class TestTimesheetExport(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		self.task = make_task(make_project())
+		self.project = frappe.db.get_value("Smart Task", self.task, "project")
+		self.timesheets = [
+			self.make_timesheet(date, status)
+			for date, status in (
+				("2026-01-05", "Approved"),
+				("2026-01-05", "Approved"),
+				("2026-01-06", "Submitted"),
+				("2026-01-07", "Approved"),
+				("2026-01-08", "Approved"),
+				("2026-02-01", "Approved"),
+			)
+		]
+
+	def make_timesheet(self, date, status):
+		return (
+			frappe.get_doc(
+				{
+					"doctype": "Smart Timesheet",
+					"employee": self.employee,
+					"date": date,
+					"project": self.project,
+					"task": self.task,
+					"hours_worked": 1,
+					"description": "Export test",
+					"status": status,
+				}
+			)
+			.insert(ignore_permissions=True)
+			.name
+		)
+
+	def rows(self):
+		return iter_timesheet_rows(
+			from_date="2026-01-01", to_date="2026-01-31", status="Approved", employee=self.employee
+		)
+
+	def test_chunks_cover_every_row_once_in_date_order(self):
+		with patch.object(export, "CHUNK_SIZE", 2):
+			names = [row[0] for row in self.rows()]
+
+		# Same-day rows are ordered by name, so the page boundary between them is kept
+		self.assertEqual(names, [*sorted(self.timesheets[:2]), self.timesheets[3], self.timesheets[4]])
+
+	def test_csv_has_a_header_and_a_line_per_row(self):
+		file = io.BytesIO()
+		write_csv(self.rows(), file)
+
+		lines = list(csv.reader(io.StringIO(file.getvalue().decode())))
+		self.assertEqual(lines[0], HEADER)
+		self.assertEqual(len(lines), 5)
+		self.assertEqual(lines[1][HEADER.index("Status")], "Approved")
+
+	def test_xlsx_has_a_header_and_a_line_per_row(self):
+		file = io.BytesIO()
+		write_xlsx(self.rows(), file)
+
+		lines = list(load_workbook(file, read_only=True)["Timesheets"].values)
+		self.assertEqual(list(lines[0]), HEADER)
+		self.assertEqual(len(lines), 5)
+
+	def test_unknown_formats_are_rejected(self):
+		self.assertRaises(frappe.ValidationError, export.export_timesheets, "pdf")
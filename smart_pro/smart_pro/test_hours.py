@@ -0,0 +1,55 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import today
+
+from smart_pro.smart_pro.api.test_projects import make_task
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+	make_project,
+)
+
+TEST_USER = "hours-test-user@example.com"
+
+
+class TestHourTotals(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		self.task = make_task(make_project())
+		self.project = frappe.db.get_value("Smart Task", self.task, "project")
+
+	def log_hours(self, hours):
+		return frappe.get_doc(
+			{
+				"doctype": "Smart Timesheet",
+				"employee": self.employee,
+				"date": today(),
+				"project": self.project,
+				"task": self.task,
+				"hours_worked": hours,
+				"description": "Hours test",
+			}
+		).insert(ignore_permissions=True)
+
+	def test_timesheets_move_the_totals_but_not_modified(self):
+		task_modified = frappe.db.get_value("Smart Task", self.task, "modified")
+		project_modified = frappe.db.get_value("Smart Project", self.project, "modified")
+
+		self.log_hours(2)
+
+		self.assertEqual(frappe.db.get_value("Smart Task", self.task, "actual_hours"), 2)
+		self.assertEqual(frappe.db.get_value("Smart Project", self.project, "actual_hours"), 2)
+		self.assertEqual(frappe.db.get_value("Smart Task", self.task, "modified"), task_modified)
+		self.assertEqual(frappe.db.get_value("Smart Project", self.project, "modified"), project_modified)
+
+	def test_saving_a_stale_copy_keeps_the_totals(self):
+		task = frappe.get_doc("Smart Task", self.task)
+		self.log_hours(3)
+
+		task.title = f"{task.title} renamed"
+		task.save(ignore_permissions=True)
+
+		self.assertEqual(frappe.db.get_value("Smart Task", self.task, "actual_hours"), 3)
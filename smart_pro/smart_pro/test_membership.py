@@ -0,0 +1,57 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_assignment,
+	make_employee,
+	make_project,
+)
+from smart_pro.smart_pro.membership import MEMBERSHIP_KEY, refresh_project_membership
+from smart_pro.smart_pro.sync import ACTION_GRANTED, ACTION_REVOKED, SYNC_LOG
+
+TEST_USER = "membership-test-user@example.com"
+
+
+class TestProjectMembership(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+
+	def test_refresh_inside_write_transaction_is_not_cached(self):
+		project = make_project()
+		make_assignment(self.employee, project, allocation_percentage=10)
+		frappe.cache().hdel(MEMBERSHIP_KEY, TEST_USER)
+
+		membership = refresh_project_membership(TEST_USER)
+
+		# The uncommitted assignment is visible to this transaction only
+		self.assertIn(project, membership)
+		self.assertIsNone(frappe.cache().hget(MEMBERSHIP_KEY, TEST_USER))
+
+	def test_assignment_change_logs_grant_and_revoke(self):
+		project = make_project()
+
+		assignment = make_assignment(self.employee, project, allocation_percentage=10)
+		self.assertTrue(
+			frappe.db.exists(SYNC_LOG, {"action": ACTION_GRANTED, "user": TEST_USER, "project": project})
+		)
+
+		assignment.status = "Completed"
+		assignment.save(ignore_permissions=True)
+		self.assertTrue(
+			frappe.db.exists(SYNC_LOG, {"action": ACTION_REVOKED, "user": TEST_USER, "project": project})
+		)
+
+	def test_trashed_assignment_revokes_its_project(self):
+		project = make_project()
+		assignment = make_assignment(self.employee, project, allocation_percentage=10)
+
+		# force: the date request auto-created with the assignment links back to it
+		assignment.delete(ignore_permissions=True, force=True)
+
+		self.assertTrue(
+			frappe.db.exists(SYNC_LOG, {"action": ACTION_REVOKED, "user": TEST_USER, "project": project})
+		)
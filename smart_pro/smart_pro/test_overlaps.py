@@ -0,0 +1,139 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+	make_project,
+)
+from smart_pro.smart_pro.intervals import IntervalIndex, get_interval_indexes, invalidate_interval_indexes
+from smart_pro.smart_pro.overlaps import INTERVAL_KIND, find_overlaps, get_conflicts
+
+TEST_USER = "overlaps-test-user@example.com"
+
+
+class TestIntervalIndex(FrappeTestCase):
+	def test_ranges_touching_on_one_day_overlap(self):
+		index = IntervalIndex([("2026-01-01", "2026-01-10", "A"), ("2026-01-20", "2026-01-25", "B")])
+
+		self.assertEqual([hit[2] for hit in index.overlapping("2026-01-10", "2026-01-20")], ["A", "B"])
+		self.assertEqual(index.overlapping("2026-01-11", "2026-01-19"), [])
+
+	def test_long_range_enclosing_later_ones_is_found(self):
+		index = IntervalIndex(
+			[
+				("2026-01-01", "2026-12-31", "year"),
+				("2026-02-01", "2026-02-02", "short"),
+				("2026-03-01", "2026-03-02", "later"),
+			]
+		)
+
+		self.assertEqual([hit[2] for hit in index.overlapping("2026-06-01", "2026-06-30")], ["year"])
+		self.assertEqual(
+			[hit[2] for hit in index.overlapping("2026-02-02", "2026-03-01")], ["year", "short", "later"]
+		)
+
+	def test_hits_are_in_start_order(self):
+		index = IntervalIndex([("2026-01-05", "2026-01-06", "B"), ("2026-01-01", "2026-01-09", "A")])
+
+		self.assertEqual([hit[2] for hit in index.overlapping("2026-01-01", "2026-01-31")], ["A", "B"])
+
+	def test_cached_form_keeps_the_order_and_running_max(self):
+		index = IntervalIndex([("2026-01-05", "2026-01-06", "B"), ("2026-01-01", "2026-01-31", "A")])
+
+		cached = IntervalIndex.from_json(index.to_json())
+
+		self.assertEqual(cached.intervals, index.intervals)
+		self.assertEqual(cached.max_ends, ["2026-01-31", "2026-01-31"])
+		self.assertEqual([hit[2] for hit in cached.overlapping("2026-01-20", "2026-01-20")], ["A"])
+
+	def test_indexes_are_loaded_once_per_request(self):
+		kind = f"test_{frappe.generate_hash(length=6)}"
+		loaded = []
+
+		def load(employees):
+			loaded.extend(employees)
+			return {employee: [("2026-01-01", "2026-01-02", employee)] for employee in employees}
+
+		first = get_interval_indexes(kind, ["A", "B"], load)
+		second = get_interval_indexes(kind, ["B", "A"], load)
+		self.assertIs(second["A"], first["A"])
+		self.assertEqual(sorted(loaded), ["A", "B"])
+
+		# A new request decodes the built index from Redis instead of loading it again
+		frappe.local.smart_pro_interval_indexes = {}
+		self.assertEqual(get_interval_indexes(kind, ["A"], load)["A"].intervals, first["A"].intervals)
+		self.assertEqual(sorted(loaded), ["A", "B"])
+
+		invalidate_interval_indexes(kind, "A", "B")
+		get_interval_indexes(kind, ["A"], load)
+		self.assertEqual(sorted(loaded), ["A", "A", "B"])
+		frappe.cache().delete_key(f"smart_pro:intervals:{kind}")
+
+
+class TestDateRequestConflicts(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		self.from_date, self.to_date = add_days(today(), 30), add_days(today(), 35)
+
+	def tearDown(self):
+		# Every test reads all of the employee's requests, so drop the previous test's
+		frappe.db.rollback()
+		invalidate_interval_indexes(INTERVAL_KIND, self.employee)
+
+	def make_request(self, request_type, project=None):
+		return frappe.get_doc(
+			{
+				"doctype": "Employee Date Request",
+				"employee": self.employee,
+				"request_type": request_type,
+				"project": project,
+				"from_date": self.from_date,
+				"to_date": self.to_date,
+				"reason": "Overlap test",
+			}
+		).insert(ignore_permissions=True)
+
+	def conflicts(self, request):
+		return find_overlaps(
+			self.employee,
+			self.from_date,
+			self.to_date,
+			exclude=request.name,
+			request_type=request.request_type,
+			project=request.project,
+		)
+
+	def test_work_on_different_projects_does_not_conflict(self):
+		first = self.make_request("Project Date Update", make_project())
+		second = self.make_request("Project Date Update", make_project())
+
+		self.assertEqual(self.conflicts(second), [])
+		self.assertEqual(get_conflicts([first, second]), {})
+		# Without a request type every overlap is listed, except the request itself
+		self.assertEqual(
+			[
+				overlap.name
+				for overlap in find_overlaps(self.employee, self.from_date, self.to_date, exclude=second.name)
+			],
+			[first.name],
+		)
+
+	def test_work_on_the_same_project_conflicts(self):
+		project = make_project()
+		first = self.make_request("Project Date Update", project)
+		second = self.make_request("Work From Home", project)
+
+		self.assertEqual([overlap.name for overlap in self.conflicts(second)], [first.name])
+
+	def test_leave_conflicts_with_any_work(self):
+		work = self.make_request("Project Date Update", make_project())
+		leave = self.make_request("Leave")
+
+		self.assertEqual([overlap.name for overlap in self.conflicts(leave)], [work.name])
+		self.assertEqual([overlap.name for overlap in self.conflicts(work)], [leave.name])
+		self.assertEqual(set(get_conflicts([work, leave])), {work.name, leave.name})
@@ -0,0 +1,60 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from smart_pro.smart_pro.pagination import get_page
+
+
+class TestKeysetPagination(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.prefix = f"Page Test {frappe.generate_hash(length=6)}"
+		due_dates = [today(), today(), add_days(today(), 1), None, None, add_days(today(), -1)]
+		self.tasks = {
+			frappe.get_doc(
+				{
+					"doctype": "Smart Task",
+					"title": f"{self.prefix} {i}",
+					"due_date": due_date,
+				}
+			)
+			.insert(ignore_permissions=True)
+			.name: due_date
+			for i, due_date in enumerate(due_dates)
+		}
+
+	def read_all_pages(self, order_by, limit=2):
+		names, cursor = [], ""
+		for _ in range(len(self.tasks) + 1):
+			rows, cursor = get_page(
+				"Smart Task",
+				filters={"title": ["like", f"{self.prefix}%"]},
+				fields=["name", "due_date"],
+				order_by=order_by,
+				after=cursor,
+				limit=limit,
+			)
+			names += [row.name for row in rows]
+			if not cursor:
+				return names
+		self.fail("Pagination did not terminate")
+
+	def test_descending_pages_keep_null_sort_values(self):
+		dated = sorted((name for name, due in self.tasks.items() if due), key=lambda n: (self.tasks[n], n))
+		undated = sorted(name for name, due in self.tasks.items() if not due)
+
+		self.assertEqual(self.read_all_pages("due_date desc"), dated[::-1] + undated[::-1])
+
+	def test_ascending_pages_keep_null_sort_values(self):
+		dated = sorted((name for name, due in self.tasks.items() if due), key=lambda n: (self.tasks[n], n))
+		undated = sorted(name for name, due in self.tasks.items() if not due)
+
+		self.assertEqual(self.read_all_pages("due_date asc"), undated + dated)
+
+	def test_every_page_size_returns_each_row_once(self):
+		for limit in range(1, len(self.tasks) + 1):
+			names = self.read_all_pages("due_date desc", limit=limit)
+			self.assertCountEqual(names, self.tasks)
@@ -0,0 +1,290 @@
+# Copyright (c) 2025, sammish and Contributors
+# See license.txt
+
+"""
+Query-plan regression suite for the Smart Pro API
+
+Seeds a few thousand rows per doctype, captures every query an endpoint runs and
+EXPLAINs it. A plan that reads one of the Smart Pro tables with a full table scan
+fails the test, which catches dropped indexes and non-sargable filters.
+"""
+
+import re
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime, today
+
+from smart_pro.smart_pro.access import bump_access_version
+from smart_pro.smart_pro.api import projects
+from smart_pro.smart_pro.counters import COUNTED_DOCTYPES, invalidate_counts
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+)
+from smart_pro.smart_pro.membership import MEMBERSHIP_KEY, refresh_project_membership
+from smart_pro.smart_pro.notifications import get_pending_notifications
+
+TEST_USER = "query-plan-user@example.com"
+SEED_PREFIX = "QP"
+
+CHECKED_TABLES = {
+	"tabSmart Project",
+	"tabSmart Task",
+	"tabSmart Timesheet",
+	"tabEmployee Date Request",
+	"tabEmployee Project Assignment",
+	"tabSmart Pro Notification",
+}
+
+# `tabX` alias / `tabX` AS alias, as written in FROM and JOIN clauses
+TABLE_ALIAS = re.compile(r"`(tab[^`]+)`\s+(?:AS\s+)?`?(\w+)`?", re.IGNORECASE)
+NOT_ALIASES = {
+	"CROSS",
+	"FORCE",
+	"GROUP",
+	"HAVING",
+	"IGNORE",
+	"INNER",
+	"JOIN",
+	"LEFT",
+	"LIMIT",
+	"ON",
+	"ORDER",
+	"OUTER",
+	"RIGHT",
+	"STRAIGHT_JOIN",
+	"UNION",
+	"USE",
+	"WHERE",
+}
+
+
+def get_table_aliases(query):
+	"""{name EXPLAIN reports: table} for the tables of a query, so aliased joins are checked too"""
+	aliases = {table: table for table in re.findall(r"`(tab[^`]+)`", query)}
+	for table, alias in TABLE_ALIAS.findall(query):
+		if alias.upper() not in NOT_ALIASES:
+			aliases[alias] = table
+	return aliases
+
+
+class TestQueryPlans(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		frappe.set_user("Administrator")
+		cls.employee = make_employee(TEST_USER)
+		frappe.get_doc("User", TEST_USER).add_roles("Smart Pro User")
+		# Moves the version when the seed commits
+		bump_access_version()
+		seed_dataset(cls.employee)
+		refresh_project_membership(TEST_USER)
+
+	@classmethod
+	def tearDownClass(cls):
+		frappe.set_user("Administrator")
+		delete_dataset(cls.employee)
+		super().tearDownClass()
+
+	def setUp(self):
+		frappe.set_user(TEST_USER)
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+
+	def assertNoFullScans(self, fn, *args, **kwargs):
+		with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+			fn(*args, **kwargs)
+
+		checked = 0
+		for call in sql.call_args_list:
+			query = str(call.args[0]) if call.args else str(call.kwargs.get("query"))
+			values = call.args[1] if len(call.args) > 1 else call.kwargs.get("values", ())
+			if not query.lstrip().upper().startswith("SELECT"):
+				continue
+			if not any(f"`{table}`" in query for table in CHECKED_TABLES):
+				continue
+
+			checked += 1
+			aliases = get_table_aliases(query)
+			for step in frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True):
+				table = aliases.get(step.get("table"), step.get("table"))
+				self.assertFalse(
+					step.get("type") == "ALL" and table in CHECKED_TABLES,
+					f"{fn.__name__} does a full scan of {table}:\n{query}\n{step}",
+				)
+
+		self.assertTrue(checked, f"{fn.__name__} ran no query against the Smart Pro tables")
+
+	def test_user_tasks(self):
+		self.assertNoFullScans(projects.get_user_tasks)
+
+	def test_user_projects(self):
+		self.assertNoFullScans(projects.get_user_projects)
+
+	def test_employee_assigned_projects(self):
+		self.assertNoFullScans(projects.get_employee_assigned_projects)
+
+	def test_my_timesheets(self):
+		self.assertNoFullScans(projects.get_my_timesheets)
+
+	def test_my_date_requests(self):
+		self.assertNoFullScans(projects.get_my_date_requests)
+
+	def test_pending_approvals(self):
+		self.assertNoFullScans(projects.get_pending_approvals)
+
+	def test_task_timesheets(self):
+		self.assertNoFullScans(projects.get_task_timesheets, f"{SEED_PREFIX}-TASK-00001")
+
+	def test_pending_notifications(self):
+		self.assertNoFullScans(get_pending_notifications)
+
+	def test_project_membership(self):
+		self.assertNoFullScans(refresh_project_membership, TEST_USER)
+
+
+def seed_dataset(employee):
+	"""Bulk insert a dataset large enough for the optimizer to prefer indexes
+
+	ANALYZE TABLE commits implicitly, so the seed is committed on purpose and
+	removed again by delete_dataset.
+	"""
+	# Rows left behind by an aborted run
+	delete_seed_rows()
+
+	now = now_datetime()
+	base = ["name", "creation", "modified", "owner", "modified_by"]
+
+	def row(name, *values):
+		return (name, now, now, "Administrator", "Administrator", *values)
+
+	project_count = 60
+	projects = [f"{SEED_PREFIX}-PROJ-{i:04d}" for i in range(1, project_count + 1)]
+	managers = [f"qp-manager-{i}@example.com" for i in range(10)]
+	employees = [f"{SEED_PREFIX}-EMP-{i:03d}" for i in range(100)] + [employee]
+	users = [f"qp-user-{i}@example.com" for i in range(50)] + [TEST_USER]
+	statuses = ["Planning", "Active", "On Hold", "Completed"]
+
+	frappe.db.bulk_insert(
+		"Smart Project",
+		[*base, "title", "status", "project_manager"],
+		[row(p, f"Query Plan {p}", statuses[i % 4], managers[i % 10]) for i, p in enumerate(projects)],
+	)
+
+	assignments = [
+		row(
+			f"{SEED_PREFIX}-EPA-{i:05d}",
+			employees[i % 100],
+			projects[i % project_count],
+			"Active" if i % 3 else "Completed",
+		)
+		for i in range(1500)
+	]
+	assignments += [row(f"{SEED_PREFIX}-EPA-E{i}", employee, projects[i], "Active") for i in range(3)]
+	frappe.db.bulk_insert(
+		"Employee Project Assignment", [*base, "employee", "project", "status"], assignments
+	)
+
+	frappe.db.bulk_insert(
+		"Smart Task",
+		[*base, "title", "project", "project_status", "assigned_to", "status", "due_date"],
+		[
+			row(
+				f"{SEED_PREFIX}-TASK-{i:05d}",
+				f"Task {i}",
+				projects[i % project_count],
+				statuses[(i % project_count) % 4],
+				users[i % len(users)],
+				"Open",
+				add_days(today(), i % 120),
+			)
+			for i in range(3000)
+		],
+	)
+
+	frappe.db.bulk_insert(
+		"Smart Timesheet",
+		[*base, "employee", "date", "project", "project_status", "task", "hours_worked", "status"],
+		[
+			row(
+				f"{SEED_PREFIX}-TS-{i:05d}",
+				employees[i % len(employees)],
+				add_days(today(), -(i % 90)),
+				projects[i % project_count],
+				statuses[(i % project_count) % 4],
+				f"{SEED_PREFIX}-TASK-{i % 3000:05d}",
+				2,
+				"Submitted",
+			)
+			for i in range(3000)
+		],
+	)
+
+	frappe.db.bulk_insert(
+		"Employee Date Request",
+		[
+			*base,
+			"employee",
+			"request_type",
+			"project",
+			"project_status",
+			"from_date",
+			"to_date",
+			"status",
+			"approver",
+		],
+		[
+			row(
+				f"{SEED_PREFIX}-EDR-{i:05d}",
+				employees[i % len(employees)],
+				"Project Date Update",
+				projects[i % project_count],
+				statuses[(i % project_count) % 4],
+				today(),
+				add_days(today(), 5),
+				"Pending Approval" if i % 2 else "Approved",
+				users[i % len(users)],
+			)
+			for i in range(2000)
+		],
+	)
+
+	frappe.db.bulk_insert(
+		"Smart Pro Notification",
+		[*base, "user", "title", "body", "status", "created_at"],
+		[
+			row(
+				f"{SEED_PREFIX}-NTF-{i:05d}",
+				users[i % len(users)],
+				"Seed",
+				"Seed",
+				"pending" if i % 2 else "read",
+				now,
+			)
+			for i in range(2000)
+		],
+	)
+
+	frappe.db.commit()
+	for table in CHECKED_TABLES:
+		frappe.db.sql(f"ANALYZE TABLE `{table}`")
+
+
+def delete_seed_rows():
+	for table in CHECKED_TABLES:
+		frappe.db.sql(f"DELETE FROM `{table}` WHERE name LIKE %s", (f"{SEED_PREFIX}-%",))
+
+
+def delete_dataset(employee):
+	"""Remove the committed seed, the test user and their employee so other suites never see them"""
+	delete_seed_rows()
+	frappe.delete_doc("Employee", employee, force=True, ignore_permissions=True)
+	frappe.delete_doc("User", TEST_USER, force=True, ignore_permissions=True)
+
+	for doctype in COUNTED_DOCTYPES:
+		invalidate_counts(doctype)
+	frappe.cache().delete_value(MEMBERSHIP_KEY)
+	bump_access_version()
+	frappe.db.commit()
@@ -0,0 +1,55 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from smart_pro.smart_pro import tasks
+from smart_pro.smart_pro.api.test_projects import make_task
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_project,
+)
+
+SETTINGS = frappe._dict(enable_email_notifications=1, project_reminder_days=3, task_reminder_days=2)
+
+
+@patch.object(tasks, "get_settings", return_value=SETTINGS)
+@patch.object(frappe, "sendmail")
+class TestReminders(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def reminded(self, sendmail):
+		return {call.kwargs["reference_name"] for call in sendmail.call_args_list}
+
+	def test_projects_are_reminded_only_within_the_window(self, sendmail, _settings):
+		due, later = make_project(), make_project()
+		for project, days in ((due, 1), (later, 30)):
+			frappe.db.set_value(
+				"Smart Project",
+				project,
+				{"end_date": add_days(today(), days), "project_manager": "Administrator"},
+			)
+
+		tasks.send_project_end_date_reminders()
+
+		self.assertIn(due, self.reminded(sendmail))
+		self.assertNotIn(later, self.reminded(sendmail))
+
+	def test_tasks_are_reminded_only_within_the_window(self, sendmail, _settings):
+		project = make_project()
+		due, later = make_task(project), make_task(project)
+		for task, days in ((due, 1), (later, 30)):
+			frappe.db.set_value(
+				"Smart Task",
+				task,
+				{"due_date": add_days(today(), days), "assigned_to": "Administrator", "status": "Open"},
+			)
+
+		tasks.send_task_due_date_reminders()
+
+		self.assertIn(due, self.reminded(sendmail))
+		self.assertNotIn(later, self.reminded(sendmail))
@@ -0,0 +1,113 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import csv
+import os
+import tempfile
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import today
+
+from smart_pro.smart_pro.api.projects import import_timesheets
+from smart_pro.smart_pro.api.test_projects import make_task
+from smart_pro.smart_pro.counters import TOTAL, get_status_counts, invalidate_counts
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+	make_project,
+)
+from smart_pro.smart_pro.timesheet_import import TimesheetImporter, read_chunks
+
+TEST_USER = "import-test-user@example.com"
+
+
+class TestTimesheetImport(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.employee = make_employee(TEST_USER)
+		self.task = make_task(make_project())
+		self.importer = TimesheetImporter("Administrator")
+
+	def tearDown(self):
+		self.importer.close()
+		if self.importer.rejects_path and os.path.exists(self.importer.rejects_path):
+			os.remove(self.importer.rejects_path)
+		frappe.set_user("Administrator")
+
+	def row(self, **values):
+		return {
+			"employee": self.employee,
+			"date": today(),
+			"task": self.task,
+			"hours_worked": "2",
+			"description": "Imported",
+			**values,
+		}
+
+	def test_valid_rows_are_inserted_with_their_totals(self):
+		self.importer.import_chunk([self.row(), self.row(hours_worked="1.5", status="Approved")])
+
+		self.assertEqual((self.importer.imported, self.importer.rejected), (2, 0))
+		timesheets = frappe.get_all(
+			"Smart Timesheet", filters={"task": self.task}, fields=["name", "status", "hours_worked"]
+		)
+		self.assertEqual(sorted(row.status for row in timesheets), ["Approved", "Draft"])
+		self.assertEqual(len({row.name for row in timesheets}), 2)
+		self.assertEqual(
+			frappe.db.get_value("Smart Task", self.task, ["actual_hours", "approved_hours"]), (3.5, 1.5)
+		)
+
+	def test_counters_move_by_the_inserted_rows_after_commit(self):
+		before = get_status_counts(["Smart Timesheet"])["Smart Timesheet"]
+		queued = len(frappe.db.after_commit._functions)
+
+		self.importer.import_chunk([self.row(), self.row(status="Approved"), self.row(status="Approved")])
+		self.assertEqual(get_status_counts(["Smart Timesheet"])["Smart Timesheet"], before)
+
+		# Run what the chunk's commit would
+		functions = frappe.db.after_commit._functions
+		for callback in reversed([functions.pop() for _ in range(len(functions) - queued)]):
+			callback()
+		after = get_status_counts(["Smart Timesheet"])["Smart Timesheet"]
+		invalidate_counts("Smart Timesheet")
+
+		self.assertEqual(after[TOTAL], before[TOTAL] + 3)
+		self.assertEqual(after["Draft"], before["Draft"] + 1)
+		self.assertEqual(after["Approved"], before["Approved"] + 2)
+
+	def test_invalid_rows_are_written_to_the_rejects_file(self):
+		self.importer.import_chunk(
+			[
+				self.row(),
+				self.row(description=""),
+				self.row(employee="EMP-MISSING"),
+				self.row(hours_worked="25"),
+				self.row(status="Cancelled"),
+				self.row(date="not a date"),
+			]
+		)
+		self.importer.close()
+
+		self.assertEqual((self.importer.imported, self.importer.rejected), (1, 5))
+		with open(self.importer.rejects_path, newline="") as f:
+			rejects = list(csv.DictReader(f))
+		self.assertEqual([int(row["row"]) for row in rejects], [2, 3, 4, 5, 6])
+		self.assertEqual(rejects[0]["error"], "Missing description")
+		self.assertEqual(rejects[1]["error"], "Employee 'EMP-MISSING' not found")
+
+	def test_csv_is_read_in_chunks(self):
+		with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="") as f:
+			writer = csv.writer(f)
+			writer.writerow(["Employee", " Task "])
+			writer.writerows([[self.employee, self.task]] * 5)
+		try:
+			chunks = list(read_chunks(f.name, chunk_size=2))
+		finally:
+			os.remove(f.name)
+
+		self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+		self.assertEqual(chunks[0][0], {"employee": self.employee, "task": self.task})
+
+	def test_import_requires_full_access(self):
+		frappe.set_user(TEST_USER)
+		self.assertRaises(frappe.PermissionError, import_timesheets, "/private/files/timesheets.csv")
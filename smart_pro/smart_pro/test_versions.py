@@ -0,0 +1,56 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from smart_pro.smart_pro.api.projects import get_user_projects
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_project,
+)
+from smart_pro.smart_pro.versions import get_etag, get_versions
+
+
+class TestListETags(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def commit_callbacks(self, queued):
+		"""Run what a commit would, without committing the test's rows"""
+		functions = frappe.db.after_commit._functions
+		for callback in reversed([functions.pop() for _ in range(len(functions) - queued)]):
+			callback()
+
+	def test_version_moves_only_after_commit(self):
+		version = get_versions(["Smart Project"])
+		queued = len(frappe.db.after_commit._functions)
+
+		make_project()
+		self.assertEqual(get_versions(["Smart Project"]), version)
+
+		self.commit_callbacks(queued)
+		self.assertNotEqual(get_versions(["Smart Project"]), version)
+
+	def test_etag_depends_on_the_arguments(self):
+		self.assertEqual(
+			get_etag("endpoint", ["Smart Project"], 1), get_etag("endpoint", ["Smart Project"], 1)
+		)
+		self.assertNotEqual(
+			get_etag("endpoint", ["Smart Project"], 1), get_etag("endpoint", ["Smart Project"], 2)
+		)
+
+	def test_unchanged_poll_is_not_modified_until_a_write(self):
+		first = get_user_projects(etag="")
+		self.assertEqual(set(first), {"etag", "data"})
+		self.assertEqual(get_user_projects(etag=first["etag"]), {"not_modified": True, "etag": first["etag"]})
+
+		queued = len(frappe.db.after_commit._functions)
+		project = make_project()
+		self.commit_callbacks(queued)
+
+		second = get_user_projects(etag=first["etag"])
+		self.assertNotEqual(second["etag"], first["etag"])
+		self.assertIn(project, [row["name"] for row in second["data"]])
+
+	def test_clients_without_etag_get_the_plain_response(self):
+		self.assertIsInstance(get_user_projects(), list)
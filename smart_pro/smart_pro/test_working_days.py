@@ -0,0 +1,124 @@
+# Copyright (c) 2026, sammish and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from smart_pro.patches.v1_0 import recount_date_request_working_days
+from smart_pro.smart_pro import working_days
+from smart_pro.smart_pro.doctype.employee_project_assignment.test_employee_project_assignment import (
+	make_employee,
+)
+from smart_pro.smart_pro.working_days import (
+	HOLIDAY_DATES_KEY,
+	add_working_days,
+	count_working_days,
+	count_working_days_bulk,
+	get_busday_calendar,
+	get_holiday_lists,
+	get_working_day_mask,
+)
+
+# Monday 5 January to Sunday 18 January 2026
+MONDAY, SUNDAY = "2026-01-05", "2026-01-18"
+
+
+class TestWorkingDays(FrappeTestCase):
+	def setUp(self):
+		frappe.set_user("Administrator")
+		frappe.local.smart_pro_busday_calendars = {}
+		self.holiday_list = make_holiday_list(["2026-01-07", "2026-01-10", "2026-01-11"])
+
+	def test_default_calendar_skips_weekends(self):
+		self.assertEqual(count_working_days(MONDAY, SUNDAY), 10)
+		self.assertEqual(count_working_days(MONDAY, MONDAY), 1)
+		self.assertEqual(count_working_days("2026-01-10", "2026-01-11"), 0)
+
+	def test_holiday_list_days_are_the_only_days_off(self):
+		# The list holds its weekly offs as holidays, so the weekend of the 17th counts
+		self.assertEqual(count_working_days(MONDAY, SUNDAY, self.holiday_list), 11)
+		self.assertEqual(add_working_days(MONDAY, 2, self.holiday_list), getdate("2026-01-08"))
+
+	def test_bulk_counts_match_single_counts(self):
+		ranges = [
+			(MONDAY, SUNDAY, None),
+			(MONDAY, SUNDAY, self.holiday_list),
+			("2026-01-07", "2026-01-07", self.holiday_list),
+		]
+
+		counts = count_working_days_bulk(*zip(*ranges, strict=True))
+
+		self.assertEqual(list(counts), [count_working_days(*working_range) for working_range in ranges])
+
+	def test_working_day_mask_has_a_column_per_calendar(self):
+		days, mask = get_working_day_mask(MONDAY, "2026-01-11", [None, self.holiday_list])
+
+		self.assertEqual(len(days), 7)
+		self.assertEqual(mask[:, 0].tolist(), [True] * 5 + [False] * 2)
+		self.assertEqual(mask[:, 1].tolist(), [True, True, False, True, True, False, False])
+
+	def test_calendar_is_memoized_per_request(self):
+		self.assertIs(get_busday_calendar(self.holiday_list), get_busday_calendar(self.holiday_list))
+
+	def test_holiday_list_update_drops_the_cached_dates(self):
+		self.assertEqual(count_working_days(MONDAY, SUNDAY, self.holiday_list), 11)
+
+		doc = frappe.get_doc("Holiday List", self.holiday_list)
+		doc.append("holidays", {"holiday_date": "2026-01-12", "description": "Added"})
+		doc.save(ignore_permissions=True)
+
+		self.assertIsNone(frappe.cache().hget(HOLIDAY_DATES_KEY, self.holiday_list))
+		self.assertEqual(count_working_days(MONDAY, SUNDAY, self.holiday_list), 10)
+
+	def test_sites_without_holiday_list_fields_use_the_default_calendar(self):
+		with patch.object(working_days, "_has_field", return_value=False):
+			self.assertEqual(get_holiday_lists(["EMP-ANY"]), {})
+			self.assertEqual(working_days.get_holiday_dates(self.holiday_list), [])
+
+	@patch.object(frappe.db, "commit")
+	def test_recount_patch_leaves_decided_requests_alone(self, _commit):
+		employee = make_employee("working-days-test-user@example.com")
+		requests = {}
+		for status in ("Draft", "Approved"):
+			requests[status] = frappe.get_doc(
+				{
+					"doctype": "Employee Date Request",
+					"employee": employee,
+					"request_type": "Leave",
+					"from_date": MONDAY,
+					"to_date": SUNDAY,
+					"reason": "Recount test",
+				}
+			).insert(ignore_permissions=True)
+			frappe.db.set_value(
+				"Employee Date Request", requests[status].name, {"status": status, "total_days": 14}
+			)
+
+		recount_date_request_working_days.execute()
+
+		self.assertEqual(
+			frappe.db.get_value("Employee Date Request", requests["Draft"].name, "total_days"),
+			count_working_days(MONDAY, SUNDAY, working_days.get_holiday_list(employee)),
+		)
+		self.assertEqual(
+			frappe.db.get_value("Employee Date Request", requests["Approved"].name, "total_days"), 14
+		)
+
+
+def make_holiday_list(dates):
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Holiday List",
+				"holiday_list_name": f"Working Days Test {frappe.generate_hash(length=6)}",
+				"from_date": "2026-01-01",
+				"to_date": "2026-12-31",
+				"holidays": [{"holiday_date": date, "description": "Off"} for date in dates],
+			}
+		)
+		.insert(ignore_permissions=True)
+		.name
+	)
@@ -0,0 +1,321 @@
+"""
+Bulk timesheet import for Smart Pro
+Reads a CSV or XLSX file in chunks, validates each chunk against lookup maps of
+employees and tasks fetched once per distinct value, and writes the valid rows
+with multi-row INSERTs. Rows that fail validation go to a rejects CSV. Each
+chunk commits on its own together with its rollup and hour-total deltas.
+"""
+
+import csv
+import os
+from collections import Counter
+
+import frappe
+from frappe.utils import cint, cstr, flt, getdate, now_datetime
+
+from smart_pro.smart_pro.counters import TOTAL, adjust_counts
+from smart_pro.smart_pro.doctype.smart_timesheet.smart_timesheet import MAX_HOURS_PER_DAY
+from smart_pro.smart_pro.doctype.smart_timesheet_rollup.smart_timesheet_rollup import (
+	apply_rollup_deltas,
+	get_rollup_deltas,
+)
+from smart_pro.smart_pro.hours import apply_hours_deltas, get_hours_deltas
+from smart_pro.smart_pro.versions import bump_versions
+
+CHUNK_SIZE = 5000
+
+IMPORT_COLUMNS = [
+	"employee",
+	"date",
+	"task",
+	"project",
+	"hours_worked",
+	"activity_type",
+	"description",
+	"notes",
+	"status",
+]
+REQUIRED_COLUMNS = ["employee", "date", "task", "hours_worked", "description"]
+IMPORTABLE_STATUSES = ("Draft", "Submitted", "Approved")
+
+INSERT_FIELDS = [
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"naming_series",
+	"employee",
+	"employee_name",
+	"date",
+	"status",
+	"project",
+	"task",
+	"task_title",
+	"project_status",
+	"activity_type",
+	"hours_worked",
+	"description",
+	"notes",
+]
+
+
+def enqueue_import(file_url):
+	"""Queue an import of an uploaded File and return the job id"""
+	job = frappe.enqueue(
+		"smart_pro.smart_pro.timesheet_import.import_timesheets",
+		queue="long",
+		timeout=3600 * 4,
+		file_url=file_url,
+		user=frappe.session.user,
+	)
+	return job.id if job else None
+
+
+def import_timesheets(file_url, user=None):
+	"""Import every row of the file, publishing a summary to the user when done"""
+	file_doc = frappe.get_doc("File", {"file_url": file_url})
+	path = file_doc.get_full_path()
+	importer = TimesheetImporter(user or frappe.session.user)
+
+	try:
+		for chunk in read_chunks(path):
+			importer.import_chunk(chunk)
+			frappe.db.commit()
+	finally:
+		importer.close()
+
+	summary = importer.summary()
+	frappe.publish_realtime("smart_pro_timesheet_import", summary, user=importer.user)
+	return summary
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+	"""Yield lists of row dicts keyed by the lower-cased header"""
+	if path.lower().endswith(".xlsx"):
+		rows = _read_xlsx(path)
+	else:
+		rows = _read_csv(path)
+
+	chunk = []
+	for row in rows:
+		chunk.append(row)
+		if len(chunk) >= chunk_size:
+			yield chunk
+			chunk = []
+	if chunk:
+		yield chunk
+
+
+def _read_csv(path):
+	with open(path, newline="", encoding="utf-8-sig") as f:
+		reader = csv.reader(f)
+		header = [cstr(column).strip().lower() for column in next(reader, [])]
+		for values in reader:
+			# Short or long rows are kept: missing columns fail validation, extra ones are ignored
+			yield dict(zip(header, values, strict=False))
+
+
+def _read_xlsx(path):
+	from openpyxl import load_workbook
+
+	workbook = load_workbook(path, read_only=True, data_only=True)
+	try:
+		rows = workbook.active.iter_rows(values_only=True)
+		header = [cstr(column).strip().lower() for column in next(rows, [])]
+		for values in rows:
+			yield dict(zip(header, values, strict=False))
+	finally:
+		workbook.close()
+
+
+class TimesheetImporter:
+	"""Validates and inserts chunks of timesheet rows, keeping lookups across chunks"""
+
+	def __init__(self, user):
+		self.user = user
+		self.employees = {}
+		self.tasks = {}
+		self.activity_types = set(
+			frappe.get_meta("Smart Timesheet").get_field("activity_type").options.split("\n")
+		)
+		self.row_count = 0
+		self.imported = 0
+		self.rejected = 0
+		self.rejects_path = None
+		self.rejects_file = None
+		self.rejects_writer = None
+
+	def _prefetch(self, chunk):
+		"""Load the employees and tasks of a chunk not seen in earlier chunks, one query each"""
+		employees = {cstr(row.get("employee")).strip() for row in chunk} - set(self.employees) - {""}
+		if employees:
+			for employee in frappe.get_all(
+				"Employee", filters={"name": ["in", list(employees)]}, fields=["name", "employee_name"]
+			):
+				self.employees[employee.name] = employee
+			for employee in employees:
+				self.employees.setdefault(employee, None)
+
+		tasks = {cstr(row.get("task")).strip() for row in chunk} - set(self.tasks) - {""}
+		if tasks:
+			for task in frappe.get_all(
+				"Smart Task",
+				filters={"name": ["in", list(tasks)]},
+				fields=["name", "title", "project", "project_status"],
+			):
+				self.tasks[task.name] = task
+			for task in tasks:
+				self.tasks.setdefault(task, None)
+
+	def validate_row(self, row):
+		"""Return (timesheet dict, None) for a valid row or (None, error)"""
+		values = {column: cstr(row.get(column)).strip() for column in IMPORT_COLUMNS}
+
+		missing = [column for column in REQUIRED_COLUMNS if not values[column]]
+		if missing:
+			return None, f"Missing {', '.join(missing)}"
+
+		employee = self.employees.get(values["employee"])
+		if not employee:
+			return None, f"Employee '{values['employee']}' not found"
+
+		task = self.tasks.get(values["task"])
+		if not task:
+			return None, f"Task '{values['task']}' not found"
+		if values["project"] and values["project"] != task.project:
+			return None, f"Task '{task.name}' does not belong to project '{values['project']}'"
+
+		hours = flt(values["hours_worked"])
+		if hours <= 0 or hours > MAX_HOURS_PER_DAY:
+			return None, f"Hours worked must be greater than 0 and at most {MAX_HOURS_PER_DAY}"
+
+		try:
+			date = getdate(row.get("date"))
+		except Exception:
+			return None, f"Invalid date '{values['date']}'"
+
+		activity_type = values["activity_type"] or "Development"
+		if activity_type not in self.activity_types:
+			return None, f"Invalid activity type '{activity_type}'"
+
+		status = values["status"] or "Draft"
+		if status not in IMPORTABLE_STATUSES:
+			return None, f"Status must be one of {', '.join(IMPORTABLE_STATUSES)}"
+
+		return frappe._dict(
+			employee=employee.name,
+			employee_name=employee.employee_name,
+			date=date,
+			status=status,
+			project=task.project,
+			task=task.name,
+			task_title=task.title,
+			project_status=task.project_status,
+			activity_type=activity_type,
+			hours_worked=hours,
+			description=values["description"],
+			notes=values["notes"] or None,
+		), None
+
+	def import_chunk(self, chunk):
+		self._prefetch(chunk)
+
+		timesheets = []
+		for row in chunk:
+			self.row_count += 1
+			timesheet, error = self.validate_row(row)
+			if error:
+				self.reject(row, error)
+			else:
+				timesheets.append(timesheet)
+
+		if not timesheets:
+			return
+
+		now = now_datetime()
+		prefix = f"TS-{now.year}-"
+		for timesheet, name in zip(timesheets, reserve_names(prefix, len(timesheets)), strict=True):
+			timesheet.update(
+				name=name,
+				creation=now,
+				modified=now,
+				owner=self.user,
+				modified_by=self.user,
+				naming_series="TS-.YYYY.-",
+			)
+
+		frappe.db.bulk_insert(
+			"Smart Timesheet",
+			INSERT_FIELDS,
+			[tuple(timesheet[field] for field in INSERT_FIELDS) for timesheet in timesheets],
+		)
+
+		# The multi-row INSERT skips the controller, so apply its side effects for the whole chunk
+		changes = [(None, timesheet) for timesheet in timesheets]
+		apply_rollup_deltas(get_rollup_deltas(changes))
+		apply_hours_deltas(get_hours_deltas(changes))
+		adjust_counts(
+			"Smart Timesheet",
+			{TOTAL: len(timesheets), **Counter(timesheet.status for timesheet in timesheets)},
+		)
+		bump_versions("Smart Timesheet")
+
+		self.imported += len(timesheets)
+
+	def reject(self, row, error):
+		if not self.rejects_writer:
+			self.rejects_path = frappe.get_site_path(
+				"private", "files", f"timesheet-import-rejects-{frappe.generate_hash(length=8)}.csv"
+			)
+			self.rejects_file = open(self.rejects_path, "w", newline="", encoding="utf-8")
+			self.rejects_writer = csv.writer(self.rejects_file)
+			self.rejects_writer.writerow(["row", *IMPORT_COLUMNS, "error"])
+
+		self.rejects_writer.writerow(
+			[self.row_count, *(cstr(row.get(column)) for column in IMPORT_COLUMNS), error]
+		)
+		self.rejected += 1
+
+	def close(self):
+		if self.rejects_file:
+			self.rejects_file.close()
+			self.rejects_file = None
+
+	def summary(self):
+		rejects_url = None
+		if self.rejects_path:
+			file_name = os.path.basename(self.rejects_path)
+			rejects_url = (
+				frappe.get_doc(
+					{
+						"doctype": "File",
+						"file_name": file_name,
+						"file_url": f"/private/files/{file_name}",
+						"is_private": 1,
+					}
+				)
+				.insert(ignore_permissions=True)
+				.file_url
+			)
+			frappe.db.commit()
+
+		return {
+			"rows": self.row_count,
+			"imported": self.imported,
+			"rejected": self.rejected,
+			"rejects_file": rejects_url,
+		}
+
+
+def reserve_names(prefix, count):
+	"""Reserve `count` consecutive names of a naming series with one locked read and one write"""
+	current = frappe.db.sql("SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE", (prefix,))
+	if current:
+		start = cint(current[0][0])
+		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name` = %s", (count, prefix))
+	else:
+		start = 0
+		frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (prefix, count))
+
+	return [f"{prefix}{number:05d}" for number in range(start + 1, start + count + 1)]
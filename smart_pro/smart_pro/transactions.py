@@ -0,0 +1,35 @@
+"""
+Savepoints for Smart Pro batch endpoints
+Rolling back to a savepoint undoes the database writes of one batch item, but
+not the commit callbacks its doc events queued (counter deltas, version bumps,
+cache invalidations). Those are trimmed back to what was queued before the
+item, so a rejected row leaves no trace once the batch commits.
+"""
+
+from contextlib import contextmanager
+
+import frappe
+
+
+def _commit_callbacks():
+	return (frappe.db.before_commit._functions, frappe.db.after_commit._functions)
+
+
+@contextmanager
+def savepoint(name):
+	"""Run a block under a savepoint, undoing its writes and commit callbacks if it raises
+
+	The exception is re-raised after the rollback, so callers still report it.
+	"""
+	queued = [len(callbacks) for callbacks in _commit_callbacks()]
+	frappe.db.savepoint(name)
+	try:
+		yield
+	except Exception:
+		frappe.db.rollback(save_point=name)
+		for callbacks, length in zip(_commit_callbacks(), queued, strict=True):
+			while len(callbacks) > length:
+				callbacks.pop()
+		raise
+	else:
+		frappe.db.release_savepoint(name)
@@ -0,0 +1,74 @@
+"""
+Data versions and ETags for the Smart Pro list endpoints
+Every write to a tracked doctype replaces its random version in Redis. An
+endpoint's ETag hashes the versions of the doctypes it reads together with the
+user, their access version and the request arguments, so a poll that would
+return the same payload can be answered without running the query.
+"""
+
+import hashlib
+
+import frappe
+
+from smart_pro.smart_pro.access import get_access_version
+
+
+def _key(doctype):
+	return frappe.cache().make_key(f"smart_pro:version:{doctype}")
+
+
+def get_versions(doctypes):
+	"""Get the current version of each doctype with a single Redis round trip"""
+	cache = frappe.cache()
+	versions = cache.mget([_key(doctype) for doctype in doctypes])
+
+	for i, (doctype, version) in enumerate(zip(doctypes, versions, strict=True)):
+		if version is None:
+			cache.set(_key(doctype), frappe.generate_hash(length=12), nx=True)
+			versions[i] = cache.get(_key(doctype))
+
+	return [frappe.safe_decode(version) for version in versions]
+
+
+def bump_versions(*doctypes):
+	"""Move the versions of the given doctypes once the transaction commits"""
+	doctypes = {doctype for doctype in doctypes if doctype}
+	if not doctypes:
+		return
+
+	def bump():
+		pipeline = frappe.cache().pipeline()
+		for doctype in doctypes:
+			pipeline.set(_key(doctype), frappe.generate_hash(length=12))
+		pipeline.execute()
+
+	frappe.db.after_commit.add(bump)
+
+
+def get_etag(endpoint, doctypes, *args):
+	"""ETag of an endpoint's response for the session user and the given arguments"""
+	parts = [endpoint, frappe.session.user, get_access_version(), *get_versions(doctypes), *args]
+	return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def is_not_modified(etag, current):
+	return bool(etag) and etag == current
+
+
+def not_modified(current):
+	return {"not_modified": True, "etag": current}
+
+
+def etag_response(data, etag, current):
+	"""Keep the legacy response unless the client opted in by sending `etag`"""
+	if etag is None:
+		return data
+	return {"etag": current, "data": data}
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def on_change(doc, method=None):
+	"""on_change / on_trash of every tracked doctype"""
+	bump_versions(doc.doctype)
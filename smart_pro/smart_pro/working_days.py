@@ -0,0 +1,188 @@
+"""
+Working-day calendars for Smart Pro
+Each Holiday List is loaded once, cached in Redis and turned into a NumPy
+busdaycalendar, so counting the working days of one range or of thousands of
+ranges at once is a numpy.busday_count call instead of a loop over dates.
+"""
+
+from datetime import timedelta
+
+import frappe
+import numpy as np
+from frappe.utils import getdate
+
+HOLIDAY_DATES_KEY = "smart_pro:holiday_dates"
+
+# Used when an employee has no Holiday List: Monday to Friday
+DEFAULT_WEEKMASK = "1111100"
+
+
+def _has_field(doctype, fieldname):
+	"""Whether the ERPNext / HRMS doctype and field are installed on this site"""
+	try:
+		return frappe.get_meta(doctype).has_field(fieldname)
+	except frappe.DoesNotExistError:
+		return False
+
+
+def get_holiday_lists(employees):
+	"""{employee: Holiday List} from the employee, falling back to their company's default
+
+	Sites without the Holiday List fields get an empty map, i.e. the default calendar.
+	"""
+	employees = list({employee for employee in employees if employee})
+	if not employees or not _has_field("Employee", "holiday_list"):
+		return {}
+
+	with_company = _has_field("Employee", "company") and _has_field("Company", "default_holiday_list")
+	rows = frappe.get_all(
+		"Employee",
+		filters={"name": ["in", employees]},
+		fields=["name", "holiday_list", *(["company"] if with_company else [])],
+	)
+	companies = {row.company for row in rows if with_company and row.company and not row.holiday_list}
+	company_lists = (
+		dict(
+			frappe.get_all(
+				"Company",
+				filters={"name": ["in", list(companies)]},
+				fields=["name", "default_holiday_list"],
+				as_list=True,
+			)
+		)
+		if companies
+		else {}
+	)
+
+	return {row.name: row.holiday_list or company_lists.get(row.get("company")) for row in rows}
+
+
+def get_holiday_list(employee):
+	return get_holiday_lists([employee]).get(employee)
+
+
+def get_holiday_dates(holiday_list):
+	"""ISO dates of a Holiday List (weekly offs included), cached until the list changes"""
+	if not _has_field("Holiday", "holiday_date"):
+		return []
+
+	return frappe.cache().hget(
+		HOLIDAY_DATES_KEY,
+		holiday_list,
+		generator=lambda: [
+			str(date)
+			for date in frappe.get_all(
+				"Holiday",
+				filters={"parent": holiday_list, "parenttype": "Holiday List"},
+				pluck="holiday_date",
+			)
+		],
+	)
+
+
+def get_busday_calendar(holiday_list=None):
+	"""numpy.busdaycalendar of a Holiday List, memoized for the rest of the request
+
+	A Holiday List already holds its weekly offs as holidays, so its calendar
+	treats every weekday as working. Without a list, weekends are off.
+	"""
+	calendars = getattr(frappe.local, "smart_pro_busday_calendars", None)
+	if calendars is None:
+		calendars = frappe.local.smart_pro_busday_calendars = {}
+
+	if holiday_list not in calendars:
+		if holiday_list:
+			calendars[holiday_list] = np.busdaycalendar(
+				weekmask="1111111", holidays=get_holiday_dates(holiday_list)
+			)
+		else:
+			calendars[holiday_list] = np.busdaycalendar(weekmask=DEFAULT_WEEKMASK)
+
+	return calendars[holiday_list]
+
+
+def _to_days(dates):
+	return np.array([str(getdate(date)) for date in dates], dtype="datetime64[D]")
+
+
+def count_working_days(from_date, to_date, holiday_list=None):
+	"""Working days from from_date to to_date, both included"""
+	return int(
+		np.busday_count(
+			str(getdate(from_date)),
+			str(getdate(to_date) + timedelta(days=1)),
+			busdaycal=get_busday_calendar(holiday_list),
+		)
+	)
+
+
+def count_working_days_bulk(from_dates, to_dates, holiday_lists):
+	"""Working days of many inclusive ranges at once
+
+	Ranges are grouped by Holiday List and each group is counted with a single
+	vectorized busday_count.
+
+	Args:
+		from_dates, to_dates: sequences of equal length
+		holiday_lists: Holiday List of each range (None for the default calendar)
+
+	Returns:
+		numpy int array, one count per range
+	"""
+	starts = _to_days(from_dates)
+	ends = _to_days(to_dates) + np.timedelta64(1, "D")
+	holiday_lists = np.array([holiday_list or "" for holiday_list in holiday_lists], dtype=object)
+
+	counts = np.zeros(len(starts), dtype=np.int64)
+	for holiday_list in set(holiday_lists):
+		mask = holiday_lists == holiday_list
+		counts[mask] = np.busday_count(
+			starts[mask], ends[mask], busdaycal=get_busday_calendar(holiday_list or None)
+		)
+
+	return counts
+
+
+def add_working_days(date, days, holiday_list=None):
+	"""The date `days` working days after `date`, starting from the next working day on or after it"""
+	return getdate(
+		str(
+			np.busday_offset(
+				str(getdate(date)), days, roll="forward", busdaycal=get_busday_calendar(holiday_list)
+			)
+		)
+	)
+
+
+def get_working_day_mask(from_date, to_date, holiday_lists):
+	"""Boolean matrix of days x calendars telling which days of the range are working days
+
+	Args:
+		holiday_lists: list of Holiday Lists (None for the default calendar), one column each
+
+	Returns:
+		(numpy datetime64[D] array of the days, bool array of shape (days, len(holiday_lists)))
+	"""
+	days = np.arange(
+		np.datetime64(str(getdate(from_date))),
+		np.datetime64(str(getdate(to_date))) + np.timedelta64(1, "D"),
+		dtype="datetime64[D]",
+	)
+	columns = {
+		holiday_list: np.is_busday(days, busdaycal=get_busday_calendar(holiday_list))
+		for holiday_list in set(holiday_lists)
+	}
+	mask = np.empty((len(days), len(holiday_lists)), dtype=bool)
+	for i, holiday_list in enumerate(holiday_lists):
+		mask[:, i] = columns[holiday_list]
+
+	return days, mask
+
+
+# ==================== DOC EVENT HANDLERS ====================
+
+
+def on_holiday_list_change(doc, method=None):
+	"""on_update / on_trash of Holiday List: drop its cached dates"""
+	frappe.cache().hdel(HOLIDAY_DATES_KEY, doc.name)
+	frappe.local.smart_pro_busday_calendars = {}